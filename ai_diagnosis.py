@@ -1,17 +1,105 @@
-import pandas as pd
-import numpy as np
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder
+import hashlib
+import json
 import pickle
 import os
-from typing import Dict, List
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+# pandas/scikit-learn chỉ cần khi train hoặc đọc ai_model.pkl; dự đoán chạy trên
+# CompiledTree (chỉ NumPy) đọc từ ai_model.npz -> import trong hàm, không ở đầu module
+COMPILED_MODEL_PATH = "ai_model.npz"
+
+
+class CompiledTree:
+    """A fitted DecisionTreeClassifier flattened to NumPy arrays (inference without scikit-learn)"""
+
+    ARRAYS = ('children_left', 'children_right', 'feature', 'threshold', 'value')
+
+    def __init__(self, children_left, children_right, feature, threshold, value, classes):
+        self.children_left = children_left
+        self.children_right = children_right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value  # xác suất từng lớp tại mỗi node
+        self.classes = classes  # tên bệnh theo thứ tự cột của value
+        # Version = nội dung cây: giống nhau giữa các worker, đổi khi train lại
+        digest = hashlib.sha256()
+        for array in (children_left, children_right, feature, threshold, value, classes):
+            digest.update(array.tobytes())
+        self.version = digest.hexdigest()[:12]
+
+    @classmethod
+    def from_sklearn(cls, model, label_encoder):
+        import numpy as np
+        tree = model.tree_
+        value = tree.value[:, 0, :].astype(np.float64)
+        value /= np.maximum(value.sum(axis=1, keepdims=True), 1e-12)  # giống predict_proba
+        return cls(tree.children_left.astype(np.int32), tree.children_right.astype(np.int32),
+                   tree.feature.astype(np.int32), tree.threshold.astype(np.float64), value,
+                   np.asarray(label_encoder.inverse_transform(model.classes_), dtype=str))
+
+    def predict_proba(self, features):
+        """Class probabilities for a 2-D feature matrix (same as the sklearn tree)"""
+        import numpy as np
+        # sklearn so sánh trên float32
+        features = np.asarray(features, dtype=np.float32)
+        nodes = np.zeros(len(features), dtype=np.int32)
+        rows = np.arange(len(features))
+        while True:
+            left = self.children_left[nodes]
+            active = left != -1  # -1: lá
+            if not active.any():
+                break
+            current, index = nodes[active], rows[active]
+            go_left = features[index, self.feature[current]] <= self.threshold[current]
+            nodes[active] = np.where(go_left, left[active], self.children_right[current])
+        return self.value[nodes]
+
+    def save(self, file, metadata: Dict):
+        import numpy as np
+        np.savez_compressed(file, classes=self.classes, metadata=np.array(json.dumps(metadata, default=_json_default)),
+                            **{name: getattr(self, name) for name in self.ARRAYS})
+
+    @classmethod
+    def load(cls, filepath: str) -> Tuple['CompiledTree', Dict]:
+        import numpy as np
+        with np.load(filepath, allow_pickle=False) as data:
+            tree = cls(*(data[name] for name in cls.ARRAYS), classes=data['classes'])
+            metadata = json.loads(str(data['metadata']))
+        return tree, metadata
+
+
+def _json_default(value):
+    # numpy int64/float64 từ pandas
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+def _replace_atomically(filepath: str, write):
+    """Write via a temp file + rename: other workers never read a half-written model"""
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{os.path.basename(filepath)}.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)  # mkstemp tạo file 0600
+        os.replace(tmp_path, filepath)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
 
 class HealthFirstAI:
-    def __init__(self, data_dir: str = "ai_data"):
+    def __init__(self, data_dir: str = "ai_data", train: bool = True):
         self.data_dir = data_dir
-        self.model = None
-        self.label_encoder = LabelEncoder()
+        self.model = None  # DecisionTreeClassifier (chỉ có khi train/đọc pickle)
+        self.runtime = None  # CompiledTree dùng để dự đoán
+        self.label_encoder = None
         self.symptom_severity = {}
         self.disease_descriptions = {}
         self.disease_precautions = {}
@@ -95,11 +183,18 @@ class HealthFirstAI:
             'hepatitis A': 'Viêm gan A'
         }
         
-        self._load_data()
-        self._train_model()
+        if train:
+            self._load_data()
+            self._train_model()
+    
+    @property
+    def version(self) -> str:
+        """Model version id returned with every prediction"""
+        return self.runtime.version if self.runtime is not None else 'fallback'
     
     def _load_data(self):
         try:
+            import pandas as pd
             severity_df = pd.read_csv(os.path.join(self.data_dir, "Symptom_severity.csv"))
             self.symptom_severity = dict(zip(severity_df.iloc[:, 0], severity_df.iloc[:, 1]))
             
@@ -120,6 +215,8 @@ class HealthFirstAI:
             self._create_fallback_data()
     
     def _create_fallback_data(self):
+        import numpy as np
+        import pandas as pd
         print("📝 Creating fallback data...")
         self.symptom_severity = {
             'fever': 5, 'headache': 3, 'cough': 4, 'fatigue': 4, 'nausea': 5,
@@ -165,6 +262,11 @@ class HealthFirstAI:
     
     def _train_model(self):
         try:
+            from sklearn.tree import DecisionTreeClassifier
+            from sklearn.model_selection import train_test_split
+            from sklearn.preprocessing import LabelEncoder
+            
+            self.label_encoder = LabelEncoder()
             X = self.training_data.drop('prognosis', axis=1)
             y = self.training_data['prognosis']
             y_encoded = self.label_encoder.fit_transform(y)
@@ -178,6 +280,7 @@ class HealthFirstAI:
             
             train_accuracy = self.model.score(X_train, y_train)
             test_accuracy = self.model.score(X_test, y_test)
+            self.runtime = CompiledTree.from_sklearn(self.model, self.label_encoder)
             
             print(f"✅ Model trained successfully!")
             print(f"   Training accuracy: {train_accuracy:.2f}")
@@ -186,53 +289,92 @@ class HealthFirstAI:
         except Exception as e:
             print(f"❌ Error training model: {e}")
             self.model = None
+            self.runtime = None
+    
+    def _feature_vector(self, symptoms: List[str]):
+        import numpy as np
+        feature_vector = np.zeros(len(self.symptoms_list))
+        
+        for symptom in symptoms:
+            symptom_normalized = symptom.lower().replace(' ', '_')
+            for i, known_symptom in enumerate(self.symptoms_list):
+                if symptom_normalized in known_symptom or known_symptom in symptom_normalized:
+                    feature_vector[i] = 1
+                    break
+        return feature_vector
+    
+    def _build_result(self, predicted_disease: str, confidence: float, symptoms: List[str], age: int, days_sick: int,
+                      version: Optional[str] = None) -> Dict:
+        severity_score = self._calculate_severity_score(symptoms, age, days_sick)
+        priority = self._determine_priority(severity_score, confidence, age, days_sick)
+        
+        description = self.disease_descriptions.get(predicted_disease, "Không có mô tả.")
+        precautions = self.disease_precautions.get(predicted_disease, ["Tham khảo ý kiến bác sĩ", "Nghỉ ngơi", "Uống nhiều nước"])
+        
+        disease_vn = self.disease_translations.get(predicted_disease, predicted_disease)
+        
+        return {
+            'disease': disease_vn,
+            'disease_en': predicted_disease,
+            'confidence': round(confidence * 100, 1),
+            'severity_score': severity_score,
+            'priority': priority,
+            'description': description,
+            'precautions': precautions,
+            'recommendations': self._generate_recommendations(priority, disease_vn, age),
+            'symptoms_analyzed': symptoms,
+            'age_factor': age,
+            'duration_factor': days_sick,
+            'model_version': version or self.version
+        }
     
     def predict_disease(self, symptoms: List[str], age: int = 30, days_sick: int = 3) -> Dict:
         try:
-            if not self.model:
+            if self.runtime is None:
                 return self._fallback_prediction(symptoms, age, days_sick)
             
-            feature_vector = np.zeros(len(self.symptoms_list))
-            
-            for symptom in symptoms:
-                symptom_normalized = symptom.lower().replace(' ', '_')
-                for i, known_symptom in enumerate(self.symptoms_list):
-                    if symptom_normalized in known_symptom or known_symptom in symptom_normalized:
-                        feature_vector[i] = 1
-                        break
-            
-            prediction_encoded = self.model.predict([feature_vector])[0]
-            predicted_disease = self.label_encoder.inverse_transform([prediction_encoded])[0]
-            
-            probabilities = self.model.predict_proba([feature_vector])[0]
-            confidence = max(probabilities)
-            
-            severity_score = self._calculate_severity_score(symptoms, age, days_sick)
-            priority = self._determine_priority(severity_score, confidence, age, days_sick)
+            feature_vector = self._feature_vector(symptoms)
             
-            description = self.disease_descriptions.get(predicted_disease, "Không có mô tả.")
-            precautions = self.disease_precautions.get(predicted_disease, ["Tham khảo ý kiến bác sĩ", "Nghỉ ngơi", "Uống nhiều nước"])
+            # Model server (MODEL_SERVER_SOCKET) nếu bật; lỗi/khác version -> dự đoán tại chỗ
+            from model_server import model_client
+            if model_client.enabled:
+                remote = model_client.predict(feature_vector.nonzero()[0].tolist(), self.version)
+                if remote is not None:
+                    return self._build_result(remote['disease'], remote['confidence'], symptoms, age, days_sick,
+                                              version=remote['version'])
             
-            disease_vn = self.disease_translations.get(predicted_disease, predicted_disease)
+            probabilities = self.runtime.predict_proba([feature_vector])[0]
+            # predict() của cây quyết định = argmax của predict_proba
+            predicted_disease = str(self.runtime.classes[probabilities.argmax()])
+            confidence = float(probabilities.max())
             
-            return {
-                'disease': disease_vn,
-                'disease_en': predicted_disease,
-                'confidence': round(confidence * 100, 1),
-                'severity_score': severity_score,
-                'priority': priority,
-                'description': description,
-                'precautions': precautions,
-                'recommendations': self._generate_recommendations(priority, disease_vn, age),
-                'symptoms_analyzed': symptoms,
-                'age_factor': age,
-                'duration_factor': days_sick
-            }
+            return self._build_result(predicted_disease, confidence, symptoms, age, days_sick)
             
         except Exception as e:
             print(f"❌ Error in prediction: {e}")
             return self._fallback_prediction(symptoms, age, days_sick)
     
+    def predict_batch(self, cases: List[Tuple[List[str], int, int]]) -> List[Dict]:
+        """predict_disease for many (symptoms, age, days_sick) cases with one model call"""
+        if not cases:
+            return []
+        try:
+            if self.runtime is None:
+                return [self._fallback_prediction(*case) for case in cases]
+            
+            import numpy as np
+            features = np.vstack([self._feature_vector(symptoms) for symptoms, _, _ in cases])
+            probabilities = self.runtime.predict_proba(features)
+            diseases = self.runtime.classes[probabilities.argmax(axis=1)]
+            
+            return [
+                self._build_result(str(disease), float(probs.max()), symptoms, age, days_sick)
+                for disease, probs, (symptoms, age, days_sick) in zip(diseases, probabilities, cases)
+            ]
+        except Exception as e:
+            print(f"❌ Error in batch prediction: {e}")
+            return [self.predict_disease(*case) for case in cases]
+    
     def _calculate_severity_score(self, symptoms: List[str], age: int, days_sick: int) -> int:
         base_score = 0
         
@@ -316,7 +458,8 @@ class HealthFirstAI:
             'recommendations': self._generate_recommendations(priority, disease, age),
             'symptoms_analyzed': symptoms,
             'age_factor': age,
-            'duration_factor': days_sick
+            'duration_factor': days_sick,
+            'model_version': self.version
         }
     
     def get_available_symptoms(self) -> List[str]:
@@ -364,8 +507,7 @@ class HealthFirstAI:
     
     def save_model(self, filepath: str = "ai_model.pkl"):
         try:
-            with open(filepath, 'wb') as f:
-                pickle.dump({
+            _replace_atomically(filepath, lambda f: pickle.dump({
                     'model': self.model,
                     'label_encoder': self.label_encoder,
                     'symptoms_list': self.symptoms_list,
@@ -373,7 +515,7 @@ class HealthFirstAI:
                     'symptom_severity': self.symptom_severity,
                     'disease_descriptions': self.disease_descriptions,
                     'disease_precautions': self.disease_precautions
-                }, f)
+                }, f))
             print(f"✅ Model saved to {filepath}")
         except Exception as e:
             print(f"❌ Error saving model: {e}")
@@ -389,30 +531,228 @@ class HealthFirstAI:
                 self.symptom_severity = data['symptom_severity']
                 self.disease_descriptions = data['disease_descriptions']
                 self.disease_precautions = data['disease_precautions']
+            self.runtime = CompiledTree.from_sklearn(self.model, self.label_encoder) if self.model else None
             print(f"✅ Model loaded from {filepath}")
         except Exception as e:
             print(f"❌ Error loading model: {e}")
+    
+    def save_compiled(self, filepath: str = COMPILED_MODEL_PATH, source_digest: str = None):
+        """Write the NumPy-only model (tree arrays + symptom/disease tables)"""
+        try:
+            _replace_atomically(filepath, lambda f: self.runtime.save(f, {
+                'source_digest': source_digest,  # sha256 của ai_model.pkl đã compile
+                'symptoms_list': self.symptoms_list,
+                'diseases_list': self.diseases_list,
+                'symptom_severity': self.symptom_severity,
+                'disease_descriptions': self.disease_descriptions,
+                'disease_precautions': self.disease_precautions
+            }))
+            print(f"✅ Compiled model saved to {filepath}")
+        except Exception as e:
+            print(f"❌ Error saving compiled model: {e}")
+    
+    def load_compiled(self, filepath: str = COMPILED_MODEL_PATH, source_digest: str = None) -> bool:
+        """Load the NumPy-only model; no pandas/scikit-learn import"""
+        try:
+            runtime, data = CompiledTree.load(filepath)
+            if source_digest and data.get('source_digest') != source_digest:
+                print(f"⚠️ {filepath} is older than ai_model.pkl, recompiling")
+                return False
+            self.runtime = runtime
+            self.symptoms_list = data['symptoms_list']
+            self.diseases_list = data['diseases_list']
+            self.symptom_severity = data['symptom_severity']
+            self.disease_descriptions = data['disease_descriptions']
+            self.disease_precautions = data['disease_precautions']
+            print(f"✅ Model loaded from {filepath}")
+            return True
+        except Exception as e:
+            print(f"❌ Error loading compiled model: {e}")
+            self.runtime = None
+            return False
 
-# Global AI instance
-ai_diagnosis = None
-
-def initialize_ai():
-    global ai_diagnosis
+def build_ai(retrain: bool = False) -> Optional[HealthFirstAI]:
+    """A new HealthFirstAI from the model files (or trained from ai_data when missing / ``retrain``)"""
     try:
+        if retrain:
+            # Train lại từ ai_data/*.csv (cần pandas + scikit-learn), ghi cả pickle và bản compiled
+            model = HealthFirstAI()
+            if model.runtime is None:
+                return None
+            model.save_model("ai_model.pkl")
+            model.save_compiled(COMPILED_MODEL_PATH, _file_digest("ai_model.pkl"))
+            return model
+        
+        model = HealthFirstAI(train=False)
+        # Bản compiled khớp pickle hiện tại: chỉ cần NumPy, không train lại
+        source_digest = _file_digest("ai_model.pkl")
+        if os.path.exists(COMPILED_MODEL_PATH) and model.load_compiled(COMPILED_MODEL_PATH, source_digest):
+            return model
+        
         if os.path.exists("ai_model.pkl"):
-            ai_diagnosis = HealthFirstAI()
-            ai_diagnosis.load_model("ai_model.pkl")
-        else:
-            ai_diagnosis = HealthFirstAI()
-            ai_diagnosis.save_model("ai_model.pkl")
+            model.load_model("ai_model.pkl")
+        if model.runtime is None:
+            model = HealthFirstAI()
+            if not os.path.exists("ai_model.pkl"):
+                model.save_model("ai_model.pkl")
+        if model.runtime is not None:
+            model.save_compiled(COMPILED_MODEL_PATH, _file_digest("ai_model.pkl"))
         
-        return ai_diagnosis
+        return model
     except Exception as e:
         print(f"❌ Error initializing AI: {e}")
         return None
 
+def _file_digest(path: str):
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class ModelHolder:
+    """The current HealthFirstAI of this process, swapped atomically on reload.
+
+    ``get()`` is a plain attribute read once the model exists; only the first
+    call builds it, under a lock with a double check, so concurrent first
+    requests wait for one build instead of each training a model. ``reload()``
+    builds the new version while the old one keeps serving, then swaps the
+    reference: a request holds the object it got from ``get()``, so in-flight
+    requests finish on the old version.
+
+    Other gunicorn workers pick up a new ai_model.npz (written atomically by
+    a reload/retrain elsewhere) by checking its (mtime, size) at most once
+    every ``check_interval`` seconds, like SettingsStore. The new file is
+    loaded on a background thread; requests keep the current model until the
+    swap.
+    """
+
+    def __init__(self, path: str = COMPILED_MODEL_PATH, check_interval: float = 30.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._model: Optional[HealthFirstAI] = None
+        self._lock = threading.Lock()  # một lần build/swap tại một thời điểm
+        self._signature: Optional[tuple] = None
+        self._checked_at = 0.0
+        self.generation = 0
+        self.loaded_at: Optional[str] = None
+        self.previous_version: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    def init_app(self, app):
+        """Configure from the Flask app config (does not load the model)"""
+        self.check_interval = app.config.get('AI_MODEL_CHECK_INTERVAL', self.check_interval)
+        app.extensions['model_holder'] = self
+
+    def _file_signature(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _swap(self, model: HealthFirstAI):
+        """Publish a new model (caller holds the lock)"""
+        if self._model is not None:
+            self.previous_version = self._model.version
+        self._model = model
+        self._signature = self._file_signature()
+        self._checked_at = time.monotonic()
+        self.generation += 1
+        self.loaded_at = datetime.utcnow().isoformat()
+        print(f"🤖 AI model {model.version} active (generation {self.generation})")
+
+    def get(self) -> Optional[HealthFirstAI]:
+        """Current model, built on first use"""
+        model = self._model
+        if model is None:
+            with self._lock:
+                if self._model is None:
+                    built = build_ai()
+                    if built is None:
+                        return None
+                    self._swap(built)
+                model = self._model
+        elif self.check_interval and time.monotonic() - self._checked_at >= self.check_interval:
+            self._revalidate()
+            model = self._model
+        return model
+
+    def _revalidate(self):
+        self._checked_at = time.monotonic()
+        signature = self._file_signature()
+        if signature is None or signature == self._signature:
+            return
+        # Đang có thread khác build/swap: tiếp tục phục vụ bản hiện tại
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            # Build ở thread nền (giữ lock tới khi swap); request vẫn dùng bản hiện tại
+            threading.Thread(target=self._rebuild, args=(signature,), name='ai-model-reload', daemon=True).start()
+        except Exception:
+            self._lock.release()
+            raise
+
+    def _rebuild(self, signature: tuple):
+        """Load a changed ai_model.npz and swap it in (runs with the lock held)"""
+        try:
+            model = build_ai()
+            if model is None or model.version == self._model.version:
+                self._signature = signature
+                return
+            self._swap(model)
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"❌ Error reloading AI model: {e}")
+        finally:
+            self._lock.release()
+
+    def reload(self, retrain: bool = False) -> Dict[str, Any]:
+        """Build a new version (from the model files, or retrained) and swap it in"""
+        started = time.perf_counter()
+        with self._lock:
+            current = self._model.version if self._model is not None else None
+            model = build_ai(retrain=retrain)
+            if model is None:
+                self.last_error = 'model build failed'
+                raise RuntimeError('Could not build the AI model')
+            changed = model.version != current
+            if changed or self._model is None:
+                self._swap(model)
+            else:
+                self._signature = self._file_signature()
+            self.last_error = None
+        return {
+            'version': model.version,
+            'previous_version': current if changed else self.previous_version,
+            'changed': changed,
+            'generation': self.generation,
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        model = self._model
+        return {
+            'loaded': model is not None,
+            'version': model.version if model is not None else None,
+            'previous_version': self.previous_version,
+            'generation': self.generation,
+            'loaded_at': self.loaded_at,
+            'last_error': self.last_error
+        }
+
+
+# Global AI model holder
+model_holder = ModelHolder()
+
+def initialize_ai():
+    """(Re)load the model into the holder"""
+    try:
+        model_holder.reload()
+    except Exception as e:
+        print(f"❌ Error initializing AI: {e}")
+    return model_holder.get()
+
 def get_ai_diagnosis():
-    global ai_diagnosis
-    if ai_diagnosis is None:
-        ai_diagnosis = initialize_ai()
-    return ai_diagnosis
+    return model_holder.get()
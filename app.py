@@ -1,9 +1,27 @@
 from flask import Flask, render_template
 from flask_login import LoginManager
 from flask_cors import CORS
-from models import db, User
+from models import db
 from routes import main, auth, api, admin
 from config import config
+from db_engine import engine_profile
+from settings_store import settings_store
+from login_throttle import login_throttle
+from password_service import password_service
+from user_cache import user_cache
+from stats_service import dashboard_stats
+from page_cache import page_cache
+from assets import assets
+from compression import compression
+from json_provider import FastJSONProvider
+from jobs import job_queue
+from firestore_sync import firestore_sync
+from firebase_config import firebase_db
+from firestore_mirror import firestore_mirror
+from bootstrap import bootstrap_database
+from ai_diagnosis import model_holder
+from readiness import readiness
+from model_server import model_client
 import os
 import tempfile
 
@@ -22,6 +40,7 @@ def create_app(config_name='default'):
     # Ưu tiên APP_ENV (production/staging/development), fallback sang đối số
     env_name = os.getenv('APP_ENV', config_name)
     app.config.from_object(config.get(env_name, config['default']))
+    app.json = FastJSONProvider(app)
 
     # ----- Firebase credentials qua ENV (nếu có) -----
     # Để không cần commit file JSON lên repo
@@ -33,7 +52,24 @@ def create_app(config_name='default'):
             os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = tf.name
 
     # ----- Initialize extensions -----
+    engine_profile.init_app(app)  # SQLALCHEMY_ENGINE_OPTIONS, phải trước db.init_app
     db.init_app(app)
+    with app.app_context():
+        engine_profile.attach(db.engine)
+    settings_store.init_app(app)
+    login_throttle.init_app(app)
+    password_service.init_app(app)
+    user_cache.init_app(app)
+    dashboard_stats.init_app(app)
+    page_cache.init_app(app)
+    assets.init_app(app)
+    compression.init_app(app)
+    job_queue.init_app(app)
+    firebase_db.init_app(app)
+    firestore_mirror.init_app(app)
+    firestore_sync.init_app(app)
+    model_holder.init_app(app)  # model AI nạp ở lần dùng đầu tiên
+    model_client.init_app(app)
 
     login_manager = LoginManager()
     login_manager.init_app(app)
@@ -44,13 +80,20 @@ def create_app(config_name='default'):
     @login_manager.user_loader
     def load_user(user_id):
         try:
-            return User.query.get(int(user_id))
+            return user_cache.load(int(user_id))
         except Exception:
             return None
 
     # ----- CORS -----
     CORS(app)
 
+    # ----- Reverse proxy -----
+    # request.remote_addr = IP thật của client (throttle theo IP), không phải IP của load balancer
+    hops = app.config.get('TRUSTED_PROXY_HOPS', 0)
+    if hops:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+
     # ----- Register blueprints -----
     app.register_blueprint(main)
     app.register_blueprint(auth, url_prefix='/auth')
@@ -68,32 +111,40 @@ def create_app(config_name='default'):
         return render_template('errors/500.html'), 500
 
     # ----- DB init / seed -----
-    with app.app_context():
-        # Tạo bảng nếu chưa có (demo nhanh với SQLite)
-        db.create_all()
-
-        # Tạo admin mặc định nếu chưa tồn tại
-        admin_user = User.query.filter_by(email='admin@healthfirst.com').first()
-        if not admin_user:
-            admin_user = User(
-                email='admin@healthfirst.com',
-                display_name='Admin',
-                is_admin=True
-            )
-            admin_user.set_password('admin123')
-            db.session.add(admin_user)
-            db.session.commit()
-            print("[DB] Admin user created: admin@healthfirst.com / admin123")
+    # Production: chạy `python bootstrap.py` một lần khi deploy, không phải mỗi worker
+    if app.config.get('DB_AUTO_BOOTSTRAP'):
+        bootstrap_database(app)
+
+    @app.cli.command('bootstrap')
+    def bootstrap_command():
+        """Create tables/columns and the default admin"""
+        bootstrap_database(app)
+        print("✅ Database bootstrapped")
+
+    # ----- /healthz, /readyz (warm-up chạy nền, cần blueprint + DB ở trên) -----
+    readiness.init_app(app)
 
     return app
 
 
-# Create app instance (mặc định lấy theo APP_ENV nếu có)
-app = create_app(os.getenv('FLASK_ENV', 'development'))
+_app = None
+
+
+def __getattr__(name):
+    """Build the module-level ``app`` (gunicorn app:app) on first access, not at import"""
+    global _app
+    if name == 'app':
+        if _app is None:
+            # mặc định lấy theo APP_ENV nếu có
+            _app = create_app(os.getenv('FLASK_ENV', 'development'))
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 if __name__ == '__main__':
     # Khi chạy local: đọc PORT từ env (mặc định 5000)
     port = int(os.getenv("PORT", 5000))
     # Gợi ý: đặt APP_ENV=development khi chạy local để bật debug
     debug = os.getenv('APP_ENV', 'development') == 'development'
+    app = create_app(os.getenv('FLASK_ENV', 'development'))
     app.run(host='0.0.0.0', port=port, debug=debug)
@@ -0,0 +1,107 @@
+import json
+import mimetypes
+import os
+from typing import Dict
+
+from flask import request, send_from_directory, url_for
+from markupsafe import Markup
+
+mimetypes.add_type('font/woff2', '.woff2')
+
+# Asset đã fingerprint không bao giờ đổi nội dung -> cache 1 năm
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+class AssetManifest:
+    """Resolve logical asset paths (``css/main.css``) to fingerprinted files.
+
+    ``build_assets.py`` writes ``static/dist/manifest.json``; templates call
+    ``asset_url('css/main.css')``. Without a manifest (fresh checkout, dev)
+    the unhashed file under ``static/`` is used. Files under ``/static/dist``
+    are served with immutable caching and their precompressed ``.br``/``.gz``
+    variant when the client accepts it. ``inline_asset`` embeds small files
+    (critical CSS) directly into the page.
+    """
+
+    def __init__(self):
+        self.manifest: Dict[str, str] = {}
+        self.dist_dir = None
+        self.static_dir = None
+        self._inline_cache: Dict[str, Markup] = {}
+        self._manifest_mtime = None
+        self._reload = False
+
+    def init_app(self, app):
+        self.static_dir = app.static_folder
+        self.dist_dir = os.path.join(app.static_folder, 'dist')
+        self._reload = app.debug
+        self._load()
+        app.add_template_global(self.asset_url, 'asset_url')
+        app.add_template_global(self.inline_asset, 'inline_asset')
+        app.add_url_rule(f'{app.static_url_path}/dist/<path:filename>', 'static_dist', self.serve_dist)
+        app.extensions['assets'] = self
+
+    def _load(self):
+        path = os.path.join(self.dist_dir, 'manifest.json')
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self.manifest, self._manifest_mtime = {}, None
+            return
+        if mtime == self._manifest_mtime:
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+            self._manifest_mtime = mtime
+            self._inline_cache.clear()
+        except Exception as e:
+            print(f"❌ Error loading asset manifest: {e}")
+            self.manifest = {}
+
+    def asset_url(self, filename: str) -> str:
+        """url_for('static', ...) that prefers the fingerprinted build output"""
+        if self._reload:
+            self._load()
+        return url_for('static', filename=self.manifest.get(filename, filename))
+
+    def inline_asset(self, filename: str) -> Markup:
+        """Contents of a (minified when built) asset for inlining in <style>/<script>"""
+        if self._reload:
+            self._load()
+        cached = self._inline_cache.get(filename)
+        if cached is not None:
+            return cached
+        path = os.path.join(self.static_dir, self.manifest.get(filename, filename))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = Markup(f.read().strip())
+        except OSError as e:
+            print(f"❌ Error inlining asset {filename}: {e}")
+            return Markup('')
+        if not self._reload:
+            self._inline_cache[filename] = content
+        return content
+
+    def serve_dist(self, filename: str):
+        """Serve a fingerprinted asset, precompressed when possible"""
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        accepted = request.accept_encodings
+        encoding = None
+        for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if accepted[candidate] and os.path.isfile(os.path.join(self.dist_dir, filename + suffix)):
+                encoding = candidate
+                filename = filename + suffix
+                break
+
+        response = send_from_directory(self.dist_dir, filename, mimetype=mimetype,
+                                       max_age=IMMUTABLE_MAX_AGE, conditional=True)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        return response
+
+
+# Global asset manifest instance
+assets = AssetManifest()
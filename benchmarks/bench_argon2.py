@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark Argon2 parameters on this machine
+Đo thời gian hash/verify cho từng bộ tham số để chọn ARGON2_* phù hợp phần cứng
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_service import _hash_password, _verify_password
+
+PASSWORD = 'correct horse battery staple'
+
+
+def measure(params, rounds):
+    """Return median hash and verify time in milliseconds"""
+    hash_times, verify_times = [], []
+    pw_hash = _hash_password(PASSWORD, params)
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _hash_password(PASSWORD, params)
+        hash_times.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        _verify_password(pw_hash, PASSWORD, params)
+        verify_times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(hash_times), statistics.median(verify_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--target-ms', type=float, default=50.0,
+                        help='verify latency budget per login')
+    args = parser.parse_args()
+
+    print("🔐 Argon2 benchmark")
+    print("=" * 60)
+    print(f"{'time_cost':>9} {'memory_KiB':>10} {'parallel':>8} {'hash_ms':>9} {'verify_ms':>9}")
+
+    best = None
+    for memory_cost in (19456, 32768, 65536):
+        for time_cost in (2, 3, 4):
+            for parallelism in (1, 2, 4):
+                params = {'time_cost': time_cost, 'memory_cost': memory_cost, 'parallelism': parallelism}
+                hash_ms, verify_ms = measure(params, args.rounds)
+                print(f"{time_cost:>9} {memory_cost:>10} {parallelism:>8} {hash_ms:>9.1f} {verify_ms:>9.1f}")
+                # Chọn bộ tham số mạnh nhất vẫn nằm trong ngân sách độ trễ
+                if verify_ms <= args.target_ms:
+                    strength = memory_cost * time_cost
+                    if best is None or strength > best[0]:
+                        best = (strength, params, verify_ms)
+
+    print("=" * 60)
+    if best:
+        _, params, verify_ms = best
+        print(f"✅ Recommended (verify {verify_ms:.1f} ms <= {args.target_ms:.0f} ms):")
+        print(f"   ARGON2_TIME_COST={params['time_cost']}")
+        print(f"   ARGON2_MEMORY_COST={params['memory_cost']}")
+        print(f"   ARGON2_PARALLELISM={params['parallelism']}")
+    else:
+        print(f"⚠️  No parameter set fits within {args.target_ms:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Measure worker memory while exporting assessments
+Đo peak RSS khi xuất N đánh giá: stream (exports.py, yield_per) so với cách cũ
+(query .all() rồi dựng toàn bộ output trong bộ nhớ). Mỗi chế độ chạy trong một
+process riêng để peak RSS không lẫn nhau.
+
+Usage:
+    python benchmarks/bench_export.py --rows 1000000
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+
+def create_app_for(db_path):
+    os.environ['APP_ENV'] = 'production'
+    os.environ['DB_AUTO_BOOTSTRAP'] = 'true'  # bảng + admin như bootstrap.py
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    from app import create_app
+    return create_app('production')
+
+
+def populate(db_path, rows):
+    app = create_app_for(db_path)
+    from models import db
+    with app.app_context():
+        chunk = [
+            {'user_id': 1, 'symptoms': 'sốt, ho, đau đầu', 'age': 30 + i % 40, 'days': 1 + i % 7,
+             'priority': ('emergency', 'high', 'consult_doctor', 'home_care')[i % 4],
+             'message': 'Nên đến cơ sở y tế để được khám', 'description': 'Theo dõi triệu chứng ' * 5,
+             'created_at': '2024-01-01 00:00:00'}
+            for i in range(10000)
+        ]
+        sql = db.text(
+            "INSERT INTO assessments (user_id, symptoms, age_at_assessment, days_sick, priority, message, "
+            "description, created_at) VALUES (:user_id, :symptoms, :age, :days, :priority, :message, "
+            ":description, :created_at)"
+        )
+        for start in range(0, rows, len(chunk)):
+            db.session.execute(sql, chunk[: min(len(chunk), rows - start)])
+            db.session.commit()
+
+
+def run_mode(db_path, mode):
+    app = create_app_for(db_path)
+    client = app.test_client()
+    client.post('/auth/login', data={'email': 'admin@healthfirst.com', 'password': 'admin123'})
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+
+    if mode == 'stream':
+        response = client.get('/admin/admin/export/assessments?format=csv', buffered=False)
+        size = sum(len(chunk) for chunk in response.response)
+        response.close()
+    else:
+        import csv
+        import io
+        from models import Assessment
+        with app.app_context():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for item in Assessment.query.order_by(Assessment.id).all():
+                writer.writerow(item.to_dict().values())
+            size = len(buffer.getvalue().encode('utf-8'))
+
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{mode:7s} {size / 1e6:8.1f} MB out  {elapsed:6.1f} s  "
+          f"peak RSS {peak / 1024:7.1f} MiB (+{(peak - baseline) / 1024:.1f} MiB during export)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--mode', choices=['populate', 'stream', 'load'], help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode == 'populate':
+        populate(args.db, args.rows)
+        return
+    if args.mode:
+        run_mode(args.db, args.mode)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'export.db')
+        print(f"Populating {args.rows} assessments...")
+        subprocess.run([sys.executable, __file__, '--rows', str(args.rows), '--db', db_path, '--mode', 'populate'],
+                       check=True)
+        for mode in ('stream', 'load'):
+            subprocess.run([sys.executable, __file__, '--db', db_path, '--mode', mode], check=True)
+
+
+if __name__ == '__main__':
+    main()
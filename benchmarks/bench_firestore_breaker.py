@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Firestore deadlines + circuit breaker under injected faults (FakeFirestore)
+Gọi firebase_db.save_contact / get_all_contacts như routes.py trong bốn pha:
+
+  1. healthy   - Firestore trả lời sau --latency-ms,
+  2. outage    - mọi RPC treo --outage-s giây: so sánh không breaker (mỗi request
+                 chờ hết deadline) với có breaker (mở sau --threshold lỗi),
+  3. recovery  - Firestore trả lời lại: sau --cooldown-s breaker half-open -> closed,
+  4. errors    - ServiceUnavailable mở breaker, NotFound (lỗi của request) và lỗi
+                 cục bộ trước RPC (KeyError) thì không.
+
+Thoát với mã 1 nếu breaker không chuyển trạng thái như mong đợi.
+
+Usage:
+    python benchmarks/bench_firestore_breaker.py
+    python benchmarks/bench_firestore_breaker.py --calls 50 --timeout-ms 300
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from fake_firestore import FakeFirestore, ServiceUnavailable  # noqa: E402
+from firebase_config import CircuitBreaker, FirebaseDB  # noqa: E402
+
+
+def contact(i):
+    return {'id': i, 'name': f'User {i}', 'email': f'user{i}@example.com', 'subject': 'Hi', 'message': 'Hello'}
+
+
+def run(label, db, calls, start=0):
+    samples = []
+    for i in range(calls):
+        began = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # bỏ các dòng ✅/❌ của từng lời gọi
+            if i % 2:
+                db.get_all_contacts()
+            else:
+                db.save_contact(contact(start + i))
+        samples.append((time.perf_counter() - began) * 1000)
+    print(f"  {label:34s} {calls:4d} calls  avg {statistics.mean(samples):8.2f} ms  "
+          f"max {max(samples):8.2f} ms  total {sum(samples) / 1000:6.2f} s  breaker {db.breaker.state}")
+    return samples
+
+
+def make_db(client, timeout, threshold, cooldown):
+    db = FirebaseDB(timeout=timeout)
+    db.breaker = CircuitBreaker(failure_threshold=threshold, cooldown=cooldown)
+    db.db = client
+    return db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=40)
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='healthy RPC latency')
+    parser.add_argument('--outage-s', type=float, default=30.0, help='RPC latency during the outage')
+    parser.add_argument('--timeout-ms', type=float, default=200.0, help='per-call deadline')
+    parser.add_argument('--threshold', type=int, default=5)
+    parser.add_argument('--cooldown-s', type=float, default=1.0)
+    args = parser.parse_args()
+    timeout, failed = args.timeout_ms / 1000, []
+
+    client = FakeFirestore()
+    client.inject(latency=args.latency_ms / 1000)
+    db = make_db(client, timeout, args.threshold, args.cooldown_s)
+    print(f"deadline {args.timeout_ms:g} ms, threshold {args.threshold}, cool-down {args.cooldown_s:g} s")
+
+    print("1. healthy")
+    run('breaker', db, args.calls)
+
+    print(f"2. outage (every RPC hangs {args.outage_s:g} s)")
+    client.inject(latency=args.outage_s)
+    no_breaker = make_db(client, timeout, 10 ** 9, args.cooldown_s)
+    run('no breaker (deadline only)', no_breaker, args.calls)
+    samples = run('breaker', db, args.calls)
+    if db.breaker.state != CircuitBreaker.OPEN:
+        failed.append('breaker did not open during the outage')
+    if max(samples[args.threshold:]) > args.timeout_ms / 10:
+        failed.append('calls were not short-circuited once the breaker was open')
+
+    print("3. recovery")
+    client.inject(latency=args.latency_ms / 1000)
+    run('breaker, still cooling down', db, 4)
+    time.sleep(args.cooldown_s)
+    run('breaker, after cool-down', db, args.calls)
+    if db.breaker.state != CircuitBreaker.CLOSED:
+        failed.append('breaker did not close after Firestore recovered')
+
+    print("4. errors")
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.update_user('missing', {'name': 'x'})  # NotFound: Firestore trả lời -> không tính
+    print(f"  update of a missing document          breaker {db.breaker.state} "
+          f"(consecutive failures {db.breaker.failures})")
+    if db.breaker.failures:
+        failed.append('a request error counted as a Firestore failure')
+    client.inject(error=ServiceUnavailable('503 unavailable'))
+    run('ServiceUnavailable', db, 1)
+    client.inject(error=None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        db.save_user({'email': 'x@example.com'})  # KeyError 'id' trước RPC nào
+    print(f"  save_user without 'id' after 1 failure breaker {db.breaker.state} "
+          f"(consecutive failures {db.breaker.failures})")
+    if db.breaker.failures != 1:
+        failed.append('a local error changed the failure count')
+    client.inject(error=ServiceUnavailable('503 unavailable'))
+    run('ServiceUnavailable', db, args.threshold + 2)
+    if db.breaker.state != CircuitBreaker.OPEN:
+        failed.append('breaker did not open on ServiceUnavailable')
+
+    stats = db.stats()
+    print(f"firebase_db.stats(): calls {stats['calls']}, errors {stats['errors']}, timeouts {stats['timeouts']}")
+    print(f"breaker: { {key: value for key, value in stats['breaker'].items() if key != 'last_error'} }")
+    if failed:
+        for message in failed:
+            print(f"❌ {message}")
+        sys.exit(1)
+    print("✅ breaker opened, short-circuited, and recovered as expected")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Latency of firebase_db.get_statistics: sequential vs concurrent fan-out
+Chín truy vấn (6 đếm + 3 "gần đây") trên FakeFirestore với độ trễ mỗi RPC
+--latency-ms:
+
+  1. cách cũ: chạy lần lượt, tổng độ trễ = tổng chín truy vấn,
+  2. get_statistics hiện tại: chạy song song, chờ truy vấn chậm nhất,
+  3. một collection treo (--slow-s): kết quả partial sau đúng deadline
+     (--timeout-ms), các số liệu khác vẫn có.
+
+Usage:
+    python benchmarks/bench_firestore_fanout.py
+    python benchmarks/bench_firestore_fanout.py --latency-ms 80 --runs 10
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from fake_firestore import DESCENDING, FakeFirestore  # noqa: E402
+from firebase_config import FirebaseDB  # noqa: E402
+
+COUNTS = {'người dùng': 'total_users', 'đánh giá': 'total_assessments', 'liên hệ': 'total_contacts',
+          'hồ_sơ_sức_khỏe': 'total_health_records', 'lịch_hẹn': 'total_appointments',
+          'thông_báo': 'total_notifications'}
+RECENT = {'đánh giá': 'recent_assessments', 'liên hệ': 'recent_contacts',
+          'hồ_sơ_sức_khỏe': 'recent_health_records'}
+
+
+def seed(client, rows):
+    now = datetime.utcnow()
+    for n, collection in enumerate(COUNTS):
+        for i in range(rows + n):
+            client.collection(collection).document(i)._set({'id': i, 'created_at': now - timedelta(minutes=i)})
+
+
+def sequential(client):
+    """The previous get_statistics: nine queries one after another"""
+    stats = {key: len(list(client.collection(collection).stream())) for collection, key in COUNTS.items()}
+    for collection, key in RECENT.items():
+        query = client.collection(collection).order_by('created_at', direction=DESCENDING).limit(5)
+        stats[key] = [doc.to_dict() for doc in query.stream()]
+    return stats
+
+
+def measure(function, runs):
+    samples, result = [], None
+    for _ in range(runs):
+        began = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = function()
+        samples.append((time.perf_counter() - began) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200, help='documents per collection')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='latency of every RPC')
+    parser.add_argument('--timeout-ms', type=float, default=1000.0, help='per-call deadline')
+    parser.add_argument('--slow-s', type=float, default=30.0, help='latency of the hanging collection')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    client = FakeFirestore()
+    seed(client, args.rows)
+    client.inject(latency=args.latency_ms / 1000)
+    db = FirebaseDB(timeout=args.timeout_ms / 1000)
+    db.db = client
+    print(f"RPC latency {args.latency_ms:g} ms, deadline {args.timeout_ms:g} ms, median of {args.runs}")
+
+    old_ms, expected = measure(lambda: sequential(client), args.runs)
+    new_ms, stats = measure(db.get_statistics, args.runs)
+    print(f"  sequential (previous)     {old_ms:8.1f} ms")
+    print(f"  concurrent fan-out        {new_ms:8.1f} ms  ({old_ms / new_ms:.1f}x)")
+    if stats != expected:
+        print("❌ concurrent result differs from the sequential one")
+        sys.exit(1)
+
+    client.inject(latency=args.latency_ms / 1000, slow={'thông_báo': args.slow_s})
+    slow_ms, stats = measure(db.get_statistics, 1)
+    print(f"  'thông_báo' hangs {args.slow_s:g} s  {slow_ms:8.1f} ms  partial={stats.get('partial', False)} "
+          f"missing={list(stats.get('missing', {}))}, {len(stats) - 2} of 9 values present")
+    if not stats.get('partial') or list(stats['missing']) != ['total_notifications']:
+        print("❌ expected a partial result missing only total_notifications")
+        sys.exit(1)
+    print(f"firebase_db.stats(): partial {db.stats()['partial']}, breaker {db.breaker.state}")
+
+
+if __name__ == '__main__':
+    main()
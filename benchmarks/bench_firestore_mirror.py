@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Admin Firestore reads: direct queries vs the on_snapshot mirror (FakeFirestore)
+Dùng nguồn snapshot giả của FakeFirestore (on_snapshot/disconnect) để đo và
+kiểm tra firestore_mirror:
+
+  1. get_all_contacts + get_statistics lặp lại: độ trễ và số lần đọc Firestore,
+  2. độ tươi: contact mới ghi xuất hiện trong bản sao qua listener,
+  3. mất listener: còn phục vụ từ RAM trong --max-staleness-s, sau đó đọc trực
+     tiếp, rồi đăng ký lại và phục vụ từ RAM tiếp,
+  4. giới hạn kích thước: view bị cắt ở --max-docs -> "tất cả" đọc trực tiếp,
+     "gần đây" vẫn từ RAM.
+
+Thoát với mã 1 nếu một bước không đúng như mong đợi.
+
+Usage:
+    python benchmarks/bench_firestore_mirror.py
+    python benchmarks/bench_firestore_mirror.py --rows 1000 --latency-ms 40
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from fake_firestore import FakeFirestore  # noqa: E402
+from firebase_config import FirebaseDB  # noqa: E402
+from firestore_mirror import FirestoreMirror  # noqa: E402
+
+
+def seed(client, rows):
+    now = datetime.utcnow()
+    for collection in ('liên hệ', 'đánh giá'):
+        for i in range(rows):
+            client.collection(collection).document(i)._set(
+                {'id': i, 'name': f'User {i}', 'subject': 'Hi', 'created_at': now - timedelta(minutes=i)})
+
+
+def admin_reads(db, calls):
+    samples = []
+    for _ in range(calls):
+        began = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.get_all_contacts()
+            db.get_statistics()
+        samples.append((time.perf_counter() - began) * 1000)
+    return statistics.median(samples)
+
+
+def quiet(function, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=300, help='documents in liên hệ and đánh giá')
+    parser.add_argument('--latency-ms', type=float, default=30.0, help='latency of every direct RPC')
+    parser.add_argument('--calls', type=int, default=20)
+    parser.add_argument('--max-staleness-s', type=float, default=0.5)
+    parser.add_argument('--max-docs', type=int, default=1000)
+    args = parser.parse_args()
+    failed = []
+
+    client = FakeFirestore()
+    seed(client, args.rows)
+    client.inject(latency=args.latency_ms / 1000)
+    db = FirebaseDB()
+    db.db = client
+    mirror = FirestoreMirror(max_docs=args.max_docs, max_staleness=args.max_staleness_s, retry_after=0.1)
+    mirror.enabled, mirror.client_factory = True, lambda: client
+    print(f"{args.rows} docs per collection, RPC latency {args.latency_ms:g} ms")
+
+    print("1. get_all_contacts + get_statistics")
+    client.reset_counters()
+    direct_ms = admin_reads(db, args.calls)
+    direct_reads = client.reads / args.calls
+    expected = quiet(db.get_all_contacts)
+    db.mirror = mirror
+    quiet(mirror.start)
+    if not wait_for(lambda: mirror.read('contacts') is not None):
+        failed.append('mirror never synced')
+    client.reset_counters()
+    mirror_ms = admin_reads(db, args.calls)
+    mirror_reads = client.reads / args.calls
+    print(f"  direct   {direct_ms:8.1f} ms  {direct_reads:7.0f} Firestore reads per page")
+    print(f"  mirror   {mirror_ms:8.1f} ms  {mirror_reads:7.0f} Firestore reads per page")
+    if quiet(db.get_all_contacts) != expected:
+        failed.append('mirror contacts differ from the direct query')
+
+    print("2. freshness")
+    quiet(db.save_contact, {'id': 'new', 'name': 'Newest', 'subject': 'Hello', 'created_at': datetime.utcnow()})
+    newest = quiet(db.get_all_contacts)[0]
+    print(f"  newest contact after save_contact: {newest['name']!r} ({mirror.metrics['changes']} changes applied)")
+    if newest['id'] != 'new':
+        failed.append('new contact not visible through the listener')
+
+    print("3. listener disconnected")
+    client.disconnect()
+    client.inject(latency=args.latency_ms / 1000, error=None)
+    # Đăng ký lại bị chặn (Firestore không trả lời listener) để thấy ngưỡng staleness
+    mirror.retry_after = 3600
+    hits = mirror.metrics['hits']
+    quiet(db.get_all_contacts)
+    served_stale = mirror.metrics['hits'] > hits
+    time.sleep(args.max_staleness_s + 0.1)
+    fallbacks = mirror.metrics['fallback_stale']
+    quiet(db.get_all_contacts)
+    fell_back = mirror.metrics['fallback_stale'] > fallbacks
+    print(f"  within {args.max_staleness_s:g} s: served from mirror={served_stale}; "
+          f"after: direct query={fell_back}")
+    if not served_stale or not fell_back:
+        failed.append('staleness bound not applied')
+    mirror.retry_after = 0.0
+    quiet(mirror.read, 'contacts')  # đăng ký lại ở nền
+    resynced = wait_for(lambda: quiet(mirror.read, 'contacts') is not None)
+    print(f"  resubscribed: {resynced} (subscribes {mirror.metrics['subscribes']})")
+    if not resynced:
+        failed.append('mirror did not resubscribe')
+
+    print(f"4. size bound (max_docs {args.rows // 2})")
+    bounded = FirestoreMirror(max_docs=args.rows // 2, max_staleness=args.max_staleness_s)
+    bounded.enabled, bounded.client_factory = True, lambda: client
+    quiet(bounded.start)
+    wait_for(lambda: bounded.metrics['subscribes'] == len(bounded.views))
+    recent, everything = bounded.read('contacts', limit=5), bounded.read('contacts')
+    print(f"  recent 5 from mirror={recent is not None}; all contacts from mirror={everything is not None} "
+          f"({bounded.stats()['views']['contacts']['docs']} docs held)")
+    if recent is None or everything is not None:
+        failed.append('size bound not applied')
+    bounded.stop()
+    mirror.stop()
+
+    print(f"mirror.stats(): { {key: value for key, value in mirror.metrics.items()} }")
+    if failed:
+        for message in failed:
+            print(f"❌ {message}")
+        sys.exit(1)
+    print("✅ mirror served reads locally, stayed fresh, and fell back when stale")
+
+
+if __name__ == '__main__':
+    main()
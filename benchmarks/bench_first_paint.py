@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Compare the render-blocking critical path of pages against a baseline revision
+So sánh tài nguyên chặn first paint (origin, số RTT, bytes đã nén) giữa template
+hiện tại và một commit cũ, rồi ước lượng thời gian first paint theo profile mạng.
+
+Đây là mô hình (không có trình duyệt): số đo thật cần Lighthouse/WebPageTest.
+
+Usage:
+    python benchmarks/bench_first_paint.py --baseline HEAD~1 / /auth/login
+"""
+
+import argparse
+import gzip
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from urllib.parse import urlparse
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+os.environ.setdefault('APP_ENV', 'testing')
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# (tên, RTT giây, băng thông bytes/giây) - tương tự profile của Lighthouse
+PROFILES = [
+    ('broadband', 0.040, 5_000_000 / 8),
+    ('slow-4g', 0.150, 1_600_000 / 8),
+    ('3g', 0.300, 700_000 / 8),
+]
+# DNS + TCP + TLS cho một origin mới
+NEW_ORIGIN_RTTS = 3
+
+HEAD_RE = re.compile(r'<head>(.*?)</head>', re.S | re.I)
+NOSCRIPT_RE = re.compile(r'<noscript>.*?</noscript>', re.S | re.I)
+TAG_RE = re.compile(r'<(link|script)\b([^>]*)>', re.I)
+ATTR_RE = re.compile(r'([a-z-]+)(?:="([^"]*)")?', re.I)
+
+
+def blocking_resources(html):
+    """Stylesheets and synchronous scripts in <head> (they delay first paint)"""
+    match = HEAD_RE.search(html)
+    head = NOSCRIPT_RE.sub('', match.group(1) if match else '')
+    resources = []
+    for tag, raw in TAG_RE.findall(head):
+        attrs = {k.lower(): v for k, v in ATTR_RE.findall(raw)}
+        if tag.lower() == 'link':
+            if attrs.get('rel') == 'stylesheet' and attrs.get('media', 'all') != 'print':
+                resources.append(attrs['href'])
+        elif attrs.get('src') and not ({'async', 'defer'} & set(attrs)) and attrs.get('type') != 'module':
+            resources.append(attrs['src'])
+    return resources
+
+
+def compressed_size(data):
+    if brotli is not None:
+        return len(brotli.compress(data, quality=11))
+    return len(gzip.compress(data, compresslevel=9))
+
+
+def external_size(url):
+    """Estimate a CDN file's transfer size from the vendored copy of the same library"""
+    name = os.path.basename(urlparse(url).path)
+    candidates = {
+        'bootstrap.min.css': 'static/vendor/bootstrap/bootstrap.min.css',
+        'bootstrap.bundle.min.js': 'static/vendor/bootstrap/bootstrap.bundle.min.js',
+        'chart.js': 'static/vendor/chartjs/chart.umd.min.js',
+    }
+    if name == 'all.min.css':
+        try:
+            import fontawesomefree
+            path = os.path.join(os.path.dirname(fontawesomefree.__file__),
+                                'static', 'fontawesomefree', 'css', 'all.min.css')
+        except ImportError:
+            return None
+    elif name in candidates:
+        path = os.path.join(BASE_DIR, candidates[name])
+    else:
+        return None
+    with open(path, 'rb') as f:
+        return compressed_size(f.read())
+
+
+def measure(client, path):
+    html = client.get(path).get_data(as_text=True)
+    rows = []
+    for url in blocking_resources(html):
+        parsed = urlparse(url)
+        if parsed.netloc:
+            rows.append((url, parsed.netloc, external_size(url)))
+        else:
+            response = client.get(url, headers={'Accept-Encoding': 'br, gzip'})
+            rows.append((url, None, len(response.data) if response.status_code == 200 else None))
+    return rows
+
+
+def estimate(rows, rtt, bandwidth):
+    """Connection setup of the slowest new origin + one request RTT + bytes on the wire"""
+    origins = {origin for _, origin, _ in rows if origin}
+    setup = NEW_ORIGIN_RTTS * rtt if origins else 0.0
+    total = sum(size or 0 for _, _, size in rows)
+    return setup + (rtt if rows else 0.0) + total / bandwidth
+
+
+def report(label, rows):
+    origins = sorted({origin for _, origin, _ in rows if origin})
+    total = sum(size or 0 for _, _, size in rows)
+    print(f"\n== {label}: {len(rows)} blocking, {len(origins)} third-party origins, {total / 1024:.1f} KiB")
+    for url, origin, size in rows:
+        shown = f"{size / 1024:7.1f} KiB" if size is not None else "      ? KiB"
+        print(f"   {shown}  {'[3rd-party] ' if origin else ''}{url}")
+    for name, rtt, bandwidth in PROFILES:
+        print(f"   ~{estimate(rows, rtt, bandwidth) * 1000:6.0f} ms  {name}")
+    if origins:
+        print("   offline: first paint waits for the CDN request to fail/time out")
+
+
+def baseline_templates(revision, target):
+    """Extract templates/ as they were at a git revision"""
+    archive = subprocess.run(['git', 'archive', revision, 'templates'], cwd=BASE_DIR,
+                             check=True, capture_output=True).stdout
+    subprocess.run(['tar', '-x', '-C', target], input=archive, check=True)
+    return os.path.join(target, 'templates')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='*', default=['/', '/auth/login', '/guides'])
+    parser.add_argument('--baseline', help='git revision to compare against (e.g. HEAD~1)')
+    args = parser.parse_args()
+
+    from jinja2 import FileSystemLoader
+    from app import create_app
+    from page_cache import page_cache
+
+    app = create_app('testing')
+    page_cache.enabled = False
+    client = app.test_client()
+    current_loader = app.jinja_loader
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in args.paths:
+            if args.baseline:
+                app.jinja_loader = FileSystemLoader(baseline_templates(args.baseline, tmp))
+                app.jinja_env.cache = {}
+                report(f"{path} @ {args.baseline}", measure(client, path))
+                app.jinja_loader = current_loader
+                app.jinja_env.cache = {}
+            report(f"{path} @ working tree", measure(client, path))
+
+
+if __name__ == '__main__':
+    main()
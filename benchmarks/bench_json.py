@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization of the big list endpoints
+So sánh Flask DefaultJSONProvider (trước) với FastJSONProvider (json / orjson)
+trên /api/firebase/users, /api/firebase/assessments và /api/ai/diseases.
+
+Firestore được thay bằng dữ liệu giả có cùng hình dạng (datetime, tiếng Việt)
+để chạy được khi không có credentials.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('APP_ENV', 'testing')
+
+SYMPTOMS = ['Đau đầu', 'Sốt cao', 'Ho khan', 'Mệt mỏi', 'Buồn nôn', 'Chóng mặt', 'Khó thở']
+
+
+def fake_users(n):
+    now = datetime.now(timezone.utc)
+    return [{
+        'id': str(i),
+        'user_id': i,
+        'email': f'nguoidung{i}@healthfirst.vn',
+        'display_name': f'Nguyễn Văn Người Dùng {i}',
+        'age': 20 + i % 50,
+        'gender': 'Nam' if i % 2 else 'Nữ',
+        'height': 160.5 + i % 20,
+        'weight': 55.2 + i % 30,
+        'is_admin': False,
+        'is_active': True,
+        'created_at': now - timedelta(days=i),
+        'updated_at': now,
+        'last_sync': now,
+    } for i in range(n)]
+
+
+def fake_assessments(n):
+    now = datetime.now(timezone.utc)
+    return [{
+        'id': str(i),
+        'user_id': i % 500,
+        'user_name': f'Trần Thị Bệnh Nhân {i % 500}',
+        'symptoms': SYMPTOMS[: 2 + i % 5],
+        'severity': ['nhẹ', 'trung bình', 'nặng'][i % 3],
+        'diagnosis': 'Cảm cúm thông thường, nên nghỉ ngơi và uống nhiều nước',
+        'confidence': 0.5 + (i % 50) / 100,
+        'recommendations': ['Nghỉ ngơi đầy đủ', 'Uống nhiều nước', 'Theo dõi nhiệt độ'],
+        'created_at': now - timedelta(minutes=i),
+        'updated_at': now,
+        'last_sync': now,
+    } for i in range(n)]
+
+
+def timed(client, path, rounds):
+    samples, size = [], 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        response = client.get(path)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, (path, response.status_code)
+        size = len(response.data)
+    return statistics.median(samples), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    from flask.json.provider import DefaultJSONProvider
+    from app import create_app
+    from compression import compression
+    from firebase_config import firebase_db
+    from json_provider import FastJSONProvider, orjson
+
+    users, assessments = fake_users(args.rows), fake_assessments(args.rows)
+    firebase_db.get_all_users = lambda: users
+    firebase_db.get_all_assessments = lambda: assessments
+
+    app = create_app('testing')
+    compression.enabled = False  # chỉ đo phần JSON
+    client = app.test_client()
+    client.post('/auth/login', data={'email': 'admin@healthfirst.com', 'password': 'admin123'})
+
+    def fast_provider(backend):
+        app.config['JSON_BACKEND'] = backend
+        return FastJSONProvider(app)
+
+    providers = [('flask default (before)', lambda: DefaultJSONProvider(app))]
+    for backend in ('stdlib', 'orjson'):
+        if backend == 'orjson' and orjson is None:
+            print("⚠️  orjson not installed: skipping")
+            continue
+        providers.append((f'FastJSONProvider/{backend}', lambda backend=backend: fast_provider(backend)))
+
+    # Số nguyên > 64 bit (orjson từ chối) và kiểu lạ phải ra cùng kết quả ở mọi backend
+    for label, factory in providers[1:]:
+        provider = factory()
+        encoded = provider.dumps({'a': 2 ** 70, 'b': 'Việt'})
+        assert encoded == '{"a":1180591620717411303424,"b":"Việt"}', (label, encoded)
+        with app.test_request_context():
+            assert provider.response({'a': 2 ** 70}).get_data().rstrip() == b'{"a":1180591620717411303424}', label
+        try:
+            provider.dumps({'a': object()})
+        except TypeError:
+            pass
+        else:
+            raise AssertionError(f'{label}: expected TypeError for an unserializable value')
+
+    paths = ['/api/firebase/users', '/api/firebase/assessments', '/api/ai/diseases']
+    print(f"rows={args.rows} rounds={args.rounds} (median ms per request, body bytes)")
+    for path in paths:
+        print(f"\n{path}")
+        baseline = None
+        for label, factory in providers:
+            app.json = factory()
+            ms, size = timed(client, path, args.rounds)
+            baseline = baseline or ms
+            print(f"  {label:28s} {ms:8.2f} ms  {size:9d} B  x{baseline / ms:.2f}")
+
+
+if __name__ == '__main__':
+    main()
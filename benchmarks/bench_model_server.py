@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+In-worker inference vs the model server (Unix socket + micro-batching)
+P process (web worker) x T thread cùng dự đoán:
+
+  * local: mỗi worker tự chạy predict_proba (CompiledTree, NumPy),
+  * server: worker gửi feature index qua model_client tới model_server.py,
+    với vài cửa sổ gom batch khác nhau.
+
+In ra throughput, độ trễ p50/p99, batch trung bình phía server và RSS lớn nhất
+của một worker.
+
+Usage:
+    python benchmarks/bench_model_server.py --procs 4 --threads 8 --requests 500
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+CASES = [
+    ['fever', 'cough', 'headache'], ['itching', 'skin rash'], ['chest pain', 'shortness of breath'],
+    ['vomiting', 'diarrhoea', 'abdominal pain'], ['joint pain', 'fatigue'], ['nausea', 'dizziness'],
+]
+
+
+def worker(mode, socket_path, threads, requests, start, results):
+    os.chdir(BASE_DIR)
+    from ai_diagnosis import model_holder
+    from model_server import model_client
+    model = model_holder.get()
+    vectors = [model._feature_vector(case) for case in CASES]
+    indices = [vector.nonzero()[0].tolist() for vector in vectors]
+    if mode == 'server':
+        model_client.socket_path = socket_path
+        model_client.timeout = 5.0
+    samples, lock = [], threading.Lock()
+
+    def run(offset):
+        local = []
+        for i in range(requests):
+            case = (offset + i) % len(CASES)
+            began = time.perf_counter()
+            if mode == 'server':
+                reply = model_client.predict(indices[case], model.version)
+                if reply is None:
+                    raise RuntimeError('model server did not answer')
+            else:
+                probabilities = model.runtime.predict_proba([vectors[case]])[0]
+                str(model.runtime.classes[probabilities.argmax()])
+            local.append((time.perf_counter() - began) * 1000)
+        with lock:
+            samples.extend(local)
+
+    start.wait()
+    pool = [threading.Thread(target=run, args=(n,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    results.put((samples, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def run_mode(label, mode, args, socket_path=None):
+    ctx = mp.get_context('spawn')
+    start, results = ctx.Event(), ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(mode, socket_path, args.threads, args.requests, start, results))
+                 for _ in range(args.procs)]
+    for process in processes:
+        process.start()
+    time.sleep(args.warmup)
+    began = time.perf_counter()
+    start.set()
+    samples, rss = [], []
+    for _ in processes:
+        worker_samples, worker_rss = results.get()
+        samples.extend(worker_samples)
+        rss.append(worker_rss)
+    elapsed = time.perf_counter() - began
+    for process in processes:
+        process.join()
+    samples.sort()
+    p99 = samples[min(len(samples) - 1, int(0.99 * len(samples)))]
+    print(f"{label:26s} {len(samples) / elapsed:9.0f} pred/s  p50 {statistics.median(samples):6.3f} ms  "
+          f"p99 {p99:6.3f} ms  worker RSS {max(rss) / 1024:6.1f} MB", end='')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--procs', type=int, default=4, help='web worker processes')
+    parser.add_argument('--threads', type=int, default=8, help='threads per worker')
+    parser.add_argument('--requests', type=int, default=500, help='predictions per thread')
+    parser.add_argument('--windows', default='0,1,2', help='server batching windows (ms)')
+    parser.add_argument('--warmup', type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"procs={args.procs} threads={args.threads} requests/thread={args.requests}")
+    run_mode('local (in worker)', 'local', args)
+    print()
+
+    from model_server import ModelClient
+    for window in [float(value) for value in args.windows.split(',')]:
+        with tempfile.TemporaryDirectory() as tmp:
+            socket_path = os.path.join(tmp, 'model.sock')
+            server = subprocess.Popen([sys.executable, 'model_server.py', '--socket', socket_path,
+                                       '--window-ms', str(window)], cwd=BASE_DIR, stdout=subprocess.DEVNULL)
+            try:
+                while not os.path.exists(socket_path):
+                    time.sleep(0.05)
+                run_mode(f'server, window {window:g} ms', 'server', args, socket_path)
+                stats = ModelClient(socket_path).call({'op': 'stats'})
+                print(f"  avg batch {stats['avg_batch']:5.1f} (max {stats['max_batch_seen']})")
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Concurrent /api/assess writes on one SQLite file: rollback journal vs WAL
+Mô phỏng gunicorn nhiều worker trên một máy: P process cùng POST /api/assess
+(mỗi request ghi một Assessment rồi commit), thêm R process đọc dài (xuất CSV
+toàn bộ assessments). So sánh DB_PROFILE=none (journal mặc định) với profile
+'sqlite' của db_engine.py (WAL + busy_timeout + synchronous=NORMAL).
+
+Usage:
+    python benchmarks/bench_sqlite_wal.py --procs 4 --requests 200 --readers 1
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+PAYLOAD = {'symptoms': 'sốt, ho, đau họng', 'age': 30, 'days_sick': 2}
+
+
+def make_client(db_path, profile):
+    os.environ['APP_ENV'] = 'production'
+    os.environ['DB_AUTO_BOOTSTRAP'] = 'true'  # bảng + admin như bootstrap.py
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    os.environ['DB_PROFILE'] = profile
+    os.environ['PASSWORD_HASH_WORKERS'] = '0'  # băm mật khẩu trực tiếp, không tạo process pool con
+    warnings.simplefilter('ignore')  # cảnh báo sklearn mỗi lần dự đoán
+    from app import create_app
+    from models import db
+    app = create_app('production')
+    with app.app_context():
+        db.engine.echo = False
+    client = app.test_client()
+    client.post('/auth/login', data={'email': 'admin@healthfirst.com', 'password': 'admin123'})
+    return app, client
+
+
+def populate(db_path, profile, rows):
+    app, _ = make_client(db_path, profile)
+    from models import db, Assessment
+    with app.app_context():
+        row = {'user_id': 1, 'symptoms': 'sốt', 'age_at_assessment': 30, 'days_sick': 1, 'priority': 'home_care',
+               'message': 'Theo dõi', 'description': 'Nghỉ ngơi ' * 20}
+        for start in range(0, rows, 10000):
+            db.session.execute(db.insert(Assessment.__table__), [row] * min(10000, rows - start))
+            db.session.commit()
+        print(f"  journal_mode={db.session.execute(db.text('PRAGMA journal_mode')).scalar()}")
+
+
+def writer(db_path, profile, requests, start, results):
+    _, client = make_client(db_path, profile)
+    client.post('/api/assess', json=PAYLOAD)  # nạp model AI trước khi đo
+    start.wait()
+    samples = []
+    for _ in range(requests):
+        began = time.perf_counter()
+        response = client.post('/api/assess', json=PAYLOAD)
+        error = ''
+        if response.status_code != 200:
+            error = (response.get_json(silent=True) or {}).get('error') or response.get_data(as_text=True)[:200]
+        samples.append(((time.perf_counter() - began) * 1000, response.status_code, error))
+    results.put(samples)
+
+
+def reader(db_path, profile, start, stop, results):
+    _, client = make_client(db_path, profile)
+    start.wait()
+    exports = 0
+    while not stop.is_set():
+        response = client.get('/admin/admin/export/assessments?format=csv&gzip=0', buffered=False)
+        for chunk in response.response:
+            time.sleep(0.001)  # client chậm: giữ transaction đọc mở lâu
+            if stop.is_set():
+                break
+        response.close()
+        exports += 1
+    results.put(exports)
+
+
+def run_mode(label, profile, args):
+    ctx = mp.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'healthfirst.db')
+        print(f"{label}: populating {args.rows} rows...")
+        process = ctx.Process(target=populate, args=(db_path, profile, args.rows))
+        process.start()
+        process.join()
+
+        start, stop = ctx.Event(), ctx.Event()
+        write_results, read_results = ctx.Queue(), ctx.Queue()
+        writers = [ctx.Process(target=writer, args=(db_path, profile, args.requests, start, write_results))
+                   for _ in range(args.procs)]
+        readers = [ctx.Process(target=reader, args=(db_path, profile, start, stop, read_results))
+                   for _ in range(args.readers)]
+        for process in writers + readers:
+            process.start()
+        time.sleep(args.warmup)
+        began = time.perf_counter()
+        start.set()
+        samples = []
+        for _ in writers:
+            samples.extend(write_results.get())
+        elapsed = time.perf_counter() - began
+        stop.set()
+        exports = sum(read_results.get() for _ in readers)
+        for process in writers + readers:
+            process.join()
+
+    errors = sorted({error.split('\n')[0][:100] for _, status, error in samples if status != 200})
+    if errors:
+        print(f"  errors: {errors[:3]}")
+    ok = sorted(ms for ms, status, _ in samples if status == 200)
+    locked = sum(1 for _, status, error in samples if status != 200 and 'locked' in error)
+    failed = sum(1 for _, status, _ in samples if status != 200)
+    p = lambda q: ok[min(len(ok) - 1, int(q * len(ok)))] if ok else float('nan')
+    print(f"  {len(ok) / elapsed:7.1f} writes/s  p50 {statistics.median(ok) if ok else float('nan'):7.1f} ms  "
+          f"p95 {p(0.95):7.1f} ms  p99 {p(0.99):7.1f} ms  failed {failed} (locked {locked})  exports {exports}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--procs', type=int, default=4, help='writer processes (gunicorn workers)')
+    parser.add_argument('--requests', type=int, default=200, help='POST /api/assess per writer')
+    parser.add_argument('--readers', type=int, default=1, help='processes exporting all assessments in a loop')
+    parser.add_argument('--rows', type=int, default=50000, help='assessments before the run')
+    parser.add_argument('--warmup', type=float, default=15.0, help='seconds to let workers load the AI model')
+    args = parser.parse_args()
+
+    print(f"procs={args.procs} requests={args.requests} readers={args.readers}")
+    run_mode('rollback journal (DB_PROFILE=none)', 'none', args)
+    run_mode('WAL profile (DB_PROFILE=auto)', 'auto', args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Import-to-first-request time of a fresh worker process
+Mỗi lần đo chạy một process Python mới (như một worker gunicorn vừa fork/spawn):
+import app -> lấy WSGI app (app:app như gunicorn) -> request đầu tiên GET /.
+DB là một file SQLite đã bootstrap sẵn (bootstrap.py), giống production nơi
+schema/admin được tạo một lần ở bước release chứ không phải trong mỗi worker.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --path /auth/login
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, sys, time
+began = time.perf_counter()
+import app as module
+imported = time.perf_counter()
+application = module.app
+created = time.perf_counter()
+response = application.test_client().get(sys.argv[1])
+served = time.perf_counter()
+print('@@' + json.dumps({'import': imported - began, 'create': created - imported,
+                         'first_request': served - created, 'total': served - began,
+                         'status': response.status_code}))
+"""
+
+
+def measure(path, env):
+    result = subprocess.run([sys.executable, '-c', CHILD, path], cwd=BASE_DIR, env=env,
+                            capture_output=True, text=True, timeout=300)
+    for line in result.stdout.splitlines():
+        if line.startswith('@@'):
+            return json.loads(line[2:])
+    raise RuntimeError(result.stderr[-2000:] or result.stdout[-2000:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--path', default='/', help='first request')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, APP_ENV='production', FLASK_ENV='production', PYTHONWARNINGS='ignore',
+                   DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'startup.db')}", PASSWORD_HASH_WORKERS='0')
+        subprocess.run([sys.executable, 'bootstrap.py'], cwd=BASE_DIR, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+
+        samples = [measure(args.path, env) for _ in range(args.runs)]
+        print(f"runs={args.runs} first request GET {args.path} -> {samples[0]['status']}")
+        for key in ('import', 'create', 'first_request', 'total'):
+            values = sorted(sample[key] * 1000 for sample in samples)
+            print(f"  {key:14s} median {statistics.median(values):8.1f} ms  min {values[0]:8.1f} ms  "
+                  f"max {values[-1]:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Measure Firestore reads/writes of the SQL <-> Firestore reconciliation
+Chạy firestore_sync trên FakeFirestore (không cần credentials) và đếm số lần
+đọc/ghi Firestore như khi tính phí:
+
+  1. lần đầu (Firestore có dữ liệu cũ bị lệch created_at),
+  2. chạy lại khi không có gì thay đổi,
+  3. sau khi sửa vài dòng SQL và vài document trên Firestore,
+  4. một document người dùng bị sửa sai kiểu (age: "abc") trên Firestore:
+     bị bỏ qua và đếm là invalid, phần còn lại vẫn đồng bộ,
+
+so với cách cũ (stream toàn bộ collection rồi ghi lại từng document).
+
+Usage:
+    python benchmarks/bench_sync.py --rows 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def populate(db, rows):
+    from models import User, Assessment, Contact
+    now = datetime.utcnow() - timedelta(days=1)
+    db.session.execute(db.insert(User.__table__), [
+        {'email': f'user{i}@healthfirst.vn', 'pw_hash': 'x', 'display_name': f'Người dùng {i}', 'age': 20 + i % 50,
+         'is_admin': False, 'is_active': True, 'created_at': now + timedelta(seconds=i),
+         'updated_at': now + timedelta(seconds=i)}
+        for i in range(rows // 10)
+    ])
+    db.session.execute(db.insert(Assessment.__table__), [
+        {'user_id': 1 + i % (rows // 10), 'symptoms': 'sốt, ho', 'age_at_assessment': 30, 'days_sick': 2,
+         'priority': 'home_care', 'message': 'Theo dõi tại nhà', 'description': 'Nghỉ ngơi',
+         'created_at': now - timedelta(seconds=i), 'updated_at': now - timedelta(seconds=i)}
+        for i in range(rows)
+    ])
+    db.session.execute(db.insert(Contact.__table__), [
+        {'name': f'Khách {i}', 'email': f'k{i}@mail.vn', 'subject': 'Hỏi', 'message': 'Xin chào', 'status': 'new',
+         'created_at': now + timedelta(seconds=i), 'updated_at': now + timedelta(seconds=i)}
+        for i in range(rows // 10)
+    ])
+    db.session.commit()
+
+
+def legacy_documents(client, app):
+    """Firestore như save_* cũ ghi: created_at/updated_at = thời điểm sync"""
+    from models import Assessment
+    with app.app_context():
+        batch, count = client.batch(), 0
+        for item in Assessment.query.order_by(Assessment.id).limit(Assessment.query.count() // 2):
+            now = datetime.now()
+            batch.set(client.collection('đánh giá').document(str(item.id)),
+                      dict(item.to_dict(), user_id=item.user_id, created_at=now, updated_at=now, last_sync=now))
+            count += 1
+            if count % 500 == 0:
+                batch.commit()
+                batch = client.batch()
+        batch.commit()
+
+
+def naive_resync_cost(client, app):
+    """Cách cũ: đọc cả collection để so sánh, ghi lại mọi bản ghi SQL"""
+    from models import User, Assessment, Contact
+    client.reset_counters()
+    for name in ('người dùng', 'đánh giá', 'liên hệ'):
+        list(client.collection(name).stream())
+    with app.app_context():
+        writes = User.query.count() + Assessment.query.count() + Contact.query.count()
+    return client.reads, writes
+
+
+def timed_run(label, app, client, **kwargs):
+    from firestore_sync import firestore_sync
+    client.reset_counters()
+    start = time.perf_counter()
+    with app.app_context():
+        report = firestore_sync.run(client=client, **kwargs)
+    elapsed = time.perf_counter() - start
+    pulled = sum(stats['pulled'] for stats in report['collections'].values())
+    counters = client.counters()
+    print(f"{label:34s} reads {counters['reads']:7d}  writes {counters['writes']:7d}  "
+          f"batches {counters['batch_commits']:5d}  pulled {pulled:4d}  {elapsed:6.2f} s")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000, help='assessments (users/contacts = rows / 10)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['APP_ENV'] = 'production'
+        os.environ['DB_AUTO_BOOTSTRAP'] = 'true'  # bảng + admin như bootstrap.py
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'sync.db')}"
+        from app import create_app
+        from fake_firestore import FakeFirestore
+        from models import db, Assessment, Contact, User
+
+        app = create_app('production')
+        client = FakeFirestore()
+        with app.app_context():
+            db.engine.echo = False
+            populate(db, args.rows)
+        legacy_documents(client, app)
+
+        reads, writes = naive_resync_cost(client, app)
+        print(f"{'stream + rewrite everything':34s} reads {reads:7d}  writes {writes:7d}")
+
+        timed_run('first run (half drifted)', app, client)
+        timed_run('no changes', app, client)
+
+        with app.app_context():
+            for item in Assessment.query.order_by(Assessment.id.desc()).limit(25):
+                item.priority = 'consult_doctor'
+            db.session.commit()
+            contact_ids = [item.id for item in Contact.query.limit(10)]
+        later = datetime.utcnow() + timedelta(seconds=1)
+        for contact_id in contact_ids:
+            client.collection('liên hệ').document(str(contact_id)).update({'status': 'replied', 'updated_at': later})
+        timed_run('25 SQL edits + 10 Firestore edits', app, client)
+
+        with app.app_context():
+            replied = Contact.query.filter_by(status='replied').count()
+        print(f"contacts pulled from Firestore: {replied}/{len(contact_ids)}")
+
+        with app.app_context():
+            bad_id, good_id = [item.id for item in User.query.order_by(User.id.desc()).limit(2)]
+        later = datetime.utcnow() + timedelta(seconds=2)
+        client.collection('người dùng').document(str(bad_id)).update({'age': 'abc', 'updated_at': later})
+        client.collection('người dùng').document(str(good_id)).update({'age': '41', 'height': 172, 'updated_at': later})
+        report = timed_run('1 bad + 1 good Firestore user edit', app, client, collections=['users'])
+        with app.app_context():
+            good = db.session.get(User, good_id)
+            invalid = report['collections']['users']['invalid']
+        print(f"invalid documents skipped: {invalid}; good edit pulled: age={good.age!r} height={good.height!r}")
+        if invalid != 1 or good.age != 41 or good.height != 172.0:
+            print("❌ expected the bad document skipped and the good one pulled")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for worker startup (python -X importtime)
+Chạy `import app; app.app` trong process mới với -X importtime, cộng thời gian
+import của mọi module và kiểm tra:
+
+  * tổng thời gian import <= ngân sách (lấy lần nhanh nhất trong --runs lần),
+  * không module nặng nào bị import lúc khởi động (pandas, scikit-learn, scipy,
+    firebase_admin, google-cloud-firestore, grpc): chúng chỉ được import ở lần
+    dùng đầu tiên (train model, gọi Firestore).
+
+Thoát với mã 1 nếu vượt ngân sách -> dùng được trong CI (make import-budget).
+
+Usage:
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --budget-ms 600 --runs 5
+    python benchmarks/check_import_time.py --statement "import routes"
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FORBIDDEN = ('pandas', 'sklearn', 'scipy', 'firebase_admin', 'google.cloud.firestore', 'google.cloud.firestore_v1',
+             'grpc')
+DEFAULT_BUDGET_MS = float(os.environ.get('IMPORT_BUDGET_MS', 1000))
+
+
+def import_times(statement, env):
+    """[(module, self_us, cumulative_us, depth)] from one -X importtime run"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=BASE_DIR, env=env,
+                            capture_output=True, text=True, timeout=300)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--statement', default='import app; app.app', help='code run at worker startup')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS, help='total import time allowed')
+    parser.add_argument('--runs', type=int, default=3, help='best of N runs (noise)')
+    parser.add_argument('--top', type=int, default=10, help='slowest top-level packages to list')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, APP_ENV='production', FLASK_ENV='production', PYTHONWARNINGS='ignore',
+                   DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'import.db')}", DB_AUTO_BOOTSTRAP='false')
+        runs = [import_times(args.statement, env) for _ in range(args.runs)]
+
+    best = min(runs, key=lambda rows: sum(row[1] for row in rows))
+    total_ms = sum(row[1] for row in best) / 1000
+    modules = {row[0] for row in best}
+    forbidden = sorted(name for name in modules if any(name == f or name.startswith(f + '.') for f in FORBIDDEN))
+
+    packages = defaultdict(int)
+    for name, self_us, _, _ in best:
+        packages[name.split('.')[0]] += self_us
+    print(f"`{args.statement}`: {len(modules)} modules, {total_ms:.0f} ms (best of {args.runs}), "
+          f"budget {args.budget_ms:.0f} ms")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {package:28s} {self_us / 1000:8.1f} ms")
+
+    failed = False
+    if forbidden:
+        roots = sorted({name.split('.')[0] for name in forbidden})
+        print(f"❌ heavy modules imported at startup: {', '.join(roots)} ({len(forbidden)} modules)")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"❌ import time {total_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("✅ within import budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+One-time database bootstrap: schema + default admin
+Tạo bảng còn thiếu, thêm cột mới trên DB cũ (add_missing_columns) và tạo admin
+mặc định nếu chưa có. Chạy một lần khi deploy (Procfile 'release', make db-init)
+thay vì trong mỗi worker lúc import app. Chạy lại nhiều lần vẫn an toàn.
+
+Development/testing vẫn tự bootstrap trong create_app (DB_AUTO_BOOTSTRAP).
+
+Usage:
+    python bootstrap.py
+    FLASK_ENV=production DATABASE_URL=postgresql://... python bootstrap.py
+    flask --app app bootstrap
+"""
+
+import os
+import sys
+
+ADMIN_EMAIL = 'admin@healthfirst.com'
+ADMIN_PASSWORD = 'admin123'
+
+
+def bootstrap_database(app):
+    """Create missing tables/columns and seed the default admin (idempotent)"""
+    from models import db, User, add_missing_columns
+
+    with app.app_context():
+        # Tạo bảng nếu chưa có (demo nhanh với SQLite)
+        db.create_all()
+        add_missing_columns()  # vd assessments.updated_at trên DB cũ
+
+        # Tạo admin mặc định nếu chưa tồn tại
+        admin_user = User.query.filter_by(email=ADMIN_EMAIL).first()
+        if not admin_user:
+            admin_user = User(
+                email=ADMIN_EMAIL,
+                display_name='Admin',
+                is_admin=True
+            )
+            admin_user.set_password(ADMIN_PASSWORD)
+            db.session.add(admin_user)
+            db.session.commit()
+            print(f"[DB] Admin user created: {ADMIN_EMAIL} / {ADMIN_PASSWORD}")
+
+
+def main():
+    from app import create_app
+
+    app = create_app(os.getenv('FLASK_ENV', 'development'))
+    try:
+        bootstrap_database(app)
+    except Exception as e:
+        print(f"❌ Bootstrap failed: {e}")
+        sys.exit(1)
+    print("✅ Database bootstrapped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Static asset pipeline for HealthFirst
+Đóng gói CSS/JS: minify, đặt tên theo hash nội dung, ghi manifest và nén sẵn .gz/.br
+
+Usage:
+    python build_assets.py            # build static/dist + manifest.json
+    python build_assets.py extract    # tách <script> inline (không có Jinja) ra static/js/
+    python build_assets.py icons      # tạo lại bộ Font Awesome rút gọn trong static/vendor/fontawesome/
+    python build_assets.py critical   # tạo lại static/css/critical.css (phần đầu trang, inline trong <head>)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import textwrap
+
+try:
+    import brotli
+except ImportError:  # brotli là tùy chọn
+    brotli = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+# Thư mục nguồn được đóng gói (tương đối với static/)
+SOURCE_DIRS = ['css', 'js', 'vendor']
+
+# Font Awesome subset (cần fontawesomefree + fonttools khi chạy lệnh icons)
+FONTAWESOME_DIR = os.path.join(STATIC_DIR, 'vendor', 'fontawesome')
+ICON_RE = re.compile(r'\bfa-([a-z0-9]+(?:-[a-z0-9]+)*)\b')
+ICON_RULE_RE = re.compile(r'\.fa-([a-z0-9-]+)::?before\s*\{\s*content:\s*"([^"]+)";\s*\}\s*')
+FONT_URL_RE = re.compile(r'url\((["\']?)(?P<url>[^)"\']+)\1\)')
+# Icon ghép tên động trong JS (vd. `fa-${activity.icon}` trong admin.js)
+EXTRA_ICONS = {'user-plus', 'stethoscope', 'envelope', 'exclamation-triangle'}
+
+# Critical CSS: luật của Bootstrap + main.css cho phần hiển thị đầu tiên (template, từ, tới)
+CRITICAL_MARKUP = [
+    ('base.html', '<body>', '<main>'),           # navbar + flash messages
+    ('index.html', '<body>', '<!-- Features Section -->'),  # navbar + hero
+]
+CRITICAL_SOURCES = ['vendor/bootstrap/bootstrap.min.css', 'css/main.css']
+# Lưới dùng ngay dưới navbar trên mọi trang: các lớp container/row/col-* có trong templates
+GRID_CLASS_RE = re.compile(r'^(?:container(?:-fluid)?|row|col(?:-(?:sm|md|lg|xl|xxl))?(?:-(?:\d+|auto))?|g[xy]?-\d)$')
+CRITICAL_EXTRA = """
+/* Giữ chỗ cho icon trong lúc Font Awesome CSS tải bất đồng bộ, tránh layout shift */
+.fa-loading .fa,.fa-loading .fas,.fa-loading .fab{display:inline-block;width:1.25em;font-style:normal}
+"""
+JINJA_RE = re.compile(r'{%.*?%}|{{.*?}}|{#.*?#}', re.S)
+
+INLINE_SCRIPT_RE = re.compile(r'(?P<indent>[ \t]*)<script(?P<attrs>[^>]*)>(?P<body>.*?)</script>', re.S)
+
+
+def minify_css(source: str) -> str:
+    """Minify CSS (rcssmin nếu có, nếu không dùng bộ rút gọn an toàn)"""
+    if rcssmin is not None:
+        return rcssmin.cssmin(source)
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    # Không bỏ khoảng trắng trước ':' (selector "div :first-child")
+    source = re.sub(r':\s+', ':', source)
+    return source.replace(';}', '}').strip()
+
+
+def minify_js(source: str) -> str:
+    """Minify JS (rjsmin nếu có, nếu không chỉ bỏ thụt lề, dòng trống và comment cả dòng)"""
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+    lines = []
+    for line in source.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('//'):
+            continue
+        lines.append(stripped)
+    return '\n'.join(lines) + '\n'
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+# File nhị phân chỉ fingerprint và sao chép (font đã nén sẵn, không gzip lại)
+COPY_EXTS = {'.woff2', '.woff', '.ttf', '.svg', '.png', '.jpg', '.ico'}
+COMPRESS_EXTS = {'.css', '.js', '.svg'}
+
+
+def _collect_sources():
+    """Logical paths of every asset, binaries first so CSS can reference them"""
+    sources = []
+    for source_dir in SOURCE_DIRS:
+        root = os.path.join(STATIC_DIR, source_dir)
+        if not os.path.isdir(root):
+            continue
+        for dirpath, _, files in os.walk(root):
+            for name in sorted(files):
+                ext = os.path.splitext(name)[1]
+                if ext in MINIFIERS or ext in COPY_EXTS:
+                    path = os.path.join(dirpath, name)
+                    sources.append(os.path.relpath(path, STATIC_DIR).replace(os.sep, '/'))
+    return sorted(sources, key=lambda logical: (logical.endswith('.css'), logical))
+
+
+def _rewrite_css_urls(source: str, logical: str, manifest) -> str:
+    """Point relative url(...) references at their fingerprinted files"""
+    base = os.path.dirname(logical)
+
+    def replace(match):
+        url = match.group('url')
+        if url.startswith(('data:', 'http:', 'https:', '/', '#')):
+            return match.group(0)
+        target = os.path.normpath(os.path.join(base, url)).replace(os.sep, '/')
+        if target not in manifest:
+            return match.group(0)
+        # dist/ giữ nguyên cấu trúc thư mục nên đường dẫn tương đối vẫn đúng
+        rel = os.path.relpath(manifest[target][len('dist/'):], base).replace(os.sep, '/')
+        return f'url("{rel}")'
+
+    return FONT_URL_RE.sub(replace, source)
+
+
+def build():
+    """Minify, fingerprint and precompress every asset; write the manifest"""
+    os.makedirs(DIST_DIR, exist_ok=True)
+    manifest = {}
+    total_in = total_out = 0
+
+    for logical in _collect_sources():
+        src_path = os.path.join(STATIC_DIR, logical)
+        stem, ext = os.path.splitext(os.path.basename(logical))
+
+        if ext in MINIFIERS:
+            with open(src_path, 'r', encoding='utf-8') as f:
+                source = f.read()
+            total_in += len(source.encode('utf-8'))
+            # Thư viện vendor đã minify sẵn (*.min.css / *.min.js)
+            if not stem.endswith('.min'):
+                source = MINIFIERS[ext](source)
+            if ext == '.css':
+                source = _rewrite_css_urls(source, logical, manifest)
+            data = source.encode('utf-8')
+        else:
+            with open(src_path, 'rb') as f:
+                data = f.read()
+            total_in += len(data)
+        digest = hashlib.sha256(data).hexdigest()[:12]
+
+        out_rel = f"{os.path.dirname(logical)}/{stem}.{digest}{ext}"
+        out_path = os.path.join(DIST_DIR, out_rel)
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with open(out_path, 'wb') as f:
+            f.write(data)
+        if ext in COMPRESS_EXTS:
+            with open(out_path + '.gz', 'wb') as f:
+                f.write(gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                with open(out_path + '.br', 'wb') as f:
+                    f.write(brotli.compress(data, quality=11))
+
+        manifest[logical] = f"dist/{out_rel}"
+        total_out += len(data)
+        print(f"✅ {logical} -> dist/{out_rel} ({len(data)} bytes)")
+
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    print(f"📦 {len(manifest)} assets, {total_in} -> {total_out} bytes (minified)")
+    if brotli is None:
+        print("⚠️  brotli not installed: only .gz variants were written")
+    return manifest
+
+
+def used_icons():
+    """Font Awesome icon names referenced by templates and static/js"""
+    names = set(EXTRA_ICONS)
+    roots = [TEMPLATES_DIR, os.path.join(STATIC_DIR, 'js')]
+    for root in roots:
+        for dirpath, _, files in os.walk(root):
+            for name in files:
+                if not name.endswith(('.html', '.js')):
+                    continue
+                with open(os.path.join(dirpath, name), 'r', encoding='utf-8') as f:
+                    names.update(ICON_RE.findall(f.read()))
+    return names
+
+
+def icons():
+    """Build the Font Awesome subset: CSS with used icons only + subset woff2 fonts"""
+    import fontawesomefree
+    from fontTools import subset
+
+    package_dir = os.path.join(os.path.dirname(fontawesomefree.__file__), 'static', 'fontawesomefree')
+    names = used_icons()
+    css_dir = os.path.join(FONTAWESOME_DIR, 'css')
+    fonts_dir = os.path.join(FONTAWESOME_DIR, 'webfonts')
+    os.makedirs(css_dir, exist_ok=True)
+    os.makedirs(fonts_dir, exist_ok=True)
+
+    parts = []
+    for css_name, font_name in (('fontawesome.css', 'fa-solid-900'), ('brands.css', 'fa-brands-400')):
+        with open(os.path.join(package_dir, 'css', css_name), 'r', encoding='utf-8') as f:
+            source = f.read()
+        if css_name == 'fontawesome.css':
+            with open(os.path.join(package_dir, 'css', 'solid.css'), 'r', encoding='utf-8') as f:
+                source += f.read()
+
+        codepoints = set()
+
+        def keep(match):
+            if match.group(1) not in names:
+                return ''
+            codepoints.add(int(match.group(2).lstrip('\\'), 16))
+            return match.group(0)
+
+        source = ICON_RULE_RE.sub(keep, source)
+        # Chỉ dùng woff2 (mọi trình duyệt hiện đại), bỏ bản .ttf dự phòng
+        source = re.sub(r',\s*url\("[^"]+\.ttf"\) format\("truetype"\)', '', source)
+        parts.append(source)
+
+        options = subset.Options()
+        options.flavor = 'woff2'
+        options.layout_features = []
+        font = subset.load_font(os.path.join(package_dir, 'webfonts', f'{font_name}.ttf'), options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        out_font = os.path.join(fonts_dir, f'{font_name}.woff2')
+        subset.save_font(font, out_font, options)
+        print(f"✅ {font_name}: {len(codepoints)} glyphs ({os.path.getsize(out_font)} bytes)")
+
+    header = ("/*! Font Awesome Free 6.0.0 subset | License: https://fontawesome.com/license/free"
+              " | generated by `python build_assets.py icons` */\n")
+    css = header + minify_css('\n'.join(parts))
+    with open(os.path.join(css_dir, 'fontawesome.min.css'), 'w', encoding='utf-8') as f:
+        f.write(css + '\n')
+    print(f"✅ fontawesome.min.css: {len(names)} names ({len(css)} bytes)")
+
+
+def _critical_names():
+    """Classes, ids and tag names used in the above-the-fold markup of CRITICAL_MARKUP"""
+    classes, ids, tags = set(), set(), {'html', 'body'}
+    for name, start, end in CRITICAL_MARKUP:
+        with open(os.path.join(TEMPLATES_DIR, name), 'r', encoding='utf-8') as f:
+            source = f.read()
+        markup = source[source.index(start):source.index(end)]
+        markup = JINJA_RE.sub(' ', markup)  # {% if ... %}active{% endif %} -> active
+        for value in re.findall(r'\bclass="([^"]*)"', markup):
+            classes.update(value.split())
+        ids.update(re.findall(r'\bid="([^"]*)"', markup))
+        tags.update(tag.lower() for tag in re.findall(r'<([a-zA-Z][a-zA-Z0-9]*)', markup))
+    for dirpath, _, files in os.walk(TEMPLATES_DIR):
+        for name in files:
+            with open(os.path.join(dirpath, name), 'r', encoding='utf-8') as f:
+                for value in re.findall(r'\bclass="([^"]*)"', JINJA_RE.sub(' ', f.read())):
+                    classes.update(token for token in value.split() if GRID_CLASS_RE.match(token))
+    return classes, ids, tags
+
+
+def _css_rules(source: str):
+    """Top-level (prelude, body) pairs of a stylesheet without comments"""
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    rules, depth, start, body_start = [], 0, 0, 0
+    for i, char in enumerate(source):
+        if char == '{':
+            if depth == 0:
+                body_start = i + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                prelude = source[start:body_start - 1].split(';')[-1]  # bỏ @charset/@import đứng trước
+                rules.append((prelude.strip(), source[body_start:i]))
+                start = i + 1
+    return rules
+
+
+def _critical_selector(selector: str, classes, ids, tags) -> bool:
+    plain = re.sub(r'::?[\w-]+(?:\([^)]*\))?', '', selector)  # :hover, ::before, :not(...)
+    plain = re.sub(r'\[[^\]]*\]', '', plain)
+    if any(name not in classes for name in re.findall(r'\.([\w-]+)', plain)):
+        return False
+    if any(name not in ids for name in re.findall(r'#([\w-]+)', plain)):
+        return False
+    return all(name.lower() in tags for name in re.findall(r'(?:^|[\s>+~])([a-zA-Z][\w-]*)', plain))
+
+
+def _critical_rules(source: str, names) -> str:
+    out = []
+    for prelude, body in _css_rules(source):
+        if prelude.startswith('@media'):
+            inner = _critical_rules(body, names)
+            if inner:
+                out.append(f'{prelude}{{{inner}}}')
+        elif not prelude.startswith('@'):  # bỏ @font-face, @keyframes, @supports
+            selectors = [s.strip() for s in prelude.split(',') if _critical_selector(s.strip(), *names)]
+            if selectors:
+                out.append(f"{','.join(selectors)}{{{body.strip()}}}")
+    return ''.join(out)
+
+
+def critical():
+    """Write static/css/critical.css: the Bootstrap + main.css rules used above the fold"""
+    names = _critical_names()
+    parts = []
+    for logical in CRITICAL_SOURCES:
+        with open(os.path.join(STATIC_DIR, logical), 'r', encoding='utf-8') as f:
+            parts.append(_critical_rules(f.read(), names))
+    header = ("/* Critical CSS: inline trong <head> (xem templates/_vendor_css.html)\n"
+              "   generated by `python build_assets.py critical` from "
+              f"{' + '.join(CRITICAL_SOURCES)} */\n")
+    css = header + minify_css('\n'.join(parts)) + '\n' + CRITICAL_EXTRA.lstrip('\n')
+    with open(os.path.join(STATIC_DIR, 'css', 'critical.css'), 'w', encoding='utf-8') as f:
+        f.write(css)
+    print(f"✅ critical.css: {len(names[0])} classes, {len(css)} bytes")
+
+
+def extract():
+    """Move Jinja-free inline <script> blocks from templates into static/js/"""
+    js_dir = os.path.join(STATIC_DIR, 'js')
+    os.makedirs(js_dir, exist_ok=True)
+
+    for name in sorted(os.listdir(TEMPLATES_DIR)):
+        if not name.endswith('.html'):
+            continue
+        path = os.path.join(TEMPLATES_DIR, name)
+        with open(path, 'r', encoding='utf-8') as f:
+            template = f.read()
+
+        stem = os.path.splitext(name)[0]
+        counter = {'n': 0}
+
+        def replace(match):
+            body = match.group('body')
+            if 'src=' in match.group('attrs') or '{{' in body or '{%' in body or not body.strip():
+                return match.group(0)
+            counter['n'] += 1
+            js_name = stem if counter['n'] == 1 else f"{stem}-{counter['n']}"
+            with open(os.path.join(js_dir, f'{js_name}.js'), 'w', encoding='utf-8') as out:
+                out.write(textwrap.dedent(body).strip('\n') + '\n')
+            print(f"✅ {name}: inline script -> static/js/{js_name}.js")
+            return f"{match.group('indent')}<script src=\"{{{{ asset_url('js/{js_name}.js') }}}}\"></script>"
+
+        updated = INLINE_SCRIPT_RE.sub(replace, template)
+        if updated != template:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(updated)
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'build'
+    if command == 'extract':
+        extract()
+    elif command == 'icons':
+        icons()
+    elif command == 'critical':
+        critical()
+    elif command == 'build':
+        build()
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from flask import request
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+from werkzeug.wsgi import ClosingIterator
+
+try:
+    import brotli
+except ImportError:  # brotli là tùy chọn
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml',
+)
+ENDPOINT_ENVIRON_KEY = 'healthfirst.endpoint'
+
+
+class CompressionMiddleware:
+    """WSGI middleware that gzip/brotli-compresses buffered responses.
+
+    The encoding is negotiated from ``Accept-Encoding`` (brotli preferred).
+    Responses are left untouched when they are small, not a text/JSON type,
+    already encoded (page cache, /static/dist), partial, marked
+    ``no-transform``, or streamed (no Content-Length). Compressed bodies of
+    cacheable responses (public / max-age, e.g. the AI catalogs) are kept in
+    a byte-bounded LRU keyed by the body digest, so repeated requests skip
+    compression. Per-endpoint byte and timing stats feed /admin/admin/metrics.
+    """
+
+    def __init__(self, min_size: int = 500, gzip_level: int = 6, brotli_quality: int = 5,
+                 cache_bytes: int = 16 * 1024 * 1024, report_bandwidth: float = 1_600_000 / 8):
+        self.enabled = True
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache_bytes = cache_bytes
+        self.report_bandwidth = report_bandwidth
+        self.wsgi_app = None
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # (encoding, digest) -> compressed bytes
+        self._cache_size = 0
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+
+    def init_app(self, app):
+        """Wrap app.wsgi_app and configure from the Flask app config"""
+        self.enabled = app.config.get('COMPRESS_ENABLED', True)
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', self.min_size)
+        self.gzip_level = app.config.get('COMPRESS_GZIP_LEVEL', self.gzip_level)
+        self.brotli_quality = app.config.get('COMPRESS_BROTLI_QUALITY', self.brotli_quality)
+        self.cache_bytes = app.config.get('COMPRESS_CACHE_BYTES', self.cache_bytes)
+        self.clear()
+        self.wsgi_app = app.wsgi_app
+        app.wsgi_app = self
+
+        @app.before_request
+        def _remember_endpoint():
+            # Middleware chạy ngoài request context: lưu endpoint vào environ
+            request.environ[ENDPOINT_ENVIRON_KEY] = request.endpoint
+
+        app.extensions['compression'] = self
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._cache_size = 0
+        self.endpoints = {}
+
+    @staticmethod
+    def negotiate(accept_encoding: str) -> Optional[str]:
+        """Pick 'br' or 'gzip' from an Accept-Encoding header value"""
+        if not accept_encoding:
+            return None
+        accepted = parse_accept_header(accept_encoding)
+        if brotli is not None and accepted['br']:
+            return 'br'
+        if accepted['gzip']:
+            return 'gzip'
+        return None
+
+    def _should_compress(self, status: str, headers: Headers) -> bool:
+        if not status.startswith('200'):
+            return False
+        if 'Content-Encoding' in headers or 'Content-Range' in headers:
+            return False
+        if 'no-transform' in headers.get('Cache-Control', ''):
+            return False
+        length = headers.get('Content-Length')
+        # Không có Content-Length = response dạng stream
+        if length is None or int(length) < self.min_size:
+            return False
+        return headers.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES)
+
+    @staticmethod
+    def _is_cacheable(headers: Headers) -> bool:
+        cache_control = headers.get('Cache-Control', '')
+        if 'private' in cache_control or 'no-store' in cache_control:
+            return False
+        return 'public' in cache_control or 'max-age' in cache_control
+
+    def _compress(self, body: bytes, encoding: str, cacheable: bool) -> bytes:
+        # Nội dung được cache thì nén một lần ở mức cao nhất
+        if encoding == 'br':
+            return brotli.compress(body, quality=11 if cacheable else self.brotli_quality)
+        return gzip.compress(body, compresslevel=9 if cacheable else self.gzip_level)
+
+    def _cached_compress(self, body: bytes, encoding: str):
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                return data, True
+        data = self._compress(body, encoding, cacheable=True)
+        with self._lock:
+            if key not in self._cache and len(data) <= self.cache_bytes:
+                self._cache[key] = data
+                self._cache_size += len(data)
+                while self._cache_size > self.cache_bytes:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._cache_size -= len(evicted)
+        return data, False
+
+    def _record(self, endpoint: str, size_in: int, size_out: int, elapsed: float, cache_hit: bool):
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints.setdefault(endpoint, {
+                'responses': 0, 'bytes_in': 0, 'bytes_out': 0, 'compress_ms': 0.0, 'cache_hits': 0,
+            })
+        stats['responses'] += 1
+        stats['bytes_in'] += size_in
+        stats['bytes_out'] += size_out
+        stats['compress_ms'] += elapsed * 1000
+        stats['cache_hits'] += int(cache_hit)
+
+    def __call__(self, environ, start_response):
+        encoding = self.negotiate(environ.get('HTTP_ACCEPT_ENCODING', '')) if self.enabled else None
+        if encoding is None or environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.wsgi_app(environ, start_response)
+
+        captured = []
+
+        def capture(status, headers, exc_info=None):
+            captured[:] = [status, headers, exc_info]
+            return self._write_unsupported
+
+        app_iter = self.wsgi_app(environ, capture)
+        if not captured:
+            # start_response gọi trễ (generator): coi như stream, không nén
+            return ClosingIterator(self._deferred(app_iter, captured, start_response),
+                                   getattr(app_iter, 'close', None))
+
+        status, header_list, exc_info = captured
+        headers = Headers(header_list)
+        if not self._should_compress(status, headers):
+            start_response(status, header_list, exc_info)
+            return app_iter
+
+        try:
+            body = b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+
+        start = time.perf_counter()
+        if self._is_cacheable(headers):
+            data, cache_hit = self._cached_compress(body, encoding)
+        else:
+            data, cache_hit = self._compress(body, encoding, cacheable=False), False
+        elapsed = time.perf_counter() - start
+
+        if len(data) >= len(body):
+            # Nén không có lợi: trả nguyên bản
+            data, encoding = body, None
+        else:
+            headers['Content-Encoding'] = encoding
+            headers['Content-Length'] = str(len(data))
+            etag = headers.get('ETag')
+            if etag and not etag.startswith('W/'):
+                headers['ETag'] = f'W/{etag}'
+        vary = {v.strip() for v in headers.get('Vary', '').split(',') if v.strip()}
+        if 'Accept-Encoding' not in vary:
+            headers['Vary'] = ', '.join(sorted(vary | {'Accept-Encoding'}))
+
+        self._record(environ.get(ENDPOINT_ENVIRON_KEY) or 'other', len(body), len(data), elapsed, cache_hit)
+        start_response(status, headers.to_wsgi_list(), exc_info)
+        return [data]
+
+    @staticmethod
+    def _write_unsupported(data):
+        raise RuntimeError('CompressionMiddleware does not support the WSGI write() callable')
+
+    @staticmethod
+    def _deferred(app_iter, captured, start_response):
+        """Stream app_iter, calling start_response before the first non-empty chunk"""
+        started = False
+        for chunk in app_iter:
+            if not started:
+                if not chunk:
+                    continue  # PEP 3333: chunk rỗng có thể đến trước start_response
+                start_response(*captured)
+                started = True
+            yield chunk
+        if not started:
+            start_response(*captured)  # body rỗng
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-endpoint savings; transfer time estimated at report_bandwidth"""
+        endpoints = {}
+        for endpoint, stats in list(self.endpoints.items()):
+            saved = stats['bytes_in'] - stats['bytes_out']
+            transfer_saved_ms = saved / self.report_bandwidth * 1000
+            endpoints[endpoint] = dict(
+                stats,
+                compress_ms=round(stats['compress_ms'], 2),
+                ratio=round(stats['bytes_out'] / stats['bytes_in'], 4) if stats['bytes_in'] else 1.0,
+                bytes_saved=saved,
+                est_latency_saved_ms=round(transfer_saved_ms - stats['compress_ms'], 1),
+            )
+        return {
+            'enabled': self.enabled,
+            'brotli': brotli is not None,
+            'cache_entries': len(self._cache),
+            'cache_bytes': self._cache_size,
+            'endpoints': endpoints,
+        }
+
+
+# Global compression middleware instance
+compression = CompressionMiddleware()
@@ -6,12 +6,111 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///healthfirst.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Engine profile (db_engine.py): auto | postgres | pgbouncer | sqlite | none
+    DB_PROFILE = os.environ.get('DB_PROFILE', 'auto')
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))  # mỗi worker gunicorn
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 5))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))  # chờ connection rảnh (s)
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))  # s
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 15000))
+    DB_IDLE_TX_TIMEOUT_MS = int(os.environ.get('DB_IDLE_TX_TIMEOUT_MS', 60000))
+    DB_CONNECT_TIMEOUT = int(os.environ.get('DB_CONNECT_TIMEOUT', 5))
+    # SQLite nhiều worker trên một máy (DB_PROFILE=auto với sqlite:///file)
+    DB_SQLITE_WAL = os.environ.get('DB_SQLITE_WAL', 'true').lower() == 'true'
+    DB_SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('DB_SQLITE_BUSY_TIMEOUT_MS', 5000))
+    DB_SQLITE_SYNCHRONOUS = os.environ.get('DB_SQLITE_SYNCHRONOUS', 'NORMAL')  # FULL nếu cần bền vững từng commit
+    DB_SQLITE_MMAP_SIZE = int(os.environ.get('DB_SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    DB_SQLITE_CACHE_KB = int(os.environ.get('DB_SQLITE_CACHE_KB', 20000))
+    
     # Session configuration
     PERMANENT_SESSION_LIFETIME = timedelta(days=7)
     
     # Firebase configuration
     FIREBASE_CREDENTIALS_PATH = os.path.join(os.path.dirname(__file__), 'firebase-credentials.json')
     
+    # System settings (admin) - file JSON dùng chung giữa các worker
+    SETTINGS_FILE = os.environ.get('SETTINGS_FILE') or 'app_settings.json'
+    SETTINGS_CHECK_INTERVAL = float(os.environ.get('SETTINGS_CHECK_INTERVAL', 2))
+    
+    # Login throttling: 'memory' (1 worker) hoặc 'database' (dùng chung giữa các worker)
+    LOGIN_THROTTLE_BACKEND = os.environ.get('LOGIN_THROTTLE_BACKEND') or 'database'
+    LOGIN_IP_LIMIT = int(os.environ.get('LOGIN_IP_LIMIT', 20))
+    LOGIN_IP_WINDOW = int(os.environ.get('LOGIN_IP_WINDOW', 300))  # seconds
+    # Số proxy/load balancer tin cậy phía trước app (X-Forwarded-For/-Proto); 0 = kết nối trực tiếp.
+    # Sau load balancer mà để 0 thì mọi client chung một IP -> chung một bucket LOGIN_IP_LIMIT
+    TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 0))
+    
+    # Password hashing (Argon2) - chạy benchmarks/bench_argon2.py để chọn tham số
+    ARGON2_TIME_COST = int(os.environ.get('ARGON2_TIME_COST', 3))
+    ARGON2_MEMORY_COST = int(os.environ.get('ARGON2_MEMORY_COST', 65536))  # KiB
+    ARGON2_PARALLELISM = int(os.environ.get('ARGON2_PARALLELISM', 4))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0))  # 0 = chạy trực tiếp
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 16))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 5))
+    
+    # Cache current_user trong mỗi worker (giây, 0 = tắt)
+    USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', 30))
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
+    
+    # Thống kê dashboard (Firestore): tươi trong TTL, sau đó phục vụ bản cũ và làm mới nền
+    STATS_CACHE_TTL = float(os.environ.get('STATS_CACHE_TTL', 30))
+    STATS_STALE_TTL = float(os.environ.get('STATS_STALE_TTL', 300))
+    
+    # Cache trang nội dung tĩnh (guides, library, news, support, privacy, trang chủ ẩn danh)
+    PAGE_CACHE_ENABLED = True
+    PAGE_CACHE_SIZE = int(os.environ.get('PAGE_CACHE_SIZE', 256))
+    PAGE_CACHE_MAX_AGE = int(os.environ.get('PAGE_CACHE_MAX_AGE', 300))  # seconds
+    
+    # JSON encoder cho jsonify/tojson: auto (orjson nếu có) | orjson | stdlib
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+    
+    # Nén gzip/brotli cho response JSON/HTML (WSGI middleware)
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 500))  # bytes
+    COMPRESS_CACHE_BYTES = int(os.environ.get('COMPRESS_CACHE_BYTES', 16 * 1024 * 1024))
+    
+    # Hàng đợi job nền (bảng jobs + worker thread trong mỗi process)
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 2.0))  # seconds
+    JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+    JOB_RETRY_DELAY = float(os.environ.get('JOB_RETRY_DELAY', 10.0))  # seconds, nhân đôi mỗi lần thử lại
+    JOB_STALE_AFTER = float(os.environ.get('JOB_STALE_AFTER', 600.0))  # job 'running' không cập nhật -> chạy lại
+    JOB_HEARTBEAT_INTERVAL = float(os.environ.get('JOB_HEARTBEAT_INTERVAL', 30.0))  # < JOB_STALE_AFTER
+    
+    # Đối chiếu SQL <-> Firestore (job firebase_resync)
+    SYNC_BATCH_SIZE = int(os.environ.get('SYNC_BATCH_SIZE', 200))  # tối đa 500 (giới hạn batch write)
+    SYNC_OVERLAP_SECONDS = float(os.environ.get('SYNC_OVERLAP_SECONDS', 5.0))
+    
+    # Firestore: deadline mỗi lời gọi firebase_db + circuit breaker khi Firestore chậm/sập
+    FIRESTORE_TIMEOUT = float(os.environ.get('FIRESTORE_TIMEOUT', 3.0))  # seconds
+    FIRESTORE_BREAKER_THRESHOLD = int(os.environ.get('FIRESTORE_BREAKER_THRESHOLD', 5))  # lỗi liên tiếp -> mở
+    FIRESTORE_BREAKER_COOLDOWN = float(os.environ.get('FIRESTORE_BREAKER_COOLDOWN', 30.0))  # seconds
+    FIRESTORE_FANOUT_WORKERS = int(os.environ.get('FIRESTORE_FANOUT_WORKERS', 9))  # đọc song song (get_statistics: 9 truy vấn)
+    
+    # Bản sao trong RAM của vài collection nhỏ (liên hệ, đánh giá gần đây) qua listener on_snapshot
+    FIRESTORE_MIRROR = os.environ.get('FIRESTORE_MIRROR', 'false').lower() == 'true'
+    FIRESTORE_MIRROR_VIEWS = os.environ.get('FIRESTORE_MIRROR_VIEWS', 'contacts,assessments')
+    FIRESTORE_MIRROR_MAX_DOCS = int(os.environ.get('FIRESTORE_MIRROR_MAX_DOCS', 2000))  # mỗi view
+    FIRESTORE_MIRROR_MAX_STALENESS = float(os.environ.get('FIRESTORE_MIRROR_MAX_STALENESS', 30.0))  # s sau khi mất listener
+    FIRESTORE_MIRROR_RETRY = float(os.environ.get('FIRESTORE_MIRROR_RETRY', 10.0))  # s giữa các lần đăng ký lại
+    
+    # Model AI: mỗi worker kiểm tra ai_model.npz để nhận bản mới (reload/retrain ở worker khác)
+    AI_MODEL_CHECK_INTERVAL = float(os.environ.get('AI_MODEL_CHECK_INTERVAL', 30.0))  # seconds, 0 = tắt
+    
+    # Model server ngoài process (python model_server.py); rỗng = dự đoán trong worker
+    MODEL_SERVER_SOCKET = os.environ.get('MODEL_SERVER_SOCKET', '')
+    MODEL_SERVER_TIMEOUT = float(os.environ.get('MODEL_SERVER_TIMEOUT', 0.5))  # seconds
+    
+    # /readyz: warm-up ở request đầu tiên của mỗi worker + kiểm tra DB/Firestore có deadline
+    READY_WARMUP_ON_REQUEST = os.environ.get('READY_WARMUP_ON_REQUEST', 'true').lower() == 'true'
+    READY_CHECK_TIMEOUT = float(os.environ.get('READY_CHECK_TIMEOUT', 2.0))  # seconds mỗi dependency
+    READY_CHECK_TTL = float(os.environ.get('READY_CHECK_TTL', 5.0))  # cache kết quả giữa các lần probe
+    READY_REQUIRE_FIRESTORE = os.environ.get('READY_REQUIRE_FIRESTORE', 'true').lower() == 'true'  # khi đã cấu hình
+    
+    # Tạo bảng + admin mặc định ngay trong create_app (tiện cho dev/test).
+    # Production: tắt, chạy `python bootstrap.py` một lần khi deploy
+    DB_AUTO_BOOTSTRAP = os.environ.get('DB_AUTO_BOOTSTRAP', 'true').lower() == 'true'
+    
     # Upload configuration
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     
@@ -22,13 +121,19 @@ class Config:
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_ECHO = True
+    PAGE_CACHE_ENABLED = False  # template sửa là thấy ngay
 
 class ProductionConfig(Config):
     DEBUG = False
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    DB_AUTO_BOOTSTRAP = os.environ.get('DB_AUTO_BOOTSTRAP', 'false').lower() == 'true'
+    TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 1))  # Procfile: sau router/load balancer
     
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    JOB_WORKERS = 0  # chạy job đồng bộ bằng job_queue.run_next()
+    READY_WARMUP_ON_REQUEST = False  # warm-up chỉ chạy khi gọi /readyz
 
 config = {
     'development': DevelopmentConfig,
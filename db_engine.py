@@ -0,0 +1,185 @@
+import importlib.util
+import os
+import weakref
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.pool import NullPool
+
+
+# Engine được gắn gần nhất (create_app mới thay engine cũ). Hook fork đăng ký một lần mỗi
+# process: gunicorn --preload -> process con không dùng lại socket của process cha
+_current_engine = None
+
+
+def _dispose_after_fork():
+    engine = _current_engine() if _current_engine is not None else None
+    if engine is not None:
+        engine.dispose(close=False)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_dispose_after_fork)
+
+
+def normalize_database_url(url: str) -> str:
+    """Fix the 'postgres://' scheme Heroku/Render hand out and pin the installed driver"""
+    if url and url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    if url and url.startswith('postgresql://'):
+        # SQLAlchemy 2.1 mặc định dùng psycopg (v3); requirements.txt cài psycopg2-binary
+        if importlib.util.find_spec('psycopg') is None and importlib.util.find_spec('psycopg2') is not None:
+            url = 'postgresql+psycopg2://' + url[len('postgresql://'):]
+    return url
+
+
+def detect_profile(url: str, profile: str = 'auto') -> Optional[str]:
+    """'postgres' | 'pgbouncer' | 'sqlite' | None for a URL and the DB_PROFILE setting"""
+    if profile and profile != 'auto':
+        return None if profile == 'none' else profile
+    if url.startswith('postgresql'):
+        return 'postgres'
+    if url.startswith('sqlite') and url not in ('sqlite://', 'sqlite:///') and ':memory:' not in url:
+        return 'sqlite'
+    return None
+
+
+class EngineProfile:
+    """Per-database SQLAlchemy engine tuning (``SQLALCHEMY_ENGINE_OPTIONS``).
+
+    * ``postgres``: a bounded QueuePool per worker process (``DB_POOL_SIZE``
+      + ``DB_MAX_OVERFLOW``; LIFO so surplus connections go idle and get
+      recycled), pre-ping, ``pool_recycle``, and server-side
+      ``statement_timeout`` / ``idle_in_transaction_session_timeout`` sent as
+      startup options.
+    * ``pgbouncer``: PgBouncer in transaction mode already pools, so the app
+      opens a connection per checkout (NullPool). Startup options are not
+      forwarded by PgBouncer, so the timeouts are applied per transaction
+      with ``SET LOCAL``.
+
+    * ``sqlite``: for single-box deployments where several gunicorn workers
+      share one file. Every connection is switched to WAL (readers no longer
+      block the writer), with ``busy_timeout`` (writers wait for the lock
+      instead of failing with "database is locked"), ``synchronous=NORMAL``
+      (durable at WAL checkpoints, no fsync per commit), mmap and a larger
+      page cache.
+
+    Worst case, the server sees workers x (pool_size + max_overflow)
+    connections, plus the job worker threads, which share the same pool.
+    ``init_app`` must run before ``db.init_app``. ``attach`` installs the
+    event hooks on the engine once it exists.
+    """
+
+    def __init__(self):
+        self.profile: Optional[str] = None
+        self.config: Dict[str, Any] = {}
+
+    def options(self, config) -> Dict[str, Any]:
+        """Engine options for the configured profile (empty for other databases)"""
+        profile = self.profile
+        if profile == 'postgres':
+            return {
+                'pool_size': config.get('DB_POOL_SIZE', 5),
+                'max_overflow': config.get('DB_MAX_OVERFLOW', 5),
+                'pool_timeout': config.get('DB_POOL_TIMEOUT', 10),
+                'pool_recycle': config.get('DB_POOL_RECYCLE', 1800),
+                'pool_pre_ping': config.get('DB_POOL_PRE_PING', True),
+                'pool_use_lifo': True,
+                'connect_args': dict(self._connect_args(config), options=(
+                    f"-c statement_timeout={config.get('DB_STATEMENT_TIMEOUT_MS', 15000)} "
+                    f"-c idle_in_transaction_session_timeout={config.get('DB_IDLE_TX_TIMEOUT_MS', 60000)}"
+                )),
+            }
+        if profile == 'pgbouncer':
+            return {'poolclass': NullPool, 'connect_args': self._connect_args(config)}
+        if profile == 'sqlite':
+            # timeout của sqlite3 = busy timeout mặc định của driver (giây)
+            return {'connect_args': {'timeout': config.get('DB_SQLITE_BUSY_TIMEOUT_MS', 5000) / 1000}}
+        return {}
+
+    @staticmethod
+    def _connect_args(config) -> Dict[str, Any]:
+        return {
+            'connect_timeout': config.get('DB_CONNECT_TIMEOUT', 5),
+            'application_name': config.get('DB_APPLICATION_NAME', 'healthfirst'),
+            # Phát hiện kết nối chết sau NAT/load balancer
+            'keepalives': 1,
+            'keepalives_idle': 30,
+            'keepalives_interval': 10,
+            'keepalives_count': 3,
+        }
+
+    def init_app(self, app):
+        """Fill SQLALCHEMY_ENGINE_OPTIONS for the profile (before db.init_app)"""
+        url = normalize_database_url(app.config.get('SQLALCHEMY_DATABASE_URI', ''))
+        app.config['SQLALCHEMY_DATABASE_URI'] = url
+        self.config = app.config
+        self.profile = detect_profile(url, app.config.get('DB_PROFILE', 'auto'))
+        options = self.options(app.config)
+        # Giá trị đặt tay trong SQLALCHEMY_ENGINE_OPTIONS được ưu tiên
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = dict(options, **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        app.extensions['engine_profile'] = self
+        if self.profile == 'sqlite':
+            print(f"🗄️  DB profile 'sqlite': WAL={app.config.get('DB_SQLITE_WAL', True)}, "
+                  f"busy_timeout {app.config.get('DB_SQLITE_BUSY_TIMEOUT_MS', 5000)} ms")
+        elif self.profile:
+            pool = ('NullPool' if self.profile == 'pgbouncer' else
+                    f"pool {options['pool_size']}+{options['max_overflow']}/worker")
+            print(f"🗄️  DB profile '{self.profile}': {pool}, "
+                  f"statement_timeout {app.config.get('DB_STATEMENT_TIMEOUT_MS', 15000)} ms")
+
+    def attach(self, engine):
+        """Install connection hooks on the created engine"""
+        if self.profile == 'pgbouncer':
+            statement_timeout = int(self.config.get('DB_STATEMENT_TIMEOUT_MS', 15000))
+            idle_timeout = int(self.config.get('DB_IDLE_TX_TIMEOUT_MS', 60000))
+
+            @event.listens_for(engine, 'begin')
+            def set_local_timeouts(conn):
+                # SET LOCAL chỉ sống trong transaction này -> an toàn với transaction pooling
+                conn.exec_driver_sql(f'SET LOCAL statement_timeout = {statement_timeout}')
+                conn.exec_driver_sql(f'SET LOCAL idle_in_transaction_session_timeout = {idle_timeout}')
+
+        if self.profile == 'sqlite':
+            pragmas = self.sqlite_pragmas(self.config)
+
+            @event.listens_for(engine, 'connect')
+            def set_sqlite_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                try:
+                    for pragma in pragmas:
+                        cursor.execute(pragma)
+                finally:
+                    cursor.close()
+
+        if self.profile:
+            global _current_engine
+            _current_engine = weakref.ref(engine)
+
+    @staticmethod
+    def sqlite_pragmas(config):
+        """PRAGMAs run on every new SQLite connection"""
+        pragmas = [
+            f"PRAGMA busy_timeout = {int(config.get('DB_SQLITE_BUSY_TIMEOUT_MS', 5000))}",
+            f"PRAGMA synchronous = {config.get('DB_SQLITE_SYNCHRONOUS', 'NORMAL')}",
+            f"PRAGMA mmap_size = {int(config.get('DB_SQLITE_MMAP_SIZE', 256 * 1024 * 1024))}",
+            f"PRAGMA cache_size = -{int(config.get('DB_SQLITE_CACHE_KB', 20000))}",  # âm = KiB
+            'PRAGMA temp_store = MEMORY',
+        ]
+        if config.get('DB_SQLITE_WAL', True):
+            # journal_mode lưu trong file DB; đặt lại mỗi connection cho chắc
+            pragmas.insert(0, 'PRAGMA journal_mode = WAL')
+            pragmas.append(f"PRAGMA journal_size_limit = {64 * 1024 * 1024}")  # cắt file -wal sau checkpoint
+        return pragmas
+
+    def stats(self, engine) -> Dict[str, Any]:
+        pool = engine.pool
+        data = {'profile': self.profile, 'pool': type(pool).__name__}
+        if hasattr(pool, 'checkedout'):
+            data.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow(),
+                        checked_in=pool.checkedin())
+        return data
+
+
+# Global engine profile instance
+engine_profile = EngineProfile()
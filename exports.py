@@ -0,0 +1,154 @@
+import csv
+import io
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+from flask import Response, current_app, request, stream_with_context
+from sqlalchemy import select
+
+from models import db, Assessment, Contact, User
+
+EXPORT_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+YIELD_PER = 1000  # số dòng mỗi lần fetch từ cursor
+FLUSH_BYTES = 64 * 1024  # gom output thành chunk ~64KB trước khi gửi
+
+
+class ExportError(ValueError):
+    """Invalid export request (unknown dataset/format, bad filter)"""
+
+
+def _assessment_columns():
+    return [
+        Assessment.id, Assessment.user_id, User.email.label('user_email'), Assessment.symptoms,
+        Assessment.age_at_assessment, Assessment.days_sick, Assessment.priority, Assessment.message,
+        Assessment.description, Assessment.recommendations, Assessment.created_at,
+    ]
+
+
+def _contact_columns():
+    return [
+        Contact.id, Contact.name, Contact.email, Contact.subject, Contact.message,
+        Contact.status, Contact.created_at,
+    ]
+
+
+def _parse_date(value: Optional[str], name: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise ExportError(f"'{name}' phải có dạng YYYY-MM-DD")
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+
+def build_query(dataset: str, args) -> Any:
+    """SELECT for an export, filtered by from/to date and priority/status"""
+    if dataset == 'assessments':
+        model = Assessment
+        stmt = select(*_assessment_columns()).outerjoin(User, User.id == Assessment.user_id)
+        values = _split(args.get('priority'))
+        if values:
+            stmt = stmt.where(Assessment.priority.in_(values))
+    elif dataset == 'contacts':
+        model = Contact
+        stmt = select(*_contact_columns())
+        values = _split(args.get('status'))
+        if values:
+            stmt = stmt.where(Contact.status.in_(values))
+    else:
+        raise ExportError(f"Không hỗ trợ xuất '{dataset}'")
+
+    date_from = _parse_date(args.get('from'), 'from')
+    date_to = _parse_date(args.get('to'), 'to')
+    if date_from:
+        stmt = stmt.where(model.created_at >= date_from)
+    if date_to:
+        # 'to' tính cả ngày đó
+        stmt = stmt.where(model.created_at < date_to + timedelta(days=1))
+    # yield_per: đọc theo lô từ cursor (server-side cursor trên PostgreSQL)
+    return stmt.order_by(model.id).execution_options(yield_per=YIELD_PER)
+
+
+def _iter_rows(stmt) -> Iterator[Dict[str, Any]]:
+    result = db.session.execute(stmt)
+    try:
+        for row in result:
+            yield row._asdict()
+    finally:
+        result.close()
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    # Chống CSV/formula injection khi mở bằng Excel
+    if isinstance(value, str) and value[:1] in ('=', '+', '-', '@'):
+        return "'" + value
+    return value
+
+
+def _csv_chunks(rows: Iterator[Dict[str, Any]], columns: List[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')  # BOM để Excel đọc đúng tiếng Việt
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row.values()])
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def _ndjson_chunks(rows: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    dumps = current_app.json.dumps
+    lines, size = [], 0
+    for row in rows:
+        line = dumps(row)
+        lines.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+            lines, size = [], 0
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = định dạng gzip
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_response(dataset: str) -> Response:
+    """Stream a dataset as CSV/NDJSON in constant memory, gzip when accepted"""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"Định dạng '{fmt}' không hợp lệ (csv, ndjson)")
+    stmt = build_query(dataset, request.args)
+    columns = [column.name for column in stmt.selected_columns]
+
+    rows = _iter_rows(stmt)
+    chunks = _csv_chunks(rows, columns) if fmt == 'csv' else _ndjson_chunks(rows)
+
+    filename = f"{dataset}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
+    headers = {
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'Cache-Control': 'no-store',
+        'X-Accel-Buffering': 'no',  # nginx: gửi ngay, không buffer cả file
+        'Vary': 'Accept-Encoding',
+    }
+    if request.accept_encodings['gzip'] and request.args.get('gzip', '1') != '0':
+        chunks = _gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+
+    return Response(stream_with_context(chunks), mimetype=EXPORT_FORMATS[fmt], headers=headers)
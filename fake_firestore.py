@@ -0,0 +1,376 @@
+"""
+In-memory stand-in for the Firestore client
+Giả lập phần API Firestore mà app dùng (collection/document/where/order_by/
+limit/start_after/stream, batch, get_all) để chạy sync và benchmark khi không
+có credentials. Đếm số lần đọc/ghi như Firestore tính phí.
+
+inject() giả lập Firestore chậm/lỗi: mỗi RPC chờ thêm `latency` giây (hoặc
+`slow[collection]` cho riêng một collection; tôn trọng tham số timeout như SDK:
+quá hạn -> DeadlineExceeded) hoặc ném `error`.
+
+query.on_snapshot(callback) là nguồn snapshot giả: mỗi lần ghi vào collection,
+callback(docs, changes, read_time) được gọi ngay (đồng bộ) với các thay đổi như
+listener thật; disconnect() giả lập mất kết nối listener.
+
+Usage:
+    from fake_firestore import FakeFirestore
+    firebase_db.db = FakeFirestore()
+    firebase_db.db.inject(latency=5.0)  # mọi RPC treo 5 s
+    firebase_db.db.disconnect()         # mọi listener ngừng (is_active = False)
+"""
+
+import copy
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+ASCENDING = 'ASCENDING'
+DESCENDING = 'DESCENDING'
+MAX_BATCH_WRITES = 500
+
+_OPERATORS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+    'in': lambda a, b: a in b,
+    'array_contains': lambda a, b: isinstance(a, list) and b in a,
+}
+
+
+class DeadlineExceeded(Exception):
+    """Same name as google.api_core.exceptions.DeadlineExceeded (RPC timeout)"""
+
+
+class ServiceUnavailable(Exception):
+    """Same name as google.api_core.exceptions.ServiceUnavailable"""
+
+
+class NotFound(Exception):
+    """Same name as google.api_core.exceptions.NotFound (update of a missing document)"""
+
+
+def _normalize(value: Any) -> Any:
+    """Store values like Firestore does: naive datetimes are UTC, returned tz-aware"""
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+class FakeSnapshot:
+    def __init__(self, reference: 'FakeDocumentReference', data: Optional[Dict[str, Any]]):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field: str) -> Any:
+        return (self._data or {}).get(field)
+
+
+class FakeDocumentReference:
+    def __init__(self, client: 'FakeFirestore', collection: str, document_id: str):
+        self._client = client
+        self.collection_name = collection
+        self.id = str(document_id)
+
+    @property
+    def _docs(self) -> Dict[str, Dict[str, Any]]:
+        return self._client._collections.setdefault(self.collection_name, {})
+
+    def get(self, retry=None, timeout: Optional[float] = None) -> FakeSnapshot:
+        self._client._rpc(timeout, self.collection_name)
+        return self._get()
+
+    def set(self, data: Dict[str, Any], merge: bool = False, retry=None, timeout: Optional[float] = None):
+        self._client._rpc(timeout, self.collection_name)
+        self._set(data, merge)
+
+    def update(self, data: Dict[str, Any], retry=None, timeout: Optional[float] = None):
+        self._client._rpc(timeout, self.collection_name)
+        self._update(data)
+
+    def delete(self, retry=None, timeout: Optional[float] = None):
+        self._client._rpc(timeout, self.collection_name)
+        self._delete()
+
+    def _get(self) -> FakeSnapshot:
+        with self._client._lock:
+            self._client.reads += 1
+            return FakeSnapshot(self, copy.deepcopy(self._docs.get(self.id)))
+
+    def _set(self, data: Dict[str, Any], merge: bool = False):
+        with self._client._lock:
+            self._client.writes += 1
+            current = self._docs.get(self.id) if merge else None
+            self._docs[self.id] = dict(current or {}, **_normalize(data))
+        self._client._notify(self.collection_name)
+
+    def _update(self, data: Dict[str, Any]):
+        with self._client._lock:
+            if self.id not in self._docs:
+                raise NotFound(f'No document to update: {self.collection_name}/{self.id}')
+            self._client.writes += 1
+            self._docs[self.id].update(_normalize(data))
+        self._client._notify(self.collection_name)
+
+    def _delete(self):
+        with self._client._lock:
+            self._client.deletes += 1
+            self._docs.pop(self.id, None)
+        self._client._notify(self.collection_name)
+
+
+class FakeQuery:
+    def __init__(self, client: 'FakeFirestore', collection: str):
+        self._client = client
+        self._collection = collection
+        self._filters: List[tuple] = []
+        self._orders: List[tuple] = []
+        self._limit: Optional[int] = None
+        self._start_after: Optional[Dict[str, Any]] = None
+
+    def _copy(self) -> 'FakeQuery':
+        query = FakeQuery(self._client, self._collection)
+        query._filters, query._orders = list(self._filters), list(self._orders)
+        query._limit, query._start_after = self._limit, self._start_after
+        return query
+
+    def where(self, field: str, op: str, value: Any) -> 'FakeQuery':
+        query = self._copy()
+        query._filters.append((field, _OPERATORS[op], _normalize(value)))
+        return query
+
+    def order_by(self, field: str, direction: str = ASCENDING) -> 'FakeQuery':
+        query = self._copy()
+        query._orders.append((field, direction))
+        return query
+
+    def limit(self, count: int) -> 'FakeQuery':
+        query = self._copy()
+        query._limit = count
+        return query
+
+    def start_after(self, cursor) -> 'FakeQuery':
+        """Cursor: a snapshot or a dict of the order_by field values"""
+        query = self._copy()
+        if isinstance(cursor, FakeSnapshot):
+            query._start_after = dict(cursor.to_dict(), __name__=cursor.id)
+        else:
+            query._start_after = _normalize(cursor)
+        return query
+
+    def _after_cursor(self, data: Dict[str, Any]) -> bool:
+        for field, direction in self._orders:
+            value, cursor = data.get(field), self._start_after.get(field)
+            if value == cursor:
+                continue
+            return value > cursor if direction == ASCENDING else value < cursor
+        # Như Firestore: cursor từ snapshot ngầm sắp theo tên document khi bằng nhau
+        return '__name__' in self._start_after and data['__name__'] > self._start_after['__name__']
+
+    def _evaluate(self) -> List[tuple]:
+        """[(document_id, data)] matching the query (no RPC, no read counted)"""
+        with self._client._lock:
+            docs = self._client._collections.get(self._collection, {})
+            items = [(document_id, copy.deepcopy(data)) for document_id, data in docs.items()]
+
+        # Như Firestore: document thiếu field lọc/sắp xếp thì không xuất hiện
+        needed = {field for field, _, _ in self._filters} | {field for field, _ in self._orders}
+        items = [(document_id, data) for document_id, data in items
+                 if all(data.get(field) is not None for field in needed)
+                 and all(op(data[field], value) for field, op, value in self._filters)]
+        items.sort(key=lambda item: item[0])
+        for field, direction in reversed(self._orders):
+            items.sort(key=lambda item: item[1][field], reverse=direction == DESCENDING)
+        if self._start_after is not None:
+            items = [item for item in items if self._after_cursor(dict(item[1], __name__=item[0]))]
+        if self._limit is not None:
+            items = items[:self._limit]
+        return items
+
+    def _snapshot(self, document_id: str, data: Dict[str, Any]) -> FakeSnapshot:
+        return FakeSnapshot(FakeDocumentReference(self._client, self._collection, document_id), data)
+
+    def stream(self, retry=None, timeout: Optional[float] = None):
+        self._client._rpc(timeout, self._collection)
+        items = self._evaluate()
+        with self._client._lock:
+            self._client.reads += max(len(items), 1)  # query rỗng vẫn tính 1 lần đọc
+        for document_id, data in items:
+            yield self._snapshot(document_id, data)
+
+    def on_snapshot(self, callback) -> 'FakeWatch':
+        """Listen to this query like ``Query.on_snapshot``: callback(docs, changes, read_time)"""
+        self._client._rpc(None, self._collection)
+        return FakeWatch(self, callback)
+
+    def get(self, retry=None, timeout: Optional[float] = None) -> List[FakeSnapshot]:
+        return list(self.stream(timeout=timeout))
+
+
+class FakeChangeType:
+    """Stand-in for firestore_v1.watch.ChangeType (only ``.name`` is used)"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f'ChangeType.{self.name}'
+
+
+ADDED, MODIFIED, REMOVED = FakeChangeType('ADDED'), FakeChangeType('MODIFIED'), FakeChangeType('REMOVED')
+
+
+class FakeDocumentChange:
+    def __init__(self, change_type: FakeChangeType, document: FakeSnapshot, old_index: int, new_index: int):
+        self.type = change_type
+        self.document = document
+        self.old_index = old_index
+        self.new_index = new_index
+
+
+class FakeWatch:
+    """Snapshot listener on a FakeQuery (what ``on_snapshot`` returns)"""
+
+    def __init__(self, query: FakeQuery, callback):
+        self._query = query
+        self._callback = callback
+        self._previous: List[tuple] = []
+        self.is_active = True
+        self.snapshots = 0
+        with query._client._lock:
+            query._client._watches.append(self)
+        self._push(initial=True)
+
+    def _push(self, initial: bool = False):
+        """Deliver the current result set and what changed since the previous one"""
+        if not self.is_active:
+            return
+        items = self._query._evaluate()
+        old = {document_id: (index, data) for index, (document_id, data) in enumerate(self._previous)}
+        new = {document_id: index for index, (document_id, _) in enumerate(items)}
+        changes = [FakeDocumentChange(REMOVED, self._query._snapshot(document_id, data), index, -1)
+                   for document_id, (index, data) in old.items() if document_id not in new]
+        for index, (document_id, data) in enumerate(items):
+            if document_id not in old:
+                changes.append(FakeDocumentChange(ADDED, self._query._snapshot(document_id, data), -1, index))
+            elif old[document_id][1] != data:
+                changes.append(FakeDocumentChange(MODIFIED, self._query._snapshot(document_id, data),
+                                                  old[document_id][0], index))
+        if not changes and not initial:
+            return
+        self._previous = items
+        with self._query._client._lock:
+            # Như Firestore: listener tính 1 lần đọc cho mỗi document gửi về
+            self._query._client.reads += max(len(items), 1) if initial else len(changes)
+        self.snapshots += 1
+        self._callback([self._query._snapshot(document_id, data) for document_id, data in items], changes,
+                       datetime.now(timezone.utc))
+
+    def unsubscribe(self):
+        self.is_active = False
+        with self._query._client._lock:
+            if self in self._query._client._watches:
+                self._query._client._watches.remove(self)
+
+
+class FakeCollection(FakeQuery):
+    def document(self, document_id: Any) -> FakeDocumentReference:
+        return FakeDocumentReference(self._client, self._collection, str(document_id))
+
+
+class FakeWriteBatch:
+    def __init__(self, client: 'FakeFirestore'):
+        self._client = client
+        self._operations = []
+
+    def _add(self, operation):
+        if len(self._operations) >= MAX_BATCH_WRITES:
+            raise ValueError(f'A batch can contain at most {MAX_BATCH_WRITES} writes')
+        self._operations.append(operation)
+
+    def set(self, reference: FakeDocumentReference, data: Dict[str, Any], merge: bool = False):
+        self._add(lambda: reference._set(data, merge=merge))
+
+    def update(self, reference: FakeDocumentReference, data: Dict[str, Any]):
+        self._add(lambda: reference._update(data))
+
+    def delete(self, reference: FakeDocumentReference):
+        self._add(reference._delete)
+
+    def commit(self, retry=None, timeout: Optional[float] = None):
+        self._client._rpc(timeout)
+        for operation in self._operations:
+            operation()
+        self._client.batch_commits += 1
+        self._operations = []
+
+
+class FakeFirestore:
+    """Drop-in for ``firestore.client()`` in tests and benchmarks"""
+
+    def __init__(self):
+        self._collections: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.RLock()
+        self.reads = self.writes = self.deletes = self.batch_commits = 0
+        self.latency = 0.0
+        self.slow: Dict[str, float] = {}
+        self.error: Optional[Exception] = None
+        self._watches: List['FakeWatch'] = []
+
+    def inject(self, latency: float = 0.0, error: Optional[Exception] = None,
+               slow: Optional[Dict[str, float]] = None):
+        """Make every following RPC slow and/or fail (inject() restores a healthy client)"""
+        self.latency, self.error, self.slow = latency, error, dict(slow or {})
+
+    def _rpc(self, timeout: Optional[float] = None, collection: Optional[str] = None):
+        latency, error = self.slow.get(collection, self.latency), self.error
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise DeadlineExceeded(f'Deadline of {timeout:.3f} s exceeded')
+        if latency:
+            time.sleep(latency)
+        if error is not None:
+            raise error
+
+    def _notify(self, collection: str):
+        with self._lock:
+            watches = [watch for watch in self._watches if watch._query._collection == collection]
+        for watch in watches:
+            watch._push()
+
+    def disconnect(self):
+        """Drop every snapshot listener, as when the watch stream closes"""
+        with self._lock:
+            watches, self._watches = self._watches, []
+        for watch in watches:
+            watch.is_active = False
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self, name)
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+
+    def get_all(self, references, retry=None, timeout: Optional[float] = None):
+        self._rpc(timeout)  # một RPC cho cả lô
+        for reference in references:
+            yield reference._get()
+
+    def reset_counters(self):
+        self.reads = self.writes = self.deletes = self.batch_commits = 0
+
+    def counters(self) -> Dict[str, int]:
+        return {'reads': self.reads, 'writes': self.writes, 'deletes': self.deletes,
+                'batch_commits': self.batch_commits}
@@ -1,13 +1,22 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
+from functools import wraps
 import json
 
+# = firestore.Query.DESCENDING, không cần import SDK chỉ để lấy hằng số
+DESCENDING = 'DESCENDING'
+
 # Initialize Firebase Admin SDK
 def initialize_firebase():
     """Initialize Firebase Admin SDK with service account"""
     try:
+        # Import ở lần dùng đầu tiên: firebase_admin + google-cloud-firestore (grpc) nặng
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+
         # Check if Firebase is already initialized
         if not firebase_admin._apps:
             # Use service account key file if available
@@ -27,375 +36,586 @@ def initialize_firebase():
         print(f"❌ Error initializing Firebase: {e}")
         return None
 
+def _timestamp(value):
+    """SQL timestamp (datetime or ISO string, UTC) for a Firestore field; now if missing"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    return datetime.utcnow()
+
+# Lỗi trạng thái của google.api_core do request (Firestore vẫn trả lời): không tính vào circuit breaker
+CLIENT_ERRORS = ('NotFound', 'AlreadyExists', 'InvalidArgument', 'FailedPrecondition', 'OutOfRange')
+TIMEOUT_ERRORS = ('DeadlineExceeded', 'TimeoutError', 'FirestoreDeadline')
+
+
+class FirestoreDeadline(TimeoutError):
+    """The per-call deadline ran out before the next RPC"""
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failure_threshold`` consecutive failures.
+
+    While open every call is refused for ``cooldown`` seconds; then one trial
+    call is let through (half-open): success closes the circuit, failure
+    opens it for another cool-down.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, cooldown=30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0  # liên tiếp
+        self._opened_at = 0.0
+        self._trial = False
+        self.metrics = {'opened': 0, 'half_opened': 0, 'closed': 0, 'short_circuited': 0,
+                        'open_seconds': 0.0, 'last_error': None}
+
+    def allow(self):
+        """True if the call may go to Firestore"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+                self._trial = False
+                self.metrics['half_opened'] += 1
+                print("🟡 Firestore circuit half-open, trying one call")
+            if self.state == self.HALF_OPEN and not self._trial:
+                self._trial = True  # chỉ một request thử
+                return True
+            self.metrics['short_circuited'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            if self.state != self.CLOSED:
+                self.metrics['open_seconds'] += time.monotonic() - self._opened_at
+                self.state = self.CLOSED
+                self.metrics['closed'] += 1
+                print("🟢 Firestore circuit closed")
+
+    def record_failure(self, error):
+        with self._lock:
+            self.failures += 1
+            self.metrics['last_error'] = f'{type(error).__name__}: {error}'[:200]
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                if self.state == self.HALF_OPEN:
+                    self.metrics['open_seconds'] += time.monotonic() - self._opened_at
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.metrics['opened'] += 1
+                print(f"🔴 Firestore circuit open for {self.cooldown:.0f} s after {self.failures} failures")
+
+    def release(self):
+        """End a half-open trial that made no RPC (the next call tries again)"""
+        with self._lock:
+            self._trial = False
+
+    def stats(self):
+        with self._lock:
+            open_seconds = self.metrics['open_seconds']
+            if self.state != self.CLOSED:
+                open_seconds += time.monotonic() - self._opened_at
+            return dict(self.metrics, state=self.state, consecutive_failures=self.failures,
+                        open_seconds=round(open_seconds, 1), failure_threshold=self.failure_threshold,
+                        cooldown=self.cooldown)
+
+
+def _guarded(default, action):
+    """Run a FirebaseDB call under the circuit breaker and a per-call deadline.
+
+    Returns ``default()`` when Firestore is not configured, the circuit is
+    open, or the call fails (logged as "Error <action>").
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.db:
+                return default()
+            if not self.breaker.allow():
+                return default()
+            local = self._local
+            outer = getattr(local, 'deadline', None), getattr(local, 'rpc', False)
+            local.deadline, local.rpc = time.monotonic() + self.timeout, False
+            began = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+            except Exception as e:
+                name = type(e).__name__
+                self.metrics['errors'] += 1
+                if name in TIMEOUT_ERRORS:
+                    self.metrics['timeouts'] += 1
+                if not local.rpc:
+                    self.breaker.release()  # lỗi cục bộ (vd. thiếu 'id') trước RPC nào: không nói gì về Firestore
+                elif name in CLIENT_ERRORS:
+                    self.breaker.record_success()  # Firestore vẫn trả lời
+                else:
+                    self.breaker.record_failure(e)
+                print(f"❌ Error {action}: {e}")
+                return default()
+            else:
+                if local.rpc:
+                    self.breaker.record_success()
+                else:
+                    self.breaker.release()
+                return result
+            finally:
+                self.metrics['calls'] += 1
+                self.metrics['seconds'] += time.perf_counter() - began
+                local.deadline, local.rpc = outer
+        return wrapper
+    return decorator
+
+def _mirrored(view):
+    """Serve a read from the Firestore mirror when it has a fresh copy of ``view``"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.mirror is not None:
+                rows = self.mirror.read(view)
+                if rows is not None:
+                    return rows
+            return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
 # Database operations
 class FirebaseDB:
-    def __init__(self):
-        self.db = initialize_firebase()
+    """Firestore access for the app.
+
+    Every public call has a deadline (``timeout`` seconds, shared by all RPCs
+    of the call and passed to the SDK as ``timeout=``) and goes through a
+    circuit breaker: after ``FIRESTORE_BREAKER_THRESHOLD`` consecutive
+    failures calls return their empty default immediately instead of
+    waiting on an unreachable Firestore.
+    """
+    _UNSET = object()
+
+    def __init__(self, timeout=3.0):
+        # Khởi tạo SDK ở lần truy cập .db đầu tiên, không phải lúc import
+        # (tìm credentials có thể mất vài giây, chặn worker khởi động)
+        self._db = self._UNSET
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.timeout = timeout
+        self.fanout_workers = 9
+        self._executor = None
+        self._executor_pid = None
+        self.breaker = CircuitBreaker()
+        self.mirror = None  # FirestoreMirror khi FIRESTORE_MIRROR=true
+        self.metrics = {'calls': 0, 'errors': 0, 'timeouts': 0, 'partial': 0, 'seconds': 0.0}
+
+    def init_app(self, app):
+        """Configure deadlines and the circuit breaker from the Flask app config"""
+        self.timeout = app.config.get('FIRESTORE_TIMEOUT', self.timeout)
+        self.fanout_workers = app.config.get('FIRESTORE_FANOUT_WORKERS', self.fanout_workers)
+        self.breaker.failure_threshold = app.config.get('FIRESTORE_BREAKER_THRESHOLD', self.breaker.failure_threshold)
+        self.breaker.cooldown = app.config.get('FIRESTORE_BREAKER_COOLDOWN', self.breaker.cooldown)
+        app.extensions['firebase_db'] = self
+
+    @property
+    def db(self):
+        """Firestore client, initialized on first use (None if unavailable)"""
+        if self._db is self._UNSET:
+            with self._lock:
+                if self._db is self._UNSET:
+                    self._db = initialize_firebase()
+        return self._db
+
+    @db.setter
+    def db(self, client):
+        self._db = client
+
+    @property
+    def initialized(self):
+        return self._db is not self._UNSET
+
+    def _timeout(self):
+        """Seconds left for the next RPC of the current call"""
+        self._local.rpc = True
+        deadline = getattr(self._local, 'deadline', None)
+        if deadline is None:
+            return self.timeout
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise FirestoreDeadline(f'Firestore call exceeded its {self.timeout} s deadline')
+        return remaining
+
+    def _pool(self):
+        """Thread pool for concurrent reads (per process: not inherited across fork)"""
+        if self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor_pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=self.fanout_workers,
+                                                        thread_name_prefix='firestore')
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def _fan_out(self, tasks):
+        """Run independent reads concurrently under the current call's deadline.
+
+        Returns ``{name: result}``. Reads that fail or are still running at
+        the deadline are left out and listed in ``missing`` with
+        ``partial: True``. If none succeeds the first error is raised, so the
+        circuit breaker sees the failure.
+        """
+        deadline = getattr(self._local, 'deadline', None) or time.monotonic() + self.timeout
+        self._local.rpc = True
+
+        def run(task):
+            # Thread của pool không có thread-local của request: truyền deadline chung
+            self._local.deadline = deadline
+            try:
+                return task()
+            finally:
+                self._local.deadline = None
+
+        futures = {name: self._pool().submit(run, task) for name, task in tasks.items()}
+        wait(futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+        results, missing, errors = {}, {}, []
+        for name, future in futures.items():
+            if not future.done():
+                future.cancel()  # chưa chạy thì bỏ; đang chạy thì SDK tự dừng ở timeout
+                missing[name] = 'timeout'
+            elif future.exception() is not None:
+                errors.append(future.exception())
+                missing[name] = f'{type(future.exception()).__name__}: {future.exception()}'[:200]
+            else:
+                results[name] = future.result()
+        if missing:
+            if not results:
+                raise errors[0] if errors else FirestoreDeadline(
+                    f'No Firestore read finished within the {self.timeout} s deadline')
+            self.metrics['partial'] += 1
+            print(f"⚠️ Partial Firestore result, missing: {', '.join(missing)}")
+            results.update(partial=True, missing=missing)
+        return results
+
+    def stats(self):
+        calls = self.metrics['calls']
+        return dict(self.metrics, timeout=self.timeout, seconds=round(self.metrics['seconds'], 3),
+                    avg_ms=round(self.metrics['seconds'] * 1000 / calls, 2) if calls else 0.0,
+                    configured=self._db not in (self._UNSET, None), breaker=self.breaker.stats())
     
+    @_guarded(bool, 'saving user')
     def save_user(self, user_data):
         """Save user data to Firestore"""
-        try:
-            if not self.db:
-                return False
-            
-            user_ref = self.db.collection('người dùng').document(str(user_data['id']))
-            
-            # Enhanced user data with more fields
-            enhanced_user_data = {
-                'id': user_data['id'],
-                'email': user_data.get('email', ''),
-                'display_name': user_data.get('display_name', ''),
-                'username': user_data.get('username', ''),
-                'gender': user_data.get('gender', ''),
-                'age': user_data.get('age', 0),
-                'height': user_data.get('height', 0),
-                'weight': user_data.get('weight', 0),
-                'medical_history': user_data.get('medical_history', ''),
-                'phone': user_data.get('phone', ''),
-                'address': user_data.get('address', ''),
-                'emergency_contact': user_data.get('emergency_contact', ''),
-                'blood_type': user_data.get('blood_type', ''),
-                'allergies': user_data.get('allergies', ''),
-                'medications': user_data.get('medications', ''),
-                'is_admin': user_data.get('is_admin', False),
-                'is_active': user_data.get('is_active', True),
-                'last_login': user_data.get('last_login'),
-                'created_at': datetime.now(),
-                'updated_at': datetime.now(),
-                'last_sync': datetime.now()
-            }
-            
-            user_ref.set(enhanced_user_data)
-            print(f"✅ User {user_data['id']} saved to Firebase with enhanced data")
-            return True
-        except Exception as e:
-            print(f"❌ Error saving user: {e}")
-            return False
+        user_ref = self.db.collection('người dùng').document(str(user_data['id']))
+        
+        # Enhanced user data with more fields
+        enhanced_user_data = {
+            'id': user_data['id'],
+            'email': user_data.get('email', ''),
+            'display_name': user_data.get('display_name', ''),
+            'username': user_data.get('username', ''),
+            'gender': user_data.get('gender', ''),
+            'age': user_data.get('age', 0),
+            'height': user_data.get('height', 0),
+            'weight': user_data.get('weight', 0),
+            'medical_history': user_data.get('medical_history', ''),
+            'phone': user_data.get('phone', ''),
+            'address': user_data.get('address', ''),
+            'emergency_contact': user_data.get('emergency_contact', ''),
+            'blood_type': user_data.get('blood_type', ''),
+            'allergies': user_data.get('allergies', ''),
+            'medications': user_data.get('medications', ''),
+            'is_admin': user_data.get('is_admin', False),
+            'is_active': user_data.get('is_active', True),
+            'last_login': user_data.get('last_login'),
+            # Giữ thời gian gốc của SQL, không ghi đè bằng thời điểm sync
+            'created_at': _timestamp(user_data.get('created_at')),
+            'updated_at': _timestamp(user_data.get('updated_at')),
+            'last_sync': datetime.utcnow()
+        }
+        
+        user_ref.set(enhanced_user_data, timeout=self._timeout())
+        print(f"✅ User {user_data['id']} saved to Firebase with enhanced data")
+        return True
     
+    @_guarded(bool, 'saving assessment')
     def save_assessment(self, assessment_data):
         """Save health assessment to Firestore"""
-        try:
-            if not self.db:
-                return False
-            
-            assessment_ref = self.db.collection('đánh giá').document(str(assessment_data['id']))
-            
-            # Enhanced assessment data with more fields
-            enhanced_assessment_data = {
-                'id': assessment_data['id'],
-                'user_id': assessment_data.get('user_id', 0),
-                'user_email': assessment_data.get('user_email', ''),
-                'user_name': assessment_data.get('user_name', ''),
-                'symptoms': assessment_data.get('symptoms', ''),
-                'symptoms_list': assessment_data.get('symptoms_list', []),
-                'age_at_assessment': assessment_data.get('age_at_assessment', 0),
-                'days_sick': assessment_data.get('days_sick', 0),
-                'priority': assessment_data.get('priority', ''),
-                'message': assessment_data.get('message', ''),
-                'description': assessment_data.get('description', ''),
-                'recommendations': assessment_data.get('recommendations', ''),
-                'ai_diagnosis': assessment_data.get('ai_diagnosis', {}),
-                'severity_score': assessment_data.get('severity_score', 0),
-                'confidence_level': assessment_data.get('confidence_level', 0),
-                'disease_predicted': assessment_data.get('disease_predicted', ''),
-                'precautions': assessment_data.get('precautions', []),
-                'follow_up_needed': assessment_data.get('follow_up_needed', False),
-                'follow_up_date': assessment_data.get('follow_up_date', ''),
-                'created_at': datetime.now(),
-                'updated_at': datetime.now(),
-                'last_sync': datetime.now()
-            }
-            
-            assessment_ref.set(enhanced_assessment_data)
-            print(f"✅ Assessment {assessment_data['id']} saved to Firebase with enhanced data")
-            return True
-        except Exception as e:
-            print(f"❌ Error saving assessment: {e}")
-            return False
+        assessment_ref = self.db.collection('đánh giá').document(str(assessment_data['id']))
+        
+        # Enhanced assessment data with more fields
+        enhanced_assessment_data = {
+            'id': assessment_data['id'],
+            'user_id': assessment_data.get('user_id', 0),
+            'user_email': assessment_data.get('user_email', ''),
+            'user_name': assessment_data.get('user_name', ''),
+            'symptoms': assessment_data.get('symptoms', ''),
+            'symptoms_list': assessment_data.get('symptoms_list', []),
+            'age_at_assessment': assessment_data.get('age_at_assessment', 0),
+            'days_sick': assessment_data.get('days_sick', 0),
+            'priority': assessment_data.get('priority', ''),
+            'message': assessment_data.get('message', ''),
+            'description': assessment_data.get('description', ''),
+            'recommendations': assessment_data.get('recommendations', ''),
+            'ai_diagnosis': assessment_data.get('ai_diagnosis', {}),
+            'severity_score': assessment_data.get('severity_score', 0),
+            'confidence_level': assessment_data.get('confidence_level', 0),
+            'disease_predicted': assessment_data.get('disease_predicted', ''),
+            'precautions': assessment_data.get('precautions', []),
+            'follow_up_needed': assessment_data.get('follow_up_needed', False),
+            'follow_up_date': assessment_data.get('follow_up_date', ''),
+            # Giữ thời gian gốc của SQL, không ghi đè bằng thời điểm sync
+            'created_at': _timestamp(assessment_data.get('created_at')),
+            'updated_at': _timestamp(assessment_data.get('updated_at')),
+            'last_sync': datetime.utcnow()
+        }
+        
+        assessment_ref.set(enhanced_assessment_data, timeout=self._timeout())
+        print(f"✅ Assessment {assessment_data['id']} saved to Firebase with enhanced data")
+        return True
     
+    @_guarded(bool, 'saving contact')
     def save_contact(self, contact_data):
         """Save contact message to Firestore"""
-        try:
-            if not self.db:
-                return False
-            
-            contact_ref = self.db.collection('liên hệ').document(str(contact_data['id']))
-            
-            # Enhanced contact data with more fields
-            enhanced_contact_data = {
-                'id': contact_data['id'],
-                'name': contact_data.get('name', ''),
-                'email': contact_data.get('email', ''),
-                'phone': contact_data.get('phone', ''),
-                'subject': contact_data.get('subject', ''),
-                'message': contact_data.get('message', ''),
-                'category': contact_data.get('category', 'general'),
-                'priority': contact_data.get('priority', 'normal'),
-                'status': contact_data.get('status', 'new'),
-                'assigned_to': contact_data.get('assigned_to', ''),
-                'response': contact_data.get('response', ''),
-                'response_date': contact_data.get('response_date', ''),
-                'user_agent': contact_data.get('user_agent', ''),
-                'ip_address': contact_data.get('ip_address', ''),
-                'created_at': datetime.now(),
-                'updated_at': datetime.now(),
-                'last_sync': datetime.now()
-            }
-            
-            contact_ref.set(enhanced_contact_data)
-            print(f"✅ Contact {contact_data['id']} saved to Firebase with enhanced data")
-            return True
-        except Exception as e:
-            print(f"❌ Error saving contact: {e}")
-            return False
+        contact_ref = self.db.collection('liên hệ').document(str(contact_data['id']))
+        
+        # Enhanced contact data with more fields
+        enhanced_contact_data = {
+            'id': contact_data['id'],
+            'name': contact_data.get('name', ''),
+            'email': contact_data.get('email', ''),
+            'phone': contact_data.get('phone', ''),
+            'subject': contact_data.get('subject', ''),
+            'message': contact_data.get('message', ''),
+            'category': contact_data.get('category', 'general'),
+            'priority': contact_data.get('priority', 'normal'),
+            'status': contact_data.get('status', 'new'),
+            'assigned_to': contact_data.get('assigned_to', ''),
+            'response': contact_data.get('response', ''),
+            'response_date': contact_data.get('response_date', ''),
+            'user_agent': contact_data.get('user_agent', ''),
+            'ip_address': contact_data.get('ip_address', ''),
+            # Giữ thời gian gốc của SQL, không ghi đè bằng thời điểm sync
+            'created_at': _timestamp(contact_data.get('created_at')),
+            'updated_at': _timestamp(contact_data.get('updated_at')),
+            'last_sync': datetime.utcnow()
+        }
+        
+        contact_ref.set(enhanced_contact_data, timeout=self._timeout())
+        print(f"✅ Contact {contact_data['id']} saved to Firebase with enhanced data")
+        return True
     
+    @_guarded(list, 'getting user history')
     def get_user_history(self, user_id):
         """Get user's health assessment history"""
-        try:
-            if not self.db:
-                return []
-            
-            assessments = self.db.collection('đánh giá').where('user_id', '==', user_id).order_by('created_at', direction=firestore.Query.DESCENDING).stream()
-            
-            history = []
-            for assessment in assessments:
-                data = assessment.to_dict()
-                data['id'] = assessment.id
-                history.append(data)
-            
-            return history
-        except Exception as e:
-            print(f"❌ Error getting user history: {e}")
-            return []
+        assessments = self.db.collection('đánh giá').where('user_id', '==', user_id).order_by('created_at', direction=DESCENDING).stream(timeout=self._timeout())
+        
+        history = []
+        for assessment in assessments:
+            data = assessment.to_dict()
+            data['id'] = assessment.id
+            history.append(data)
+        
+        return history
     
+    @_guarded(list, 'getting users')
     def get_all_users(self):
         """Get all users from Firestore"""
-        try:
-            if not self.db:
-                return []
-            
-            users = self.db.collection('người dùng').stream()
-            
-            user_list = []
-            for user in users:
-                data = user.to_dict()
-                data['id'] = user.id
-                user_list.append(data)
-            
-            return user_list
-        except Exception as e:
-            print(f"❌ Error getting users: {e}")
-            return []
+        users = self.db.collection('người dùng').stream(timeout=self._timeout())
+        
+        user_list = []
+        for user in users:
+            data = user.to_dict()
+            data['id'] = user.id
+            user_list.append(data)
+        
+        return user_list
     
+    @_mirrored('assessments')
+    @_guarded(list, 'getting assessments')
     def get_all_assessments(self):
         """Get all health assessments from Firestore"""
-        try:
-            if not self.db:
-                return []
-            
-            assessments = self.db.collection('đánh giá').order_by('created_at', direction=firestore.Query.DESCENDING).stream()
-            
-            assessment_list = []
-            for assessment in assessments:
-                data = assessment.to_dict()
-                data['id'] = assessment.id
-                assessment_list.append(data)
-            
-            return assessment_list
-        except Exception as e:
-            print(f"❌ Error getting assessments: {e}")
-            return []
+        assessments = self.db.collection('đánh giá').order_by('created_at', direction=DESCENDING).stream(timeout=self._timeout())
+        
+        assessment_list = []
+        for assessment in assessments:
+            data = assessment.to_dict()
+            data['id'] = assessment.id
+            assessment_list.append(data)
+        
+        return assessment_list
     
+    @_mirrored('contacts')
+    @_guarded(list, 'getting contacts')
     def get_all_contacts(self):
         """Get all contact messages from Firestore"""
-        try:
-            if not self.db:
-                return []
-            
-            contacts = self.db.collection('liên hệ').order_by('created_at', direction=firestore.Query.DESCENDING).stream()
-            
-            contact_list = []
-            for contact in contacts:
-                data = contact.to_dict()
-                data['id'] = contact.id
-                contact_list.append(data)
-            
-            return contact_list
-        except Exception as e:
-            print(f"❌ Error getting contacts: {e}")
-            return []
+        contacts = self.db.collection('liên hệ').order_by('created_at', direction=DESCENDING).stream(timeout=self._timeout())
+        
+        contact_list = []
+        for contact in contacts:
+            data = contact.to_dict()
+            data['id'] = contact.id
+            contact_list.append(data)
+        
+        return contact_list
     
+    @_guarded(bool, 'updating user')
     def update_user(self, user_id, update_data):
         """Update user data in Firestore"""
-        try:
-            if not self.db:
-                return False
-            
-            user_ref = self.db.collection('người dùng').document(str(user_id))
-            update_data['last_sync'] = datetime.now()
-            
-            user_ref.update(update_data)
-            print(f"✅ User {user_id} updated in Firebase")
-            return True
-        except Exception as e:
-            print(f"❌ Error updating user: {e}")
-            return False
+        user_ref = self.db.collection('người dùng').document(str(user_id))
+        update_data['last_sync'] = datetime.utcnow()
+        
+        user_ref.update(update_data, timeout=self._timeout())
+        print(f"✅ User {user_id} updated in Firebase")
+        return True
     
+    @_guarded(bool, 'deleting user')
     def delete_user(self, user_id):
         """Delete user from Firestore"""
-        try:
-            if not self.db:
-                return False
-            
-            user_ref = self.db.collection('người dùng').document(str(user_id))
-            user_ref.delete()
-            print(f"✅ User {user_id} deleted from Firebase")
-            return True
-        except Exception as e:
-            print(f"❌ Error deleting user: {e}")
-            return False
+        user_ref = self.db.collection('người dùng').document(str(user_id))
+        user_ref.delete(timeout=self._timeout())
+        print(f"✅ User {user_id} deleted from Firebase")
+        return True
+    
+    @_guarded(int, 'deleting documents')
+    def delete_documents(self, collection, document_ids):
+        """Delete documents by id using batched writes (500 per commit)"""
+        if not document_ids:
+            return 0
+
+        deleted = 0
+        ids = [str(document_id) for document_id in document_ids]
+        for start in range(0, len(ids), 500):
+            batch = self.db.batch()
+            for document_id in ids[start:start + 500]:
+                batch.delete(self.db.collection(collection).document(document_id))
+            batch.commit(timeout=self._timeout())
+            deleted += len(ids[start:start + 500])
+        print(f"✅ Deleted {deleted} documents from '{collection}'")
+        return deleted
     
+    @_guarded(dict, 'getting statistics')
     def get_statistics(self):
-        """Get statistics from Firestore"""
-        try:
-            if not self.db:
-                return {}
-            
+        """Get statistics from Firestore (queries run concurrently; partial if some miss the deadline)"""
+        def count(collection, view=None):
+            total = self.mirror.count(view) if self.mirror is not None and view else None
+            if total is not None:
+                return lambda: total
+            return lambda: len(list(self.db.collection(collection).stream(timeout=self._timeout())))
+
+        def recent(collection, view=None):
+            rows = self.mirror.read(view, limit=5) if self.mirror is not None and view else None
+            if rows is not None:
+                return lambda: rows
+            query = self.db.collection(collection).order_by('created_at', direction=DESCENDING).limit(5)
+            return lambda: [doc.to_dict() for doc in query.stream(timeout=self._timeout())]
+
+        # Chín truy vấn độc lập: chạy song song, dashboard chờ truy vấn chậm nhất thay vì tổng
+        stats = self._fan_out({
             # Get counts for all collections
-            users_count = len(list(self.db.collection('người dùng').stream()))
-            assessments_count = len(list(self.db.collection('đánh giá').stream()))
-            contacts_count = len(list(self.db.collection('liên hệ').stream()))
-            health_records_count = len(list(self.db.collection('hồ_sơ_sức_khỏe').stream()))
-            appointments_count = len(list(self.db.collection('lịch_hẹn').stream()))
-            notifications_count = len(list(self.db.collection('thông_báo').stream()))
-            
+            'total_users': count('người dùng'),
+            'total_assessments': count('đánh giá', 'assessments'),
+            'total_contacts': count('liên hệ', 'contacts'),
+            'total_health_records': count('hồ_sơ_sức_khỏe'),
+            'total_appointments': count('lịch_hẹn'),
+            'total_notifications': count('thông_báo'),
             # Get recent activity
-            recent_assessments = list(self.db.collection('đánh giá').order_by('created_at', direction=firestore.Query.DESCENDING).limit(5).stream())
-            recent_contacts = list(self.db.collection('liên hệ').order_by('created_at', direction=firestore.Query.DESCENDING).limit(5).stream())
-            recent_health_records = list(self.db.collection('hồ_sơ_sức_khỏe').order_by('created_at', direction=firestore.Query.DESCENDING).limit(5).stream())
-            
-            stats = {
-                'total_users': users_count,
-                'total_assessments': assessments_count,
-                'total_contacts': contacts_count,
-                'total_health_records': health_records_count,
-                'total_appointments': appointments_count,
-                'total_notifications': notifications_count,
-                'recent_assessments': [doc.to_dict() for doc in recent_assessments],
-                'recent_contacts': [doc.to_dict() for doc in recent_contacts],
-                'recent_health_records': [doc.to_dict() for doc in recent_health_records]
-            }
-            
-            return stats
-        except Exception as e:
-            print(f"❌ Error getting statistics: {e}")
-            return {}
+            'recent_assessments': recent('đánh giá', 'assessments'),
+            'recent_contacts': recent('liên hệ', 'contacts'),
+            'recent_health_records': recent('hồ_sơ_sức_khỏe'),
+        })
+        
+        return stats
 
+    @_guarded(bool, 'saving health record')
     def save_health_record(self, record_data):
         """Save health record to Firestore"""
-        try:
-            if not self.db:
-                return False
-            
-            record_ref = self.db.collection('hồ_sơ_sức_khỏe').document(str(record_data['id']))
-            
-            enhanced_record_data = {
-                'id': record_data['id'],
-                'user_id': record_data.get('user_id', 0),
-                'user_email': record_data.get('user_email', ''),
-                'record_type': record_data.get('record_type', 'general'),
-                'title': record_data.get('title', ''),
-                'description': record_data.get('description', ''),
-                'symptoms': record_data.get('symptoms', ''),
-                'diagnosis': record_data.get('diagnosis', ''),
-                'treatment': record_data.get('treatment', ''),
-                'medications': record_data.get('medications', []),
-                'test_results': record_data.get('test_results', {}),
-                'doctor_name': record_data.get('doctor_name', ''),
-                'hospital': record_data.get('hospital', ''),
-                'visit_date': record_data.get('visit_date', ''),
-                'next_visit': record_data.get('next_visit', ''),
-                'attachments': record_data.get('attachments', []),
-                'notes': record_data.get('notes', ''),
-                'created_at': datetime.now(),
-                'updated_at': datetime.now(),
-                'last_sync': datetime.now()
-            }
-            
-            record_ref.set(enhanced_record_data)
-            print(f"✅ Health record {record_data['id']} saved to Firebase")
-            return True
-        except Exception as e:
-            print(f"❌ Error saving health record: {e}")
-            return False
+        record_ref = self.db.collection('hồ_sơ_sức_khỏe').document(str(record_data['id']))
+        
+        enhanced_record_data = {
+            'id': record_data['id'],
+            'user_id': record_data.get('user_id', 0),
+            'user_email': record_data.get('user_email', ''),
+            'record_type': record_data.get('record_type', 'general'),
+            'title': record_data.get('title', ''),
+            'description': record_data.get('description', ''),
+            'symptoms': record_data.get('symptoms', ''),
+            'diagnosis': record_data.get('diagnosis', ''),
+            'treatment': record_data.get('treatment', ''),
+            'medications': record_data.get('medications', []),
+            'test_results': record_data.get('test_results', {}),
+            'doctor_name': record_data.get('doctor_name', ''),
+            'hospital': record_data.get('hospital', ''),
+            'visit_date': record_data.get('visit_date', ''),
+            'next_visit': record_data.get('next_visit', ''),
+            'attachments': record_data.get('attachments', []),
+            'notes': record_data.get('notes', ''),
+            'created_at': datetime.now(),
+            'updated_at': datetime.now(),
+            'last_sync': datetime.now()
+        }
+        
+        record_ref.set(enhanced_record_data, timeout=self._timeout())
+        print(f"✅ Health record {record_data['id']} saved to Firebase")
+        return True
 
+    @_guarded(bool, 'saving appointment')
     def save_appointment(self, appointment_data):
         """Save appointment to Firestore"""
-        try:
-            if not self.db:
-                return False
-            
-            appointment_ref = self.db.collection('lịch_hẹn').document(str(appointment_data['id']))
-            
-            enhanced_appointment_data = {
-                'id': appointment_data['id'],
-                'user_id': appointment_data.get('user_id', 0),
-                'user_email': appointment_data.get('user_email', ''),
-                'appointment_type': appointment_data.get('appointment_type', 'consultation'),
-                'doctor_name': appointment_data.get('doctor_name', ''),
-                'specialty': appointment_data.get('specialty', ''),
-                'appointment_date': appointment_data.get('appointment_date', ''),
-                'appointment_time': appointment_data.get('appointment_time', ''),
-                'duration': appointment_data.get('duration', 30),
-                'location': appointment_data.get('location', ''),
-                'reason': appointment_data.get('reason', ''),
-                'symptoms': appointment_data.get('symptoms', ''),
-                'status': appointment_data.get('status', 'scheduled'),
-                'notes': appointment_data.get('notes', ''),
-                'reminder_sent': appointment_data.get('reminder_sent', False),
-                'created_at': datetime.now(),
-                'updated_at': datetime.now(),
-                'last_sync': datetime.now()
-            }
-            
-            appointment_ref.set(enhanced_appointment_data)
-            print(f"✅ Appointment {appointment_data['id']} saved to Firebase")
-            return True
-        except Exception as e:
-            print(f"❌ Error saving appointment: {e}")
-            return False
+        appointment_ref = self.db.collection('lịch_hẹn').document(str(appointment_data['id']))
+        
+        enhanced_appointment_data = {
+            'id': appointment_data['id'],
+            'user_id': appointment_data.get('user_id', 0),
+            'user_email': appointment_data.get('user_email', ''),
+            'appointment_type': appointment_data.get('appointment_type', 'consultation'),
+            'doctor_name': appointment_data.get('doctor_name', ''),
+            'specialty': appointment_data.get('specialty', ''),
+            'appointment_date': appointment_data.get('appointment_date', ''),
+            'appointment_time': appointment_data.get('appointment_time', ''),
+            'duration': appointment_data.get('duration', 30),
+            'location': appointment_data.get('location', ''),
+            'reason': appointment_data.get('reason', ''),
+            'symptoms': appointment_data.get('symptoms', ''),
+            'status': appointment_data.get('status', 'scheduled'),
+            'notes': appointment_data.get('notes', ''),
+            'reminder_sent': appointment_data.get('reminder_sent', False),
+            'created_at': datetime.now(),
+            'updated_at': datetime.now(),
+            'last_sync': datetime.now()
+        }
+        
+        appointment_ref.set(enhanced_appointment_data, timeout=self._timeout())
+        print(f"✅ Appointment {appointment_data['id']} saved to Firebase")
+        return True
 
+    @_guarded(bool, 'saving notification')
     def save_notification(self, notification_data):
         """Save notification to Firestore"""
-        try:
-            if not self.db:
-                return False
-            
-            notification_ref = self.db.collection('thông_báo').document(str(notification_data['id']))
-            
-            enhanced_notification_data = {
-                'id': notification_data['id'],
-                'user_id': notification_data.get('user_id', 0),
-                'user_email': notification_data.get('user_email', ''),
-                'type': notification_data.get('type', 'general'),
-                'title': notification_data.get('title', ''),
-                'message': notification_data.get('message', ''),
-                'priority': notification_data.get('priority', 'normal'),
-                'read': notification_data.get('read', False),
-                'action_url': notification_data.get('action_url', ''),
-                'expires_at': notification_data.get('expires_at', ''),
-                'created_at': datetime.now(),
-                'updated_at': datetime.now(),
-                'last_sync': datetime.now()
-            }
-            
-            notification_ref.set(enhanced_notification_data)
-            print(f"✅ Notification {notification_data['id']} saved to Firebase")
-            return True
-        except Exception as e:
-            print(f"❌ Error saving notification: {e}")
-            return False
+        notification_ref = self.db.collection('thông_báo').document(str(notification_data['id']))
+        
+        enhanced_notification_data = {
+            'id': notification_data['id'],
+            'user_id': notification_data.get('user_id', 0),
+            'user_email': notification_data.get('user_email', ''),
+            'type': notification_data.get('type', 'general'),
+            'title': notification_data.get('title', ''),
+            'message': notification_data.get('message', ''),
+            'priority': notification_data.get('priority', 'normal'),
+            'read': notification_data.get('read', False),
+            'action_url': notification_data.get('action_url', ''),
+            'expires_at': notification_data.get('expires_at', ''),
+            'created_at': datetime.now(),
+            'updated_at': datetime.now(),
+            'last_sync': datetime.now()
+        }
+        
+        notification_ref.set(enhanced_notification_data, timeout=self._timeout())
+        print(f"✅ Notification {notification_data['id']} saved to Firebase")
+        return True
 
-# Initialize Firebase DB instance
+# Firebase DB instance (SDK khởi tạo lười ở lần dùng đầu tiên)
 firebase_db = FirebaseDB()
 
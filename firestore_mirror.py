@@ -0,0 +1,216 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from firebase_config import DESCENDING
+
+# View -> collection, sắp theo created_at mới nhất (như get_all_contacts/get_all_assessments)
+MIRROR_VIEWS = {
+    'contacts': 'liên hệ',
+    'assessments': 'đánh giá',
+}
+
+
+class FirestoreMirror:
+    """In-process copy of small Firestore collections kept fresh by ``on_snapshot``.
+
+    Each enabled view listens to ``collection.order_by('created_at',
+    DESCENDING).limit(max_docs)`` and applies the listener's changes to a
+    local dict, so admin reads (``get_all_contacts``, the "recent" lists of
+    ``get_statistics``) cost no Firestore round trip. ``read`` returns None
+    (caller queries Firestore directly) when:
+
+    - the view has not received its first snapshot yet,
+    - the listener has been disconnected for more than ``max_staleness``
+      seconds (a new subscription is then attempted every ``retry_after``),
+    - the whole collection is asked for but the view is truncated at
+      ``max_docs``.
+
+    Listener updates arrive shortly after a write, so a read right after
+    ``save_contact`` may not include it yet. Listeners start on the first
+    read and again in a forked worker.
+    """
+
+    def __init__(self, max_docs: int = 2000, max_staleness: float = 30.0, retry_after: float = 10.0):
+        self.max_docs = max_docs
+        self.max_staleness = max_staleness
+        self.retry_after = retry_after
+        self.enabled = False
+        self.views: List[str] = list(MIRROR_VIEWS)
+        self.client_factory = None  # -> Firestore client; mặc định firebase_db.db
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self.metrics = {'hits': 0, 'fallback_not_synced': 0, 'fallback_stale': 0, 'fallback_truncated': 0,
+                        'snapshots': 0, 'changes': 0, 'subscribes': 0, 'errors': 0}
+
+    def init_app(self, app):
+        """Configure from the Flask app config and serve firebase_db reads when enabled"""
+        self.enabled = app.config.get('FIRESTORE_MIRROR', self.enabled)
+        self.max_docs = app.config.get('FIRESTORE_MIRROR_MAX_DOCS', self.max_docs)
+        self.max_staleness = app.config.get('FIRESTORE_MIRROR_MAX_STALENESS', self.max_staleness)
+        self.retry_after = app.config.get('FIRESTORE_MIRROR_RETRY', self.retry_after)
+        views = app.config.get('FIRESTORE_MIRROR_VIEWS')
+        if views:
+            self.views = [view.strip() for view in views.split(',') if view.strip() in MIRROR_VIEWS]
+        app.extensions['firestore_mirror'] = self
+        from firebase_config import firebase_db
+        firebase_db.mirror = self if self.enabled else None
+
+    def _client(self):
+        if self.client_factory is not None:
+            return self.client_factory()
+        from firebase_config import firebase_db
+        return firebase_db.db
+
+    # ----- Listeners -----
+
+    def start(self):
+        """Subscribe every view in this process (no-op if already done here)"""
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Process con sau fork không có thread listener của process cha
+            self._pid = os.getpid()
+            # synced: đã có dữ liệu; live: listener hiện tại đã gửi snapshot đầu tiên
+            self._state = {view: {'watch': None, 'docs': {}, 'order': [], 'synced': False, 'live': False,
+                                  'complete': False, 'alive_at': 0.0, 'attempt_at': float('-inf'),
+                                  'subscribing': False}
+                           for view in self.views}
+        for view in self.views:
+            self._resubscribe(view)
+
+    def _resubscribe(self, view: str):
+        """Start a subscription in the background (at most every retry_after seconds)"""
+        with self._lock:
+            state = self._state[view]
+            if state['subscribing'] or time.monotonic() - state['attempt_at'] < self.retry_after:
+                return
+            state['attempt_at'], state['subscribing'] = time.monotonic(), True
+        # Tạo listener có thể chờ khởi tạo SDK/kết nối: không chặn request
+        threading.Thread(target=self._subscribe, args=(view,), name=f'mirror-{view}', daemon=True).start()
+
+    def _subscribe(self, view: str):
+        state = self._state[view]
+        try:
+            client = self._client()
+            if client is None:
+                return
+            with self._lock:
+                old = state['watch']
+            if old is not None:
+                try:
+                    old.unsubscribe()
+                except Exception:
+                    pass
+            token = object()  # snapshot của listener cũ bị bỏ qua
+            with self._lock:
+                # Dữ liệu cũ vẫn được dùng (trong max_staleness) tới snapshot đầu của listener mới
+                state.update(token=token, live=False)
+            query = client.collection(MIRROR_VIEWS[view]).order_by('created_at', direction=DESCENDING).limit(self.max_docs)
+            watch = query.on_snapshot(lambda docs, changes, read_time: self._on_snapshot(view, token, docs, changes))
+            with self._lock:
+                state['watch'] = watch
+            self.metrics['subscribes'] += 1
+            print(f"🪞 Firestore mirror listening to '{MIRROR_VIEWS[view]}'")
+        except Exception as e:
+            self.metrics['errors'] += 1
+            print(f"❌ Error subscribing Firestore mirror '{view}': {e}")
+        finally:
+            with self._lock:
+                state['subscribing'] = False
+
+    def _on_snapshot(self, view: str, token, docs, changes):
+        """Apply one listener snapshot (called on the listener's thread)"""
+        updates = {}
+        for change in changes:
+            if change.type.name == 'REMOVED':
+                updates[change.document.id] = None
+            else:
+                data = change.document.to_dict() or {}
+                data['id'] = change.document.id
+                updates[change.document.id] = data
+        order = [doc.id for doc in docs]
+        with self._lock:
+            state = self._state.get(view)
+            if state is None or state.get('token') is not token:
+                return  # listener cũ, hoặc đã stop()
+            current = state['docs']
+            for document_id, data in updates.items():
+                if data is None:
+                    current.pop(document_id, None)
+                else:
+                    current[document_id] = data
+            if len(current) != len(order):
+                state['docs'] = current = {document_id: current[document_id] for document_id in order
+                                           if document_id in current}
+            state.update(order=order, synced=True, live=True, complete=len(order) < self.max_docs,
+                         alive_at=time.monotonic())
+        self.metrics['snapshots'] += 1
+        self.metrics['changes'] += len(changes)
+
+    # ----- Reads -----
+
+    def _lookup(self, view: str, need_all: bool, build):
+        """build(state) if the view can answer (fresh, and complete when need_all), else None"""
+        if not self.enabled or view not in self.views:
+            return None
+        self.start()
+        now = time.monotonic()
+        with self._lock:
+            state = self._state[view]
+            watch = state['watch']
+            if watch is not None and getattr(watch, 'is_active', True) and state['live']:
+                state['alive_at'] = now
+            reason, result = None, None
+            if not state['synced']:
+                reason = 'not_synced'
+            elif now - state['alive_at'] > self.max_staleness:
+                reason = 'stale'
+            elif need_all and not state['complete']:
+                reason = 'truncated'
+            else:
+                result = build(state)
+        if watch is None or not getattr(watch, 'is_active', True):
+            self._resubscribe(view)  # listener mất kết nối: đăng ký lại ở nền
+        if reason is not None:
+            self.metrics[f'fallback_{reason}'] += 1
+            return None
+        self.metrics['hits'] += 1
+        return result
+
+    def read(self, view: str, limit: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """Newest-first documents of a view (all, or the first ``limit``), or None to query directly"""
+        return self._lookup(view, limit is None, lambda state: [
+            dict(state['docs'][document_id]) for document_id in state['order'][:limit]
+            if document_id in state['docs']])
+
+    def count(self, view: str) -> Optional[int]:
+        """Number of documents in the mirrored collection, or None to query directly"""
+        return self._lookup(view, True, lambda state: len(state['order']))
+
+    def stop(self):
+        """Unsubscribe every listener of this process"""
+        with self._lock:
+            watches = [state['watch'] for state in self._state.values() if state['watch'] is not None]
+            self._state, self._pid = {}, None
+        for watch in watches:
+            try:
+                watch.unsubscribe()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            views = {view: {'docs': len(state['order']), 'synced': state['synced'], 'complete': state['complete'],
+                            'listening': state['watch'] is not None and getattr(state['watch'], 'is_active', True),
+                            'age': round(now - state['alive_at'], 1) if state['synced'] else None}
+                     for view, state in self._state.items()}
+        return dict(self.metrics, enabled=self.enabled, max_docs=self.max_docs,
+                    max_staleness=self.max_staleness, views=views)
+
+
+# Global Firestore mirror (bật bằng FIRESTORE_MIRROR=true)
+firestore_mirror = FirestoreMirror()
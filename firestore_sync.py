@@ -0,0 +1,337 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, literal, or_, select, update
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Aware UTC datetime (SQL stores naive UTC, Firestore returns aware)"""
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _naive(value: Optional[datetime]) -> Optional[datetime]:
+    return _utc(value).replace(tzinfo=None) if value is not None else None
+
+
+def _same(left: Any, right: Any) -> bool:
+    if isinstance(left, datetime) or isinstance(right, datetime):
+        # Firestore giữ tới microsecond
+        return left is not None and right is not None and _utc(left) == _utc(right)
+    if left in (None, '') and right in (None, ''):
+        return True
+    return left == right
+
+
+def _coerce(column, value: Any) -> Any:
+    """A Firestore value converted to the SQL column's type; ValueError when it does not fit"""
+    python_type = column.type.python_type
+    if value is None or (value == '' and python_type is not str):
+        if not column.nullable:
+            raise ValueError(f"{column.name}: value required")
+        return None
+    if isinstance(value, bool) and python_type is not bool:
+        raise ValueError(f"{column.name}: {value!r} is not {python_type.__name__}")
+    try:
+        if python_type is int:
+            if isinstance(value, float) and not value.is_integer():
+                raise ValueError
+            value = int(value)
+            if not -2 ** 31 <= value < 2 ** 31:  # INTEGER của Postgres
+                raise ValueError
+        elif python_type is float:
+            value = float(value)
+            if value != value or value in (float('inf'), float('-inf')):
+                raise ValueError
+        elif python_type is str:
+            length = getattr(column.type, 'length', None)
+            if not isinstance(value, str) or (length and len(value) > length):
+                raise ValueError
+    except (TypeError, ValueError):
+        raise ValueError(f"{column.name}: {value!r} does not fit {column.type}")
+    return value
+
+
+def _edited_in_firestore(data: Dict[str, Any], sql_at: Optional[datetime]) -> bool:
+    """Doc changed after our last write: newer than SQL and than its own last_sync"""
+    updated_at, last_sync = data.get('updated_at'), data.get('last_sync')
+    if not isinstance(updated_at, datetime):
+        return False
+    if sql_at is not None and _utc(updated_at) <= _utc(sql_at):
+        return False
+    # save_*/sync luôn ghi last_sync >= updated_at; bản sửa trực tiếp trên Firestore thì không
+    return not isinstance(last_sync, datetime) or _utc(updated_at) > _utc(last_sync)
+
+
+class SyncTarget:
+    """How one SQL model maps onto one Firestore collection"""
+
+    def __init__(self, name: str, collection: str, model_name: str, fields: List[str],
+                 pull_fields: Optional[List[str]] = None):
+        self.name = name
+        self.collection = collection
+        self.model_name = model_name
+        self.fields = fields  # SQL -> Firestore
+        self.pull_fields = pull_fields or []  # Firestore -> SQL khi bản Firestore mới hơn
+
+    @property
+    def model(self):
+        import models
+        return getattr(models, self.model_name)
+
+    def to_document(self, row) -> Dict[str, Any]:
+        document = {field: getattr(row, field) for field in self.fields}
+        document.update(id=row.id, created_at=row.created_at, updated_at=row.updated_at or row.created_at)
+        return document
+
+
+SYNC_TARGETS = {
+    'users': SyncTarget('users', 'người dùng', 'User',
+                        ['email', 'display_name', 'gender', 'age', 'height', 'weight', 'medical_history',
+                         'is_admin', 'is_active'],
+                        # Không bao giờ lấy email/is_admin/is_active từ Firestore
+                        pull_fields=['display_name', 'gender', 'age', 'height', 'weight', 'medical_history']),
+    'assessments': SyncTarget('assessments', 'đánh giá', 'Assessment',
+                              ['user_id', 'symptoms', 'age_at_assessment', 'days_sick', 'priority', 'message',
+                               'description', 'recommendations']),
+    'contacts': SyncTarget('contacts', 'liên hệ', 'Contact',
+                           ['name', 'email', 'subject', 'message', 'status'],
+                           pull_fields=['status']),
+}
+
+
+class FirestoreSync:
+    """Incremental SQL <-> Firestore reconciliation.
+
+    Each run walks only what changed since the last checkpoint, in batches:
+
+    * pull: Firestore docs with ``updated_at`` past the pull watermark
+      (paged query). Where a doc was edited outside the app (``updated_at``
+      after both its SQL row and its ``last_sync``), its ``pull_fields`` are
+      copied into SQL (last writer wins), converted to the column types; a
+      doc whose values do not fit is counted as invalid and skipped, not
+      retried forever. Docs with no SQL
+      row are counted as orphans, or deleted when ``prune`` is set.
+      Collections without pull fields are only scanned when pruning.
+    * push: SQL rows with ``(updated_at, id)`` past the push watermark
+      (keyset pagination). The matching docs are fetched with one
+      ``get_all`` per batch, and only missing or different docs are written,
+      in batched writes.
+
+    The watermarks are stored in ``sync_checkpoints`` after each batch, so an
+    interrupted run resumes where it stopped. Each run re-reads ``overlap``
+    seconds before the watermark so rows committed late are not missed;
+    re-processing is harmless because unchanged docs are not written.
+    """
+
+    def __init__(self, batch_size: int = 200, overlap: float = 5.0):
+        self.batch_size = batch_size
+        self.overlap = overlap
+        self.last_run: Dict[str, Any] = {}
+
+    def init_app(self, app):
+        """Configure from the Flask app config"""
+        self.batch_size = min(app.config.get('SYNC_BATCH_SIZE', self.batch_size), 500)  # giới hạn batch Firestore
+        self.overlap = app.config.get('SYNC_OVERLAP_SECONDS', self.overlap)
+        app.extensions['firestore_sync'] = self
+
+    # ----- Checkpoints -----
+
+    def _checkpoint(self, key: str, full: bool):
+        from models import db, SyncCheckpoint
+        checkpoint = db.session.get(SyncCheckpoint, key)
+        if checkpoint is None:
+            checkpoint = SyncCheckpoint(key=key, processed=0, written=0)
+            db.session.add(checkpoint)
+        if full:
+            checkpoint.watermark_at, checkpoint.watermark_id = None, None
+        return checkpoint
+
+    def _start(self, checkpoint) -> datetime:
+        if checkpoint.watermark_at is None:
+            return EPOCH
+        return checkpoint.watermark_at - timedelta(seconds=self.overlap)
+
+    # ----- Firestore -> SQL -----
+
+    def _pull(self, client, target: SyncTarget, full: bool, prune: bool, stats: Dict[str, int]):
+        from models import db
+        from user_cache import user_cache
+
+        model = target.model
+        checkpoint = self._checkpoint(f'pull:{target.name}', full)
+        query = (client.collection(target.collection)
+                 .where('updated_at', '>', _utc(self._start(checkpoint)))
+                 .order_by('updated_at').limit(self.batch_size))
+        last = None
+        while True:
+            page = list((query.start_after(last) if last is not None else query).stream())
+            if not page:
+                break
+            last = page[-1]
+
+            ids = [int(doc.id) for doc in page if doc.id.isdigit()]
+            rows = {row.id: row for row in db.session.execute(
+                select(model.id, model.updated_at, model.created_at, *[getattr(model, f) for f in target.pull_fields])
+                .where(model.id.in_(ids)))}
+            orphans = []
+            for doc in page:
+                data = doc.to_dict()
+                row = rows.get(int(doc.id)) if doc.id.isdigit() else None
+                if row is None:
+                    orphans.append(doc.reference)
+                    continue
+                if not target.pull_fields or not _edited_in_firestore(data, row.updated_at or row.created_at):
+                    continue
+                try:
+                    values = {field: _coerce(model.__table__.c[field], data[field])
+                              for field in target.pull_fields if field in data}
+                except ValueError as e:
+                    stats['invalid'] += 1
+                    print(f"⚠️  Sync {target.name}: skipped document {doc.id} ({e})")
+                    continue
+                changes = {field: value for field, value in values.items() if not _same(value, getattr(row, field))}
+                if changes:
+                    db.session.execute(update(model).where(model.id == row.id)
+                                       .values(updated_at=_naive(data['updated_at']), **changes))
+                    stats['pulled'] += 1
+                    if target.name == 'users':
+                        user_cache.invalidate(row.id)
+
+            stats['orphans'] += len(orphans)
+            if prune and orphans:
+                batch = client.batch()
+                for reference in orphans:
+                    batch.delete(reference)
+                batch.commit()
+                stats['deleted'] += len(orphans)
+
+            stats['read'] += len(page)
+            checkpoint.watermark_at, checkpoint.watermark_id = _naive(last.to_dict()['updated_at']), last.id
+            checkpoint.processed += len(page)
+            db.session.commit()
+            if len(page) < self.batch_size:
+                break
+
+    def _skip_own_writes(self, target: SyncTarget, pull_started: datetime):
+        """Move the pull watermark past docs this run pushed (they carry SQL updated_at)"""
+        from models import db
+        checkpoint = self._checkpoint(f'pull:{target.name}', False)
+        # Mọi doc sửa trước pull_started đã được lần pull này đọc; overlap bù lệch đồng hồ
+        if checkpoint.watermark_at is None or checkpoint.watermark_at < pull_started:
+            checkpoint.watermark_at, checkpoint.watermark_id = pull_started, None
+            db.session.commit()
+
+    # ----- SQL -> Firestore -----
+
+    def _push(self, client, target: SyncTarget, full: bool, stats: Dict[str, int],
+              progress: Optional[Callable[[int], None]] = None):
+        from models import db
+
+        model = target.model
+        checkpoint = self._checkpoint(f'push:{target.name}', full)
+        changed_at = func.coalesce(model.updated_at, model.created_at, literal(EPOCH))
+        cursor_at, cursor_id = self._start(checkpoint), 0
+        collection = client.collection(target.collection)
+
+        while True:
+            rows = db.session.execute(
+                select(model, changed_at.label('changed_at'))
+                .where(or_(changed_at > cursor_at, and_(changed_at == cursor_at, model.id > cursor_id)))
+                .order_by(changed_at, model.id).limit(self.batch_size)
+            ).all()
+            if not rows:
+                break
+
+            references = [collection.document(str(row.id)) for row, _ in rows]
+            snapshots = {snapshot.id: snapshot for snapshot in client.get_all(references)}
+            batch, writes = client.batch(), 0
+            for (row, _), reference in zip(rows, references):
+                document = target.to_document(row)
+                snapshot = snapshots.get(reference.id)
+                current = snapshot.to_dict() if snapshot is not None and snapshot.exists else None
+                if current is not None:
+                    if all(_same(current.get(field), value) for field, value in document.items()):
+                        continue
+                    newer = _edited_in_firestore(current, document['updated_at'])
+                    if newer and not all(_same(current.get(field), document[field]) for field in target.pull_fields):
+                        stats['conflicts'] += 1  # sửa trên Firestore chưa pull về: lần pull sau xử lý
+                        continue
+                batch.set(reference, dict(document, last_sync=datetime.utcnow()), merge=True)
+                writes += 1
+            if writes:
+                batch.commit()
+
+            cursor_at, cursor_id = rows[-1].changed_at, rows[-1][0].id
+            stats['read'] += len(rows)
+            stats['written'] += writes
+            checkpoint.watermark_at, checkpoint.watermark_id = cursor_at, str(cursor_id)
+            checkpoint.processed += len(rows)
+            checkpoint.written += writes
+            db.session.commit()
+            if progress:
+                progress(len(rows))
+            if len(rows) < self.batch_size:
+                break
+
+    def run(self, collections: Optional[List[str]] = None, full: bool = False, prune: bool = False,
+            client=None, progress: Optional[Callable[[float, str], None]] = None) -> Dict[str, Any]:
+        """Reconcile the given collections (default: all); ``full`` ignores the checkpoints"""
+        from models import db
+        if client is None:
+            from firebase_config import firebase_db
+            client = firebase_db.db
+        if client is None:
+            raise RuntimeError('Firestore is not configured')
+
+        names = collections or list(SYNC_TARGETS)
+        unknown = [name for name in names if name not in SYNC_TARGETS]
+        if unknown:
+            raise ValueError(f"Unknown collections: {', '.join(unknown)}")
+
+        started = time.perf_counter()
+        report = {}
+        for index, name in enumerate(names):
+            target = SYNC_TARGETS[name]
+            stats = {'read': 0, 'written': 0, 'pulled': 0, 'conflicts': 0, 'orphans': 0, 'deleted': 0,
+                     'invalid': 0}
+            try:
+                pull_started = datetime.utcnow()
+                if target.pull_fields or prune:
+                    self._pull(client, target, full, prune, stats)
+                done = [0]
+
+                def pushed(count, index=index, name=name, done=done):
+                    done[0] += count
+                    if progress:
+                        progress((index + 0.5) / len(names), f'{name}: {done[0]} bản ghi đã đối chiếu')
+
+                self._push(client, target, full, stats, progress=pushed)
+                if target.pull_fields or prune:
+                    self._skip_own_writes(target, pull_started)
+            except Exception:
+                db.session.rollback()
+                raise
+            report[name] = stats
+            print(f"🔄 Sync {name}: {stats}")
+            if progress:
+                progress((index + 1) / len(names), f'{name}: xong')
+
+        self.last_run = {'finished_at': datetime.utcnow().isoformat(), 'full': full,
+                         'seconds': round(time.perf_counter() - started, 2), 'collections': report}
+        return self.last_run
+
+    def stats(self) -> Dict[str, Any]:
+        from models import db, SyncCheckpoint
+        checkpoints = {item.key: {'watermark_at': item.watermark_at.isoformat() if item.watermark_at else None,
+                                  'processed': item.processed, 'written': item.written}
+                       for item in db.session.scalars(select(SyncCheckpoint))}
+        return {'checkpoints': checkpoints, 'last_run': self.last_run}
+
+
+# Global Firestore reconciliation instance
+firestore_sync = FirestoreSync()
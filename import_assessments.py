@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Bulk import triage records into the assessments table
+Nhập hàng loạt dữ liệu đánh giá từ hệ thống khác (CSV hoặc JSONL, có thể .gz):
+đọc dạng stream, kiểm tra từng dòng, ghi theo lô (executemany) trong transaction,
+lưu checkpoint cùng transaction để chạy lại sẽ tiếp tục từ lô cuối đã commit.
+
+Cột/trường: user_id hoặc user_email, symptoms, age_at_assessment (hoặc age),
+days_sick, priority, message, description, recommendations, created_at (ISO 8601)
+
+Usage:
+    python import_assessments.py records.csv
+    python import_assessments.py records.jsonl.gz --ai missing --batch-size 2000
+    python import_assessments.py records.csv --restart     # bỏ checkpoint, nhập lại từ đầu
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+PRIORITIES = {'emergency', 'high', 'consult_doctor', 'home_care', 'self_care', 'normal'}
+MAX_AGE = 130
+MAX_DAYS_SICK = 3650
+
+
+class RecordError(ValueError):
+    """A source record that cannot be imported"""
+
+
+def open_input(path: str):
+    """Text stream for a (possibly gzipped) input file"""
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding='utf-8-sig', newline='')
+    return open(path, 'r', encoding='utf-8-sig', newline='')
+
+
+def detect_format(path: str) -> str:
+    name = path[:-3] if path.endswith('.gz') else path
+    return 'jsonl' if name.endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def iter_records(stream, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """(position, record) pairs; record is a RecordError for unparsable lines"""
+    if fmt == 'csv':
+        for position, record in enumerate(csv.DictReader(stream), start=1):
+            yield position, record
+        return
+    position = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        position += 1
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError('không phải object')
+            yield position, record
+        except ValueError as e:
+            yield position, RecordError(f'JSON không hợp lệ: {e}')
+
+
+def _int(record: Dict[str, Any], *names: str, low: int, high: int, required: bool = True) -> Optional[int]:
+    for name in names:
+        value = record.get(name)
+        if value not in (None, ''):
+            try:
+                number = int(float(value))
+            except (TypeError, ValueError):
+                raise RecordError(f"'{name}' không phải số: {value!r}")
+            if not low <= number <= high:
+                raise RecordError(f"'{name}' ngoài khoảng {low}-{high}: {number}")
+            return number
+    if required:
+        raise RecordError(f"thiếu '{names[0]}'")
+    return None
+
+
+def _text(record: Dict[str, Any], name: str, max_length: Optional[int] = None) -> Optional[str]:
+    value = record.get(name)
+    if value in (None, ''):
+        return None
+    if isinstance(value, list):
+        value = ', '.join(str(item) for item in value)
+    value = str(value).strip()
+    if max_length and len(value) > max_length:
+        raise RecordError(f"'{name}' dài quá {max_length} ký tự")
+    return value
+
+
+def validate(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize one source record into an assessments row (user still unresolved)"""
+    symptoms = _text(record, 'symptoms')
+    if not symptoms:
+        raise RecordError("thiếu 'symptoms'")
+
+    row = {
+        'user_id': _int(record, 'user_id', low=1, high=2 ** 31, required=False),
+        'user_email': (_text(record, 'user_email') or '').lower() or None,
+        'symptoms': symptoms,
+        'age_at_assessment': _int(record, 'age_at_assessment', 'age', low=0, high=MAX_AGE),
+        'days_sick': _int(record, 'days_sick', low=0, high=MAX_DAYS_SICK),
+        'priority': _text(record, 'priority'),
+        'message': _text(record, 'message', max_length=255),
+        'description': _text(record, 'description'),
+        'recommendations': record.get('recommendations'),
+    }
+    if row['user_id'] is None and row['user_email'] is None:
+        raise RecordError("thiếu 'user_id' hoặc 'user_email'")
+    if row['priority'] is not None and row['priority'] not in PRIORITIES:
+        raise RecordError(f"priority không hợp lệ: {row['priority']!r}")
+
+    recommendations = row['recommendations']
+    if isinstance(recommendations, list):
+        row['recommendations'] = json.dumps(recommendations, ensure_ascii=False)
+    elif recommendations in (None, ''):
+        row['recommendations'] = None
+
+    # Luôn có khóa created_at: executemany lấy danh sách cột từ dòng đầu tiên của chunk
+    created_at = _text(record, 'created_at')
+    if created_at:
+        try:
+            row['created_at'] = datetime.fromisoformat(created_at.replace('Z', '+00:00')).replace(tzinfo=None)
+        except ValueError:
+            raise RecordError(f"created_at không hợp lệ: {created_at!r}")
+    else:
+        row['created_at'] = datetime.utcnow()
+    return row
+
+
+class AssessmentImporter:
+    """Chunked, checkpointed import of validated rows into assessments"""
+
+    def __init__(self, key: str, batch_size: int = 1000, ai_mode: str = 'missing', rejects=None):
+        self.key = key
+        self.batch_size = batch_size
+        self.ai_mode = ai_mode
+        self.rejects = rejects
+        self.email_to_id: Dict[str, int] = {}
+        self.known_ids = set()
+        self.position = self.inserted = self.rejected = 0
+        self._pending_rejects: List[str] = []
+        self._ai = None
+
+    def _reject(self, position: int, error: Exception, record: Any = None):
+        # Ghi ra file cùng lúc với checkpoint (flush): --resume không ghi trùng
+        self.rejected += 1
+        self._pending_rejects.append(json.dumps({'position': position, 'error': str(error), 'record': record},
+                                                ensure_ascii=False, default=str) + '\n')
+
+    def load_checkpoint(self, restart: bool = False) -> int:
+        from models import db, ImportCheckpoint
+        checkpoint = db.session.get(ImportCheckpoint, self.key)
+        if checkpoint and restart:
+            db.session.delete(checkpoint)
+            db.session.commit()
+            checkpoint = None
+        if checkpoint:
+            self.position, self.inserted, self.rejected = checkpoint.position, checkpoint.inserted, checkpoint.rejected
+        return self.position
+
+    def _resolve_users(self, rows: List[Tuple[int, Dict[str, Any]]]):
+        from models import db, User
+        emails = {row['user_email'] for _, row in rows if row['user_email'] and row['user_email'] not in self.email_to_id}
+        ids = {row['user_id'] for _, row in rows if row['user_id'] and row['user_id'] not in self.known_ids}
+        if emails:
+            for user_id, email in db.session.execute(db.select(User.id, User.email).where(User.email.in_(emails))):
+                self.email_to_id[email.lower()] = user_id
+                self.known_ids.add(user_id)
+        if ids:
+            self.known_ids.update(db.session.scalars(db.select(User.id).where(User.id.in_(ids))))
+
+    def _fill_with_ai(self, rows: List[Dict[str, Any]]):
+        """Run the model once per chunk for rows that need priority/message"""
+        if self.ai_mode == 'off':
+            return
+        targets = [row for row in rows if self.ai_mode == 'all' or not row['priority'] or not row['message']]
+        if not targets:
+            return
+        if self._ai is None:
+            from ai_diagnosis import get_ai_diagnosis
+            self._ai = get_ai_diagnosis() or False
+        if not self._ai:
+            return
+
+        cases = [([s.strip() for s in row['symptoms'].split(',') if s.strip()], row['age_at_assessment'],
+                  row['days_sick']) for row in targets]
+        for row, result in zip(targets, self._ai.predict_batch(cases)):
+            row['priority'] = result['priority']
+            row['message'] = f"AI chẩn đoán: {result['disease']} (Độ tin cậy: {result['confidence']}%)"[:255]
+            row['description'] = row['description'] or result['description']
+            row['recommendations'] = row['recommendations'] or json.dumps(result['recommendations'], ensure_ascii=False)
+
+    def flush(self, chunk: List[Tuple[int, Dict[str, Any]]], position: int):
+        """Insert one chunk and advance the checkpoint in a single transaction"""
+        from models import db, Assessment, ImportCheckpoint
+
+        self._resolve_users(chunk)
+        rows = []
+        for record_position, row in chunk:
+            user_id = self.email_to_id.get(row['user_email']) if row['user_email'] else row['user_id']
+            if not user_id or user_id not in self.known_ids:
+                self._reject(record_position, RecordError('không tìm thấy người dùng'), row)
+                continue
+            row = dict(row, user_id=user_id)
+            row.pop('user_email')
+            rows.append((record_position, row))
+
+        self._fill_with_ai([row for _, row in rows])
+        valid = []
+        for record_position, row in rows:
+            if not row['priority'] or not row['message']:
+                self._reject(record_position, RecordError('thiếu priority/message (bật --ai để tự điền)'), row)
+                continue
+            row['description'] = row['description'] or row['message']
+            valid.append(row)
+
+        try:
+            if valid:
+                db.session.execute(db.insert(Assessment.__table__), valid)
+            inserted = self.inserted + len(valid)
+            db.session.merge(ImportCheckpoint(key=self.key, position=position,
+                                              inserted=inserted, rejected=self.rejected))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            self.rejected -= len(self._pending_rejects)
+            self._pending_rejects = []
+            raise
+        self.position, self.inserted = position, inserted
+        if self.rejects is not None and self._pending_rejects:
+            self.rejects.writelines(self._pending_rejects)
+            self.rejects.flush()
+        self._pending_rejects = []
+        return len(valid)
+
+    def run(self, records: Iterator[Tuple[int, Any]], report_every: float = 5.0):
+        start = last_report = time.perf_counter()
+        resumed_from, session_inserted = self.position, 0
+        chunk: List[Tuple[int, Dict[str, Any]]] = []
+        position = self.position
+
+        for position, record in records:
+            if position <= resumed_from:
+                continue
+            try:
+                if isinstance(record, RecordError):
+                    raise record
+                chunk.append((position, validate(record)))
+            except RecordError as e:
+                self._reject(position, e, record if isinstance(record, dict) else None)
+
+            if len(chunk) >= self.batch_size:
+                session_inserted += self.flush(chunk, position)
+                chunk = []
+                now = time.perf_counter()
+                if now - last_report >= report_every:
+                    print(f"📥 {position} records, {self.inserted} inserted, {self.rejected} rejected "
+                          f"({session_inserted / (now - start):.0f} rows/s)")
+                    last_report = now
+
+        if position > self.position:
+            session_inserted += self.flush(chunk, position)
+
+        elapsed = time.perf_counter() - start
+        print(f"✅ Import '{self.key}' done: {self.inserted} inserted, {self.rejected} rejected, "
+              f"{session_inserted} rows in {elapsed:.1f}s ({session_inserted / elapsed if elapsed else 0:.0f} rows/s)")
+        if resumed_from:
+            print(f"   (resumed after record {resumed_from})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help='CSV / JSONL file (optionally .gz)')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='default: from the file extension')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--ai', choices=['missing', 'all', 'off'], default='missing',
+                        help='fill priority/message with the AI model (default: only when missing)')
+    parser.add_argument('--key', help='checkpoint name (default: input file name)')
+    parser.add_argument('--restart', action='store_true', help='ignore the saved checkpoint')
+    parser.add_argument('--rejects', help='rejected records, JSONL (default: <input>.rejects.jsonl)')
+    args = parser.parse_args()
+
+    from app import create_app
+    app = create_app(os.getenv('FLASK_ENV', 'development'))
+
+    key = args.key or os.path.basename(args.input)
+    rejects_path = args.rejects or f"{args.input}.rejects.jsonl"
+    with app.app_context(), open_input(args.input) as stream:
+        from models import db
+        db.engine.echo = False  # không log từng câu INSERT
+        importer = AssessmentImporter(key, batch_size=args.batch_size, ai_mode=args.ai)
+        resumed = importer.load_checkpoint(restart=args.restart)
+        if resumed:
+            print(f"↩️  Resuming '{key}' after record {resumed}")
+        # Chạy lại từ đầu: file rejects cũ không còn khớp checkpoint
+        rejects = open(rejects_path, 'a' if resumed else 'w', encoding='utf-8')
+        importer.rejects = rejects
+        try:
+            importer.run(iter_records(stream, args.format or detect_format(args.input)))
+        except Exception as e:
+            print(f"❌ Import failed after record {importer.position}: {e}")
+            print("   Chạy lại cùng lệnh để tiếp tục từ checkpoint.")
+            sys.exit(1)
+        finally:
+            rejects.close()
+    if importer.rejected:
+        print(f"⚠️  Rejected records: {rejects_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,416 @@
+import inspect
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import select, update
+
+
+class JobContext:
+    """Handed to a job handler: progress reporting for the running job"""
+
+    def __init__(self, queue: 'JobQueue', job_id: int, attempt: int):
+        self.queue = queue
+        self.job_id = job_id
+        self.attempt = attempt
+        self._reported_at = 0.0
+
+    def progress(self, fraction: float, message: Optional[str] = None, force: bool = False):
+        """Record progress (0..1); written at most every progress_interval seconds"""
+        now = time.monotonic()
+        if not force and now - self._reported_at < self.queue.progress_interval:
+            return
+        self._reported_at = now
+        self.queue._update(self.job_id, owned=True, progress=max(0.0, min(1.0, fraction)),
+                           message=message[:255] if message else None)
+
+
+class JobQueue:
+    """Database-backed job queue with in-process worker threads.
+
+    Jobs live in the ``jobs`` table, so every gunicorn worker can enqueue,
+    report and run them; a job is claimed with a compare-and-set UPDATE on
+    its status, so only one worker runs it. Failed jobs are retried with
+    exponential backoff up to ``max_attempts``. While a handler runs, its
+    worker refreshes the job's ``updated_at`` every ``heartbeat_interval``;
+    a 'running' job without a heartbeat for ``stale_after`` seconds (its
+    process died) is re-queued, or failed once its attempts are used up
+    (checked at most every ``stale_after / 4`` seconds per process).
+    Updates from the running worker only apply while it still holds the job
+    (``locked_by``). Worker threads start in each web process on its first
+    request (or ``start()``), never at import time or in CLI scripts.
+    """
+
+    def __init__(self, workers: int = 2, poll_interval: float = 2.0, max_attempts: int = 3,
+                 retry_delay: float = 10.0, stale_after: float = 600.0, heartbeat_interval: float = 30.0):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.stale_after = stale_after
+        self.heartbeat_interval = heartbeat_interval
+        self.progress_interval = 0.5
+        self.handlers: Dict[str, Callable] = {}
+        self.validators: Dict[str, Callable] = {}
+        self.app = None
+        self._pid = None  # process đã khởi động worker threads
+        self._threads = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._stale_checked_at = float('-inf')
+        self.metrics = {'succeeded': 0, 'failed': 0, 'retried': 0, 'requeued_stale': 0, 'failed_stale': 0,
+                        'lost': 0}
+
+    @property
+    def worker_id(self) -> str:
+        # Theo pid hiện tại: các worker gunicorn fork từ master (--preload) không dùng chung id
+        return f'{socket.gethostname()}:{os.getpid()}'
+
+    def init_app(self, app):
+        """Configure from the Flask app config"""
+        self.app = app
+        self.workers = app.config.get('JOB_WORKERS', self.workers)
+        self.poll_interval = app.config.get('JOB_POLL_INTERVAL', self.poll_interval)
+        self.max_attempts = app.config.get('JOB_MAX_ATTEMPTS', self.max_attempts)
+        self.retry_delay = app.config.get('JOB_RETRY_DELAY', self.retry_delay)
+        self.stale_after = app.config.get('JOB_STALE_AFTER', self.stale_after)
+        self.heartbeat_interval = app.config.get('JOB_HEARTBEAT_INTERVAL', self.heartbeat_interval)
+
+        @app.before_request
+        def _start_job_workers():
+            # Mỗi process web (kể cả sau fork) khởi động worker ở request đầu tiên
+            if self._pid != os.getpid():
+                self.start()
+
+        app.extensions['jobs'] = self
+
+    def register(self, kind: str, validate: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """Decorator: ``@job_queue.register('kind')`` def handler(ctx, **payload) -> dict
+
+        ``validate(payload)`` runs at enqueue time and raises ValueError for a
+        payload the handler would reject, so it is refused instead of failing
+        every attempt later.
+        """
+        def decorator(func):
+            self.handlers[kind] = func
+            if validate is not None:
+                self.validators[kind] = validate
+            return func
+        return decorator
+
+    def validate(self, kind: str, payload: Dict[str, Any]):
+        """Raise ValueError when payload does not fit the handler of kind"""
+        handler = self.handlers.get(kind)
+        if handler is None:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        try:
+            inspect.signature(handler).bind(None, **payload)
+        except TypeError as e:
+            raise ValueError(f"Invalid payload for '{kind}': {e}")
+        validator = self.validators.get(kind)
+        if validator is not None:
+            validator(payload)
+
+    # ----- Enqueue / query -----
+
+    def enqueue(self, kind: str, payload: Optional[Dict[str, Any]] = None, created_by: Optional[int] = None,
+                max_attempts: Optional[int] = None) -> int:
+        """Persist a job and wake a worker; returns the job id"""
+        from models import db, Job
+        self.validate(kind, payload or {})
+        job = Job(kind=kind, payload=json.dumps(payload or {}), created_by=created_by,
+                  max_attempts=max_attempts or self.max_attempts, run_after=datetime.utcnow())
+        db.session.add(job)
+        db.session.commit()
+        self._wakeup.set()
+        return job.id
+
+    def get(self, job_id: int):
+        from models import db, Job
+        return db.session.get(Job, job_id)
+
+    # ----- Workers -----
+
+    def start(self):
+        """Start the worker threads of this process (idempotent)"""
+        if self.workers <= 0 or self.app is None:
+            return
+        with self._lock:
+            self._pid = os.getpid()
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._worker_loop, name=f'job-worker-{len(self._threads)}',
+                                          daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def shutdown(self, timeout: float = 5.0):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stopping.clear()
+
+    def _worker_loop(self):
+        while not self._stopping.is_set():
+            try:
+                with self.app.app_context():
+                    ran = self.run_next()
+            except Exception as e:
+                print(f"❌ Job worker error: {e}")
+                ran = False
+            if not ran:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def _update(self, job_id: int, owned: bool = False, **values):
+        """Update one job; with owned=True only while this process still runs it"""
+        from models import db, Job
+        table = Job.__table__
+        values['updated_at'] = datetime.utcnow()
+        conditions = [table.c.id == job_id]
+        if owned:
+            conditions += [table.c.status == 'running', table.c.locked_by == self.worker_id]
+        with db.engine.begin() as conn:
+            return conn.execute(update(table).where(*conditions).values(**values)).rowcount
+
+    def _heartbeat(self, app, job_id: int, done: threading.Event):
+        """Keep updated_at of a running job fresh until done is set"""
+        with app.app_context():
+            while not done.wait(self.heartbeat_interval):
+                try:
+                    if not self._update(job_id, owned=True):
+                        return  # job đã bị chuyển cho worker khác
+                except Exception as e:
+                    print(f"❌ Job {job_id} heartbeat error: {e}")
+
+    def _requeue_stale(self):
+        # Tối đa một lần mỗi stale_after/4 cho mỗi process: poll lúc rảnh không mở transaction ghi
+        # (trên SQLite mỗi transaction ghi giữ write lock của cả DB)
+        checked_at = time.monotonic()
+        with self._lock:
+            if checked_at - self._stale_checked_at < self.stale_after / 4:
+                return
+            self._stale_checked_at = checked_at
+        from models import db, Job
+        table = Job.__table__
+        now = datetime.utcnow()
+        stale = [table.c.status == 'running', table.c.updated_at < now - timedelta(seconds=self.stale_after)]
+        with db.engine.connect() as conn:
+            if conn.execute(select(table.c.id).where(*stale).limit(1)).first() is None:
+                return
+        with db.engine.begin() as conn:
+            failed = conn.execute(
+                update(table)
+                .where(*stale, table.c.attempts >= table.c.max_attempts)
+                .values(status='failed', locked_by=None, finished_at=now,
+                        error='Worker stopped responding (no heartbeat); no attempts left')
+            ).rowcount
+            count = conn.execute(
+                update(table)
+                .where(*stale)
+                .values(status='queued', locked_by=None, message='Re-queued: worker stopped responding')
+            ).rowcount
+        self.metrics['failed_stale'] += failed
+        self.metrics['requeued_stale'] += count
+
+    def _claim(self):
+        """Atomically move one due job from 'queued' to 'running'"""
+        from models import db, Job
+        table = Job.__table__
+        now = datetime.utcnow()
+        with db.engine.connect() as conn:
+            candidates = conn.execute(
+                select(table.c.id).where(table.c.status == 'queued', table.c.run_after <= now)
+                .order_by(table.c.run_after, table.c.id).limit(5)
+            ).scalars().all()
+        for job_id in candidates:
+            with db.engine.begin() as conn:
+                claimed = conn.execute(
+                    update(table).where(table.c.id == job_id, table.c.status == 'queued')
+                    .values(status='running', locked_by=self.worker_id, started_at=now, updated_at=now,
+                            attempts=table.c.attempts + 1)
+                ).rowcount
+            if claimed:
+                return db.session.get(Job, job_id)
+        return None
+
+    def run_next(self) -> bool:
+        """Claim and run one job in the current app context; False when idle"""
+        from flask import current_app
+        from models import db
+        self._requeue_stale()
+        job = self._claim()
+        if job is None:
+            return False
+
+        job_id, kind, attempt, max_attempts = job.id, job.kind, job.attempts, job.max_attempts
+        payload = json.loads(job.payload or '{}')
+        db.session.remove()
+        handler = self.handlers.get(kind)
+        done = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(current_app._get_current_object(), job_id, done),
+                         name=f'job-heartbeat-{job_id}', daemon=True).start()
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for job kind '{kind}'")
+            result = handler(JobContext(self, job_id, attempt), **payload)
+        except Exception as e:
+            done.set()
+            db.session.rollback()
+            error = f"{type(e).__name__}: {e}"
+            if attempt < max_attempts:
+                delay = self.retry_delay * 2 ** (attempt - 1)
+                updated = self._update(job_id, owned=True, status='queued', locked_by=None, error=error,
+                                       message=f'Retry {attempt}/{max_attempts - 1} in {delay:.0f}s',
+                                       run_after=datetime.utcnow() + timedelta(seconds=delay))
+                self.metrics['retried'] += bool(updated)
+            else:
+                updated = self._update(job_id, owned=True, status='failed', locked_by=None,
+                                       error=error + '\n' + traceback.format_exc(), finished_at=datetime.utcnow())
+                self.metrics['failed'] += bool(updated)
+            print(f"❌ Job {job_id} ({kind}) attempt {attempt} failed: {error}")
+        else:
+            done.set()
+            updated = self._update(job_id, owned=True, status='succeeded', locked_by=None, progress=1.0, error=None,
+                                   result=json.dumps(result or {}, default=str), finished_at=datetime.utcnow())
+            self.metrics['succeeded'] += bool(updated)
+        finally:
+            done.set()
+            db.session.remove()
+        if not updated:
+            # Đã bị coi là treo và chuyển cho worker khác: không ghi đè trạng thái của lần chạy mới
+            self.metrics['lost'] += 1
+            print(f"⚠️  Job {job_id} ({kind}) was re-queued while running; result of attempt {attempt} dropped")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        from models import db, Job
+        counts = dict(db.session.execute(select(Job.status, db.func.count()).group_by(Job.status)).all())
+        return dict(self.metrics, workers=sum(t.is_alive() for t in self._threads), by_status=counts)
+
+
+# Global job queue instance
+job_queue = JobQueue()
+
+
+# ----- Admin jobs -----
+
+DELETE_BATCH_SIZE = 500
+
+
+def _firestore_deleted(result, what: str):
+    """Raise (so the job is retried) when a configured Firestore did not apply a delete"""
+    from firebase_config import firebase_db
+    if not result and firebase_db.db is not None:
+        raise RuntimeError(f'Firestore: {what} failed')
+
+
+@job_queue.register('delete_user')
+def delete_user_job(ctx: JobContext, user_id: int):
+    """Delete a user with their assessments and health records, in batches"""
+    from models import db, User, Assessment, HealthRecord
+    from firebase_config import firebase_db
+    from user_cache import user_cache
+
+    total = (db.session.query(Assessment).filter_by(user_id=user_id).count()
+             + db.session.query(HealthRecord).filter_by(user_id=user_id).count())
+    done = deleted_assessments = 0
+    for model in (Assessment, HealthRecord):
+        while True:
+            ids = db.session.scalars(select(model.id).where(model.user_id == user_id).limit(DELETE_BATCH_SIZE)).all()
+            if not ids:
+                break
+            if model is Assessment:
+                # Xóa bản Firestore trước: nếu lỗi, hàng SQL còn đó để lần thử lại xóa tiếp
+                _firestore_deleted(firebase_db.delete_documents('đánh giá', ids), f'deleting {len(ids)} assessments')
+                deleted_assessments += len(ids)
+            db.session.execute(model.__table__.delete().where(model.__table__.c.id.in_(ids)))
+            db.session.commit()
+            done += len(ids)
+            ctx.progress(done / max(total, 1) * 0.9, f'Đã xóa {done}/{total} bản ghi')
+
+    _firestore_deleted(firebase_db.delete_user(user_id), f'deleting user {user_id}')
+    user = db.session.get(User, user_id)
+    if user is not None:
+        db.session.delete(user)
+        db.session.commit()
+    user_cache.invalidate(user_id)
+    return {'user_id': user_id, 'assessments': deleted_assessments, 'records_deleted': done}
+
+
+def _validate_bulk_delete(payload: Dict[str, Any]):
+    ids, before, priority = payload.get('ids'), payload.get('before'), payload.get('priority')
+    if not (ids or before or priority):
+        raise ValueError('bulk_delete_assessments needs ids, before or priority')
+    if ids and (not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids)):
+        raise ValueError("'ids' must be a list of integers")
+    if before:
+        if not isinstance(before, str):
+            raise ValueError("'before' must be an ISO date string")
+        datetime.fromisoformat(before)  # ValueError: ngày không hợp lệ
+    if priority and not isinstance(priority, str):
+        raise ValueError("'priority' must be a string")
+
+
+@job_queue.register('bulk_delete_assessments', validate=_validate_bulk_delete)
+def bulk_delete_assessments_job(ctx: JobContext, ids=None, before=None, priority=None):
+    """Delete assessments by id list or by (created before date, priority) filter"""
+    from models import db, Assessment
+    from firebase_config import firebase_db
+
+    conditions = []
+    if ids:
+        conditions.append(Assessment.id.in_(ids))
+    if before:
+        conditions.append(Assessment.created_at < datetime.fromisoformat(before))
+    if priority:
+        conditions.append(Assessment.priority == priority)
+    if not conditions:
+        raise ValueError('bulk_delete_assessments needs ids, before or priority')
+
+    total = db.session.query(Assessment).filter(*conditions).count()
+    deleted = 0
+    while True:
+        batch = db.session.scalars(select(Assessment.id).where(*conditions).limit(DELETE_BATCH_SIZE)).all()
+        if not batch:
+            break
+        _firestore_deleted(firebase_db.delete_documents('đánh giá', batch), f'deleting {len(batch)} assessments')
+        db.session.execute(Assessment.__table__.delete().where(Assessment.__table__.c.id.in_(batch)))
+        db.session.commit()
+        deleted += len(batch)
+        ctx.progress(deleted / max(total, 1), f'Đã xóa {deleted}/{total} đánh giá')
+    return {'deleted': deleted}
+
+
+@job_queue.register('firebase_resync')
+def firebase_resync_job(ctx: JobContext, collections=None, full=False, prune=False):
+    """Reconcile SQL users/assessments/contacts with Firestore (incremental unless full)"""
+    from firestore_sync import firestore_sync
+    return firestore_sync.run(collections=collections, full=full, prune=prune, progress=ctx.progress)
+
+
+@job_queue.register('refresh_stats')
+def refresh_stats_job(ctx: JobContext):
+    """Recompute the dashboard statistics (Firestore counts) and share them with every worker"""
+    from stats_service import dashboard_stats
+    stats = dashboard_stats.refresh()
+    if not stats:
+        raise RuntimeError('Statistics are unavailable (Firestore not configured?)')
+    return {'keys': sorted(stats)}
+
+
+@job_queue.register('ai_retrain')
+def ai_retrain_job(ctx: JobContext):
+    """Retrain the AI model from ai_data, write the model files and swap it in"""
+    from ai_diagnosis import model_holder
+    ctx.progress(0.1, 'Đang train lại model AI')
+    # Các worker khác nhận bản mới khi kiểm tra ai_model.npz (AI_MODEL_CHECK_INTERVAL)
+    return model_holder.reload(retrain=True)
@@ -0,0 +1,111 @@
+import dataclasses
+import decimal
+import json
+import sys
+import uuid
+from datetime import date, datetime, time
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson là tùy chọn, fallback sang json chuẩn
+    orjson = None
+
+
+def _firestore_types():
+    """(GeoPoint, DocumentReference) once the Firestore SDK is loaded, else (None, None)"""
+    # Không import google-cloud-firestore chỉ để isinstance: chưa import thì không thể có object của nó
+    module = sys.modules.get('google.cloud.firestore_v1')
+    if module is None:
+        return None, None
+    return getattr(module, 'GeoPoint', None), getattr(module, 'DocumentReference', None)
+
+
+def _default(o: Any) -> Any:
+    """Types neither encoder handles natively (Firestore, Decimal, numpy...)"""
+    # Gồm cả DatetimeWithNanoseconds của Firestore (lớp con của datetime)
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    GeoPoint, DocumentReference = _firestore_types()
+    if GeoPoint is not None and isinstance(o, GeoPoint):
+        return {'latitude': o.latitude, 'longitude': o.longitude}
+    if DocumentReference is not None and isinstance(o, DocumentReference):
+        return o.path
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    if hasattr(o, 'tolist'):  # numpy array / scalar
+        return o.tolist()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, with a stdlib fallback.
+
+    Both backends produce the same output: ISO 8601 datetimes (instead of
+    Flask's HTTP dates), Decimal/UUID as strings, Firestore GeoPoint and
+    DocumentReference, raw UTF-8 (no \\u escapes for Vietnamese text) and
+    keys in insertion order. ``JSON_BACKEND`` = 'auto' | 'orjson' | 'stdlib'.
+    """
+
+    ensure_ascii = False
+    sort_keys = False
+    default = staticmethod(_default)
+
+    def __init__(self, app):
+        super().__init__(app)
+        backend = app.config.get('JSON_BACKEND', 'auto')
+        if backend == 'orjson' and orjson is None:
+            print("⚠️  JSON_BACKEND=orjson but orjson is not installed, using json")
+        self.backend = 'orjson' if orjson is not None and backend != 'stdlib' else 'json'
+
+    def _orjson_options(self) -> int:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps_bytes(self, obj: Any) -> bytes:
+        """Serialize straight to UTF-8 bytes (response bodies)"""
+        if self.backend == 'orjson':
+            try:
+                return orjson.dumps(obj, default=_default, option=self._orjson_options())
+            except orjson.JSONEncodeError:
+                # vd. số nguyên > 64 bit: để json chuẩn xử lý (không qua self.dumps, sẽ gọi lại orjson)
+                return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return self.dumps(obj).encode('utf-8')
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if self.backend == 'orjson' and not kwargs:
+            return self.dumps_bytes(obj).decode('utf-8')
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        if 'indent' not in kwargs:
+            kwargs.setdefault('separators', (',', ':'))
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if self.backend == 'orjson' and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.backend == 'json':
+            return super().response(obj)
+        body = self.dumps_bytes(obj)
+        if self.compact is False or (self.compact is None and self._app.debug):
+            body += b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
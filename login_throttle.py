@@ -0,0 +1,201 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+def _roll(bucket: int, current: int, previous: int, now_bucket: int) -> Tuple[int, int]:
+    """Shift stored counters so they describe (current, previous) for now_bucket"""
+    if bucket == now_bucket:
+        return current, previous
+    if bucket == now_bucket - 1:
+        return 0, current
+    return 0, 0
+
+
+def _estimate(current: int, previous: int, window: int, now: float) -> float:
+    """Sliding-window estimate: weighted previous bucket + current bucket"""
+    elapsed = (now % window) / window
+    return previous * (1 - elapsed) + current
+
+
+class MemoryThrottleBackend:
+    """Per-process counter store (single worker / development)"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._counters = OrderedDict()  # key -> (bucket, current, previous)
+
+    def get(self, key: str, window: int, now: float) -> Tuple[int, int]:
+        now_bucket = int(now // window)
+        with self._lock:
+            entry = self._counters.get(key)
+        if entry is None:
+            return 0, 0
+        return _roll(entry[0], entry[1], entry[2], now_bucket)
+
+    def hit(self, key: str, window: int, now: float) -> Tuple[int, int]:
+        now_bucket = int(now // window)
+        with self._lock:
+            entry = self._counters.pop(key, None)
+            current, previous = _roll(*entry, now_bucket) if entry else (0, 0)
+            current += 1
+            self._counters[key] = (now_bucket, current, previous)
+            while len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+        return current, previous
+
+    def reset(self, key: str):
+        with self._lock:
+            self._counters.pop(key, None)
+
+
+class DatabaseThrottleBackend:
+    """Counter store in the login_throttle table, shared by all gunicorn workers"""
+
+    def _table(self):
+        from models import LoginAttempt
+        return LoginAttempt.__table__
+
+    def _engine(self):
+        from models import db
+        return db.engine
+
+    def get(self, key: str, window: int, now: float) -> Tuple[int, int]:
+        table = self._table()
+        with self._engine().connect() as conn:
+            row = conn.execute(
+                table.select().where(table.c.key == key)
+            ).first()
+        if row is None:
+            return 0, 0
+        return _roll(row.bucket, row.current_count, row.previous_count, int(now // window))
+
+    def _roll_values(self, table, now_bucket: int):
+        """SET clause that rolls the stored buckets to now_bucket and counts one hit (old row values)"""
+        from datetime import datetime
+        from sqlalchemy import case
+        return {
+            'current_count': case((table.c.bucket == now_bucket, table.c.current_count + 1), else_=1),
+            'previous_count': case((table.c.bucket == now_bucket, table.c.previous_count),
+                                   (table.c.bucket == now_bucket - 1, table.c.current_count), else_=0),
+            'bucket': now_bucket,
+            'updated_at': datetime.utcnow(),
+        }
+
+    def hit(self, key: str, window: int, now: float) -> Tuple[int, int]:
+        from datetime import datetime
+        from sqlalchemy.exc import IntegrityError
+        table = self._table()
+        now_bucket = int(now // window)
+        engine = self._engine()
+        fresh = dict(key=key, bucket=now_bucket, current_count=1, previous_count=0, updated_at=datetime.utcnow())
+        # Một câu lệnh nguyên tử: SELECT ... FOR UPDATE không khóa được dòng chưa tồn tại
+        # (hai lần sai đầu tiên cùng INSERT) và là no-op trên SQLite
+        if engine.dialect.name in ('sqlite', 'postgresql'):
+            if engine.dialect.name == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            statement = insert(table).values(**fresh).on_conflict_do_update(
+                index_elements=[table.c.key], set_=self._roll_values(table, now_bucket))
+            with engine.begin() as conn:
+                conn.execute(statement)
+                row = conn.execute(table.select().where(table.c.key == key)).first()
+            return row.current_count, row.previous_count
+        # Dialect khác: UPDATE trước, INSERT nếu chưa có dòng, thử lại khi INSERT đụng nhau
+        for _ in range(3):
+            try:
+                with engine.begin() as conn:
+                    result = conn.execute(table.update().where(table.c.key == key)
+                                          .values(**self._roll_values(table, now_bucket)))
+                    if result.rowcount == 0:
+                        conn.execute(table.insert().values(**fresh))
+                    row = conn.execute(table.select().where(table.c.key == key)).first()
+                return row.current_count, row.previous_count
+            except IntegrityError:
+                continue
+        raise RuntimeError(f'Could not record login attempt for {key}')
+
+    def reset(self, key: str):
+        table = self._table()
+        with self._engine().begin() as conn:
+            conn.execute(table.delete().where(table.c.key == key))
+
+
+class LoginThrottle:
+    """Server-side login throttling keyed by email and client IP.
+
+    Failed attempts are counted with a sliding-window counter (two buckets per
+    key), so each check is O(1) and happens before any password hash is
+    verified. The per-email limit follows the admin settings
+    (login_attempts / lockout_duration); the per-IP limit is a config value
+    that stops credential-stuffing floods across many emails.
+    """
+
+    backends = {
+        'memory': MemoryThrottleBackend,
+        'database': DatabaseThrottleBackend,
+    }
+
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryThrottleBackend()
+        self.ip_limit = 20
+        self.ip_window = 300
+
+    def init_app(self, app):
+        """Configure backend and IP limits from the Flask app config"""
+        backend_name = app.config.get('LOGIN_THROTTLE_BACKEND', 'memory')
+        backend_cls = self.backends.get(backend_name)
+        if backend_cls is None:
+            raise ValueError(f'Unknown LOGIN_THROTTLE_BACKEND: {backend_name}')
+        self.backend = backend_cls()
+        self.ip_limit = app.config.get('LOGIN_IP_LIMIT', self.ip_limit)
+        self.ip_window = app.config.get('LOGIN_IP_WINDOW', self.ip_window)
+        app.extensions['login_throttle'] = self
+
+    @staticmethod
+    def _email_key(email: Optional[str]) -> str:
+        return f"email:{(email or '').strip().lower()}"
+
+    @staticmethod
+    def _ip_key(ip: Optional[str]) -> str:
+        return f"ip:{ip or 'unknown'}"
+
+    @staticmethod
+    def _retry_after(current: int, previous: int, limit: int, window: int, now: float) -> int:
+        """Seconds until the sliding estimate drops below the limit"""
+        elapsed = now % window
+        if current < limit and previous:
+            # previous * (1 - x / window) + current < limit
+            return max(1, math.ceil(window * (1 - (limit - current) / previous) - elapsed))
+        # Chờ sang cửa sổ kế tiếp, khi đó current trở thành previous
+        return max(1, math.ceil(window - elapsed + window * (1 - limit / current)))
+
+    def check(self, email: str, ip: str, max_attempts: int, window: int) -> int:
+        """Return 0 if a login attempt is allowed, else seconds to wait"""
+        now = time.time()
+        for key, limit, win in ((self._email_key(email), max_attempts, window),
+                                (self._ip_key(ip), self.ip_limit, self.ip_window)):
+            current, previous = self.backend.get(key, win, now)
+            if _estimate(current, previous, win, now) >= limit:
+                return self._retry_after(current, previous, limit, win, now)
+        return 0
+
+    def record_failure(self, email: str, ip: str, max_attempts: int, window: int) -> int:
+        """Count a failed attempt; return how many attempts the email has left"""
+        now = time.time()
+        self.backend.hit(self._ip_key(ip), self.ip_window, now)
+        current, previous = self.backend.hit(self._email_key(email), window, now)
+        used = math.ceil(_estimate(current, previous, window, now))
+        return max(0, max_attempts - used)
+
+    def reset(self, email: str):
+        """Clear the email counter after a successful login"""
+        self.backend.reset(self._email_key(email))
+
+
+# Global login throttle instance
+login_throttle = LoginThrottle()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Out-of-process AI inference server over a Unix socket, with micro-batching
+Một process giữ model AI; các web worker gửi danh sách chỉ số triệu chứng
+(feature index) qua Unix socket. Request đến gần nhau (trong --window-ms) được
+gom thành một lần predict_proba vector hóa.
+
+Bật phía web: MODEL_SERVER_SOCKET=/tmp/healthfirst-model.sock. Server không
+chạy/không trả lời -> worker tự dự đoán tại chỗ như trước.
+
+Usage:
+    python model_server.py --socket /tmp/healthfirst-model.sock
+    python model_server.py --socket /tmp/healthfirst-model.sock --window-ms 2 --max-batch 64
+"""
+
+import argparse
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+HEADER = struct.Struct('!I')  # độ dài frame JSON
+MAX_FRAME = 1024 * 1024
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    body = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    return HEADER.pack(len(body)) + body
+
+
+class ModelServer:
+    """asyncio Unix socket server answering predictions in micro-batches.
+
+    Each connection sends one request at a time (a worker thread keeps its
+    own connection). A request is ``{"features": [i, ...], "version": v}``:
+    the indices of the matched symptoms and the model version the worker
+    computed them against. The batcher takes the first queued request,
+    waits ``window`` seconds for more (up to ``max_batch``), runs one
+    ``predict_proba`` over the whole matrix and answers each request with
+    ``{"disease", "confidence", "version"}``. A request for another model
+    version gets ``{"error": "version"}``: the worker then predicts locally
+    until both sides have the same model files; a malformed frame or a
+    failed batch gets ``{"error": ...}`` too. The model comes from
+    ``model_holder``, so a new ai_model.npz is picked up without a restart.
+    Batches run on one predict thread, so model reloads and predict_proba
+    never block the event loop.
+    """
+
+    def __init__(self, path: str, window: float = 0.002, max_batch: int = 64):
+        self.path = path
+        self.window = window
+        self.max_batch = max_batch
+        self.metrics = {'requests': 0, 'batches': 0, 'max_batch_seen': 0, 'version_mismatch': 0, 'connections': 0,
+                        'bad_requests': 0, 'errors': 0}
+        self._executor = None
+
+    @staticmethod
+    def _invalid(message) -> Optional[str]:
+        """Why a prediction frame is malformed, or None"""
+        if not isinstance(message, dict):
+            return 'request must be an object'
+        features = message.get('features')
+        if not isinstance(features, list) or not all(type(index) is int for index in features):
+            return "'features' must be a list of integers"
+        if not isinstance(message.get('version'), (str, type(None))):
+            return "'version' must be a string"
+        return None
+
+    async def _handle(self, reader, writer):
+        import asyncio
+        self.metrics['connections'] += 1
+        try:
+            while True:
+                try:
+                    (length,) = HEADER.unpack(await reader.readexactly(HEADER.size))
+                    if length > MAX_FRAME:
+                        break
+                    message = json.loads(await reader.readexactly(length))
+                except asyncio.IncompleteReadError:
+                    break
+                if isinstance(message, dict) and message.get('op') == 'stats':
+                    reply = self.stats()
+                elif self._invalid(message):
+                    self.metrics['bad_requests'] += 1
+                    reply = {'error': self._invalid(message)}
+                else:
+                    future = asyncio.get_running_loop().create_future()
+                    await self._queue.put((message, future))
+                    reply = await future
+                writer.write(_encode(reply))
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.metrics['connections'] -= 1
+            writer.close()
+
+    async def _batcher(self):
+        import asyncio
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if self.window and len(batch) < self.max_batch:
+                # Chờ thêm một cửa sổ ngắn để gom request đồng thời
+                await asyncio.sleep(self.window)
+                while len(batch) < self.max_batch and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+            try:
+                # Thread riêng: model_holder.get() có thể nạp lại model, predict_proba tốn CPU
+                replies = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._predict, [message for message, _ in batch])
+            except Exception as e:
+                self.metrics['errors'] += 1
+                print(f"❌ Model server batch of {len(batch)} failed: {e}")
+                replies = [{'error': f'{type(e).__name__}: {e}'}] * len(batch)
+            for (_, future), reply in zip(batch, replies):
+                if not future.done():
+                    future.set_result(reply)
+
+    def _predict(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        import numpy as np
+        from ai_diagnosis import model_holder
+
+        model = model_holder.get()
+        if model is None or model.runtime is None:
+            return [{'error': 'model unavailable'} for _ in messages]
+        replies: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        rows = []
+        for i, message in enumerate(messages):
+            if message.get('version') not in (None, model.version):
+                replies[i] = {'error': 'version', 'version': model.version}
+                self.metrics['version_mismatch'] += 1
+            else:
+                rows.append(i)
+        if rows:
+            features = np.zeros((len(rows), len(model.symptoms_list)), dtype=np.float32)
+            for row, i in enumerate(rows):
+                indices = [index for index in messages[i].get('features', []) if 0 <= index < features.shape[1]]
+                features[row, indices] = 1
+            probabilities = model.runtime.predict_proba(features)
+            best = probabilities.argmax(axis=1)
+            for row, i in enumerate(rows):
+                replies[i] = {'disease': str(model.runtime.classes[best[row]]),
+                              'confidence': float(probabilities[row, best[row]]), 'version': model.version}
+        self.metrics['requests'] += len(messages)
+        self.metrics['batches'] += 1
+        self.metrics['max_batch_seen'] = max(self.metrics['max_batch_seen'], len(messages))
+        return replies
+
+    def stats(self) -> Dict[str, Any]:
+        from ai_diagnosis import model_holder
+        batches = self.metrics['batches']
+        return dict(self.metrics, pid=os.getpid(), model=model_holder.stats(),
+                    avg_batch=round(self.metrics['requests'] / batches, 2) if batches else 0.0)
+
+    async def serve(self):
+        import asyncio
+        from ai_diagnosis import model_holder
+
+        if model_holder.get() is None:
+            raise RuntimeError('AI model could not be loaded')
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # socket cũ của lần chạy trước
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='predict')
+        server = await asyncio.start_unix_server(self._handle, path=self.path)
+        os.chmod(self.path, 0o660)
+        batcher = asyncio.create_task(self._batcher())
+        print(f"🤖 Model server on {self.path} (window {self.window * 1000:.1f} ms, max batch {self.max_batch})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self._executor.shutdown(wait=False)
+
+
+class ModelClient:
+    """Web-worker side of the model server (disabled unless MODEL_SERVER_SOCKET is set).
+
+    Each thread keeps one connection. Any error (no server, timeout, version
+    mismatch) returns None, so the caller predicts locally. After a
+    connection error the server is skipped for ``retry_after`` seconds.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 0.5, retry_after: float = 5.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._local = threading.local()
+        self._down_until = 0.0
+        self.metrics = {'remote': 0, 'fallback': 0, 'errors': 0}
+
+    def init_app(self, app):
+        """Configure from the Flask app config"""
+        self.socket_path = app.config.get('MODEL_SERVER_SOCKET') or None
+        self.timeout = app.config.get('MODEL_SERVER_TIMEOUT', self.timeout)
+        app.extensions['model_client'] = self
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.socket_path)
+
+    def _connection(self) -> socket.socket:
+        connection = getattr(self._local, 'connection', None)
+        # Không dùng lại socket của process cha sau fork
+        if connection is None or self._local.pid != os.getpid():
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(self.timeout)
+            connection.connect(self.socket_path)
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    def _close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            try:
+                connection.close()
+            except OSError:
+                pass
+        self._local.connection = None
+
+    def _receive(self, connection: socket.socket, size: int) -> bytes:
+        data = b''
+        while len(data) < size:
+            chunk = connection.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError('model server closed the connection')
+            data += chunk
+        return data
+
+    def call(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """One request/response round trip on this thread's connection"""
+        connection = self._connection()
+        try:
+            connection.sendall(_encode(message))
+            (length,) = HEADER.unpack(self._receive(connection, HEADER.size))
+            return json.loads(self._receive(connection, length))
+        except Exception:
+            self._close()  # trạng thái frame không còn tin được
+            raise
+
+    def predict(self, features: List[int], version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """``{"disease", "confidence", "version"}`` from the server, or None to predict locally"""
+        if not self.enabled or time.monotonic() < self._down_until:
+            self.metrics['fallback'] += 1
+            return None
+        try:
+            reply = self.call({'features': features, 'version': version})
+        except (OSError, ValueError) as e:
+            self.metrics['errors'] += 1
+            self.metrics['fallback'] += 1
+            self._down_until = time.monotonic() + self.retry_after
+            print(f"❌ Model server unavailable ({e}), predicting locally for {self.retry_after:.0f} s")
+            return None
+        if 'error' in reply:
+            self.metrics['fallback'] += 1
+            return None
+        self.metrics['remote'] += 1
+        return reply
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.metrics, socket=self.socket_path)
+
+
+# Global model server client (web workers)
+model_client = ModelClient()
+
+
+def main():
+    import asyncio
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--socket', default=os.getenv('MODEL_SERVER_SOCKET') or '/tmp/healthfirst-model.sock')
+    parser.add_argument('--window-ms', type=float, default=2.0, help='wait this long to batch concurrent requests')
+    parser.add_argument('--max-batch', type=int, default=64)
+    args = parser.parse_args()
+
+    server = ModelServer(args.socket, window=args.window_ms / 1000, max_batch=args.max_batch)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("\n⏹️  Model server stopped")
+
+
+if __name__ == '__main__':
+    main()
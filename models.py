@@ -1,10 +1,12 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
+from sqlalchemy import event
 from datetime import datetime
-from argon2 import PasswordHasher
+import json
+from password_service import password_service, PasswordServiceBusy
+from utils import HealthAnalyzer
 
 db = SQLAlchemy()
-password_hasher = PasswordHasher()
 
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
@@ -29,38 +31,48 @@ class User(UserMixin, db.Model):
     
     def set_password(self, password: str):
         """Hash password using Argon2"""
-        self.pw_hash = password_hasher.hash(password)
+        self.pw_hash = password_service.hash(password)
     
     def check_password(self, password: str) -> bool:
-        """Verify password"""
+        """Verify password (PasswordServiceBusy propagates so the caller can answer 503)"""
         try:
-            return password_hasher.verify(self.pw_hash, password)
+            return password_service.verify(self.pw_hash, password)
+        except PasswordServiceBusy:
+            raise
         except Exception:
             return False
     
+    def rehash_password_if_needed(self, password: str) -> bool:
+        """Re-hash a verified password when Argon2 parameters changed"""
+        if password_service.needs_rehash(self.pw_hash):
+            self.set_password(password)
+            return True
+        return False
+    
+    def health_metrics(self):
+        """Derived health fields (BMI, BMI category, age group), computed once per change"""
+        metrics = self.__dict__.get('_health_metrics')
+        if metrics is None:
+            bmi = HealthAnalyzer.calculate_bmi(self.height, self.weight)
+            metrics = {
+                'bmi': bmi,
+                'bmi_category': HealthAnalyzer.get_bmi_status(bmi),
+                'age_group': HealthAnalyzer.get_age_group(self.age) if self.age else None
+            }
+            self.__dict__['_health_metrics'] = metrics
+        return metrics
+    
     def get_bmi(self):
         """Calculate BMI if height and weight are available"""
-        if self.height and self.weight:
-            height_m = self.height / 100
-            return round(self.weight / (height_m ** 2), 1)
-        return None
+        return self.health_metrics()['bmi']
     
     def get_bmi_category(self):
         """Get BMI category"""
-        bmi = self.get_bmi()
-        if bmi is None:
-            return None
-        elif bmi < 18.5:
-            return "Thiếu cân"
-        elif bmi < 25:
-            return "Bình thường"
-        elif bmi < 30:
-            return "Thừa cân"
-        else:
-            return "Béo phì"
+        return self.health_metrics()['bmi_category']
     
     def to_dict(self):
         """Convert user to dictionary"""
+        metrics = self.health_metrics()
         return {
             'id': self.id,
             'email': self.email,
@@ -69,13 +81,23 @@ class User(UserMixin, db.Model):
             'age': self.age,
             'height': self.height,
             'weight': self.weight,
-            'bmi': self.get_bmi(),
-            'bmi_category': self.get_bmi_category(),
+            'bmi': metrics['bmi'],
+            'bmi_category': metrics['bmi_category'],
+            'age_group': metrics['age_group'],
             'medical_history': self.medical_history,
             'is_admin': self.is_admin,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+def _clear_health_metrics(target, *args):
+    """Drop cached derived fields when height/weight/age change or are reloaded"""
+    target.__dict__.pop('_health_metrics', None)
+
+for _attr in (User.height, User.weight, User.age):
+    event.listen(_attr, 'set', _clear_health_metrics)
+event.listen(User, 'expire', _clear_health_metrics)
+event.listen(User, 'refresh', _clear_health_metrics)
+
 class HealthRecord(db.Model):
     __tablename__ = 'health_records'
     
@@ -109,6 +131,7 @@ class Assessment(db.Model):
     description = db.Column(db.Text, nullable=False)
     recommendations = db.Column(db.Text, nullable=True)  # JSON string
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
     
     def to_dict(self):
         return {
@@ -133,6 +156,7 @@ class Contact(db.Model):
     message = db.Column(db.Text, nullable=False)
     status = db.Column(db.String(20), default='new')  # 'new', 'read', 'replied'
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
     
     def to_dict(self):
         return {
@@ -144,3 +168,97 @@ class Contact(db.Model):
             'status': self.status,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+
+class LoginAttempt(db.Model):
+    """Sliding-window login failure counters shared by all workers"""
+    __tablename__ = 'login_throttle'
+    
+    key = db.Column(db.String(320), primary_key=True)  # 'email:<email>' hoặc 'ip:<addr>'
+    bucket = db.Column(db.Integer, nullable=False)  # chỉ số cửa sổ thời gian hiện tại
+    current_count = db.Column(db.Integer, default=0, nullable=False)
+    previous_count = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ImportCheckpoint(db.Model):
+    """Progress of a bulk import, committed in the same transaction as each chunk"""
+    __tablename__ = 'import_checkpoints'
+    
+    key = db.Column(db.String(255), primary_key=True)  # tên nguồn (mặc định: tên file)
+    position = db.Column(db.Integer, default=0, nullable=False)  # số record đã xử lý xong
+    inserted = db.Column(db.Integer, default=0, nullable=False)
+    rejected = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class Job(db.Model):
+    """Background job record (see jobs.py)"""
+    __tablename__ = 'jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False, index=True)
+    status = db.Column(db.String(20), default='queued', nullable=False, index=True)  # 'queued', 'running', 'succeeded', 'failed'
+    payload = db.Column(db.Text, nullable=True)  # JSON string
+    result = db.Column(db.Text, nullable=True)  # JSON string
+    error = db.Column(db.Text, nullable=True)
+    progress = db.Column(db.Float, default=0.0, nullable=False)  # 0..1
+    message = db.Column(db.String(255), nullable=True)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=3, nullable=False)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = db.Column(db.String(64), nullable=True)  # worker đang chạy job
+    created_by = db.Column(db.Integer, nullable=True)  # user id
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'payload': json.loads(self.payload) if self.payload else None,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'progress': round(self.progress or 0.0, 4),
+            'message': self.message,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'run_after': self.run_after.isoformat() if self.run_after else None,
+            'created_by': self.created_by,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class SyncCheckpoint(db.Model):
+    """Watermark of the Firestore reconciliation (see firestore_sync.py)"""
+    __tablename__ = 'sync_checkpoints'
+    
+    key = db.Column(db.String(100), primary_key=True)  # '<direction>:<collection>', vd 'push:users'
+    watermark_at = db.Column(db.DateTime, nullable=True)  # updated_at đã xử lý tới
+    watermark_id = db.Column(db.String(100), nullable=True)  # id cuối cùng tại watermark_at
+    processed = db.Column(db.Integer, default=0, nullable=False)
+    written = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class StatsSnapshot(db.Model):
+    """Last complete statistics rollup, shared by every worker (see stats_service.py)"""
+    __tablename__ = 'stats_snapshots'
+    
+    key = db.Column(db.String(100), primary_key=True)  # vd 'dashboard'
+    value = db.Column(db.Text, nullable=False)  # JSON string
+    computed_at = db.Column(db.DateTime, nullable=False)
+
+def add_missing_columns():
+    """Add nullable columns that create_all() cannot add to existing tables"""
+    inspector = db.inspect(db.engine)
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=db.engine.dialect)
+                    conn.execute(db.text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                    print(f"[DB] Added column {table.name}.{column.name}")
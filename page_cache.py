@@ -0,0 +1,182 @@
+import gzip
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Dict, Optional
+
+from flask import make_response, request, session
+from flask_login import current_user
+
+try:
+    import brotli
+except ImportError:  # brotli là tùy chọn
+    brotli = None
+
+SUPPORTED_LOCALES = ['vi', 'en']
+
+
+class PageCache:
+    """Rendered-page cache for content pages that only vary by auth state.
+
+    Entries are keyed on (endpoint, locale, auth identity) and hold the HTML
+    plus gzip/brotli variants compressed once per fill. Responses carry an
+    ETag (hash of the HTML) and Cache-Control, and conditional requests get
+    a 304. The cache is per process, so a deploy (worker restart) starts it
+    empty; in between, entries are dropped when any template file changes.
+    """
+
+    def __init__(self, max_size: int = 256, max_age: int = 300, check_interval: float = 2.0):
+        self.enabled = True
+        self.max_size = max_size
+        self.max_age = max_age
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._template_dirs = []
+        self._signature = None
+        self._checked_at = 0.0
+        self.metrics = {'hits': 0, 'misses': 0, 'not_modified': 0, 'bypassed': 0}
+
+    def init_app(self, app):
+        """Configure from the Flask app config"""
+        self.enabled = app.config.get('PAGE_CACHE_ENABLED', True)
+        self.max_size = app.config.get('PAGE_CACHE_SIZE', self.max_size)
+        self.max_age = app.config.get('PAGE_CACHE_MAX_AGE', self.max_age)
+        self._template_dirs = [os.path.join(app.root_path, app.template_folder)]
+        self.clear()
+        app.extensions['page_cache'] = self
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._signature = None
+            self._checked_at = 0.0
+
+    def _templates_signature(self) -> float:
+        """Newest template mtime (checked at most every check_interval seconds)"""
+        now = time.monotonic()
+        if self._signature is not None and now - self._checked_at < self.check_interval:
+            return self._signature
+        newest = 0.0
+        for directory in self._template_dirs:
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    try:
+                        newest = max(newest, os.stat(os.path.join(root, name)).st_mtime)
+                    except OSError:
+                        pass
+        if self._signature is not None and newest != self._signature:
+            with self._lock:
+                self._entries.clear()
+        self._signature = newest
+        self._checked_at = now
+        return newest
+
+    @staticmethod
+    def _auth_key() -> str:
+        # base.html hiển thị tên người dùng và menu admin nên khóa theo từng user
+        if current_user.is_authenticated:
+            updated = current_user.updated_at.timestamp() if current_user.updated_at else 0
+            return f'user:{current_user.id}:{updated}'
+        return 'anon'
+
+    def _should_bypass(self) -> bool:
+        if not self.enabled:
+            return True
+        if request.method not in ('GET', 'HEAD'):
+            return True
+        # Trang có flash message phải render riêng
+        return bool(session.get('_flashes'))
+
+    @staticmethod
+    def _build_entry(html: str) -> Dict[str, Any]:
+        body = html.encode('utf-8')
+        entry = {
+            'body': body,
+            'etag': hashlib.sha1(body).hexdigest(),
+            'gzip': gzip.compress(body, compresslevel=9),
+        }
+        if brotli is not None:
+            entry['br'] = brotli.compress(body, quality=11)
+        return entry
+
+    def _get(self, key) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _respond(self, entry, auth_key: str):
+        if request.if_none_match.contains(entry['etag']):
+            self.metrics['not_modified'] += 1
+            response = make_response('', 304)
+        else:
+            accepted = request.accept_encodings
+            if 'br' in entry and accepted['br']:
+                response = make_response(entry['br'])
+                response.headers['Content-Encoding'] = 'br'
+            elif accepted['gzip']:
+                response = make_response(entry['gzip'])
+                response.headers['Content-Encoding'] = 'gzip'
+            else:
+                response = make_response(entry['body'])
+            response.mimetype = 'text/html'
+        response.set_etag(entry['etag'])
+        response.vary.update(('Accept-Encoding', 'Cookie'))
+        if auth_key == 'anon':
+            response.headers['Cache-Control'] = f'public, max-age={self.max_age}'
+        else:
+            response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def serve(self, view, args, kwargs, anonymous_only: bool = False):
+        """Serve a view from cache, rendering and filling it on a miss"""
+        if self._should_bypass() or (anonymous_only and current_user.is_authenticated):
+            self.metrics['bypassed'] += 1
+            return view(*args, **kwargs)
+
+        self._templates_signature()
+        auth_key = self._auth_key()
+        locale = request.accept_languages.best_match(SUPPORTED_LOCALES) or SUPPORTED_LOCALES[0]
+        key = (request.endpoint, tuple(sorted(kwargs.items())), locale, auth_key)
+
+        entry = self._get(key)
+        if entry is None:
+            rendered = view(*args, **kwargs)
+            if not isinstance(rendered, str):
+                # Redirect / response object: không cache
+                self.metrics['bypassed'] += 1
+                return rendered
+            entry = self._build_entry(rendered)
+            self._put(key, entry)
+            self.metrics['misses'] += 1
+        else:
+            self.metrics['hits'] += 1
+        return self._respond(entry, auth_key)
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.metrics, size=len(self._entries), brotli=brotli is not None)
+
+
+# Global page cache instance
+page_cache = PageCache()
+
+
+def cached_page(anonymous_only: bool = False):
+    """Cache the rendered output of a content page view"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            return page_cache.serve(view, args, kwargs, anonymous_only=anonymous_only)
+        return wrapper
+    return decorator
@@ -0,0 +1,143 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, Optional
+
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError, VerifyMismatchError
+
+# Mặc định của argon2-cffi (RFC 9106 low-memory profile)
+DEFAULT_ARGON2_PARAMS = {
+    'time_cost': 3,
+    'memory_cost': 65536,  # KiB
+    'parallelism': 4,
+}
+
+# Mỗi tiến trình (web worker hoặc pool worker) giữ một hasher cho mỗi bộ tham số
+_hashers: Dict[tuple, PasswordHasher] = {}
+
+
+def _get_hasher(params: Dict[str, int]) -> PasswordHasher:
+    key = tuple(sorted(params.items()))
+    hasher = _hashers.get(key)
+    if hasher is None:
+        hasher = _hashers[key] = PasswordHasher(**params)
+    return hasher
+
+
+def _hash_password(password: str, params: Dict[str, int]) -> str:
+    return _get_hasher(params).hash(password)
+
+
+def _verify_password(pw_hash: str, password: str, params: Dict[str, int]) -> bool:
+    try:
+        return _get_hasher(params).verify(pw_hash, password)
+    except (VerifyMismatchError, VerificationError, InvalidHashError):
+        return False
+
+
+class PasswordServiceBusy(Exception):
+    """Raised when too many hash operations are already queued"""
+
+
+class PasswordService:
+    """Argon2 hashing off the request thread with bounded concurrency.
+
+    With ``PASSWORD_HASH_WORKERS > 0`` hashes run in a small process pool
+    (created lazily, after gunicorn forks); with 0 they run inline. Either way
+    at most ``PASSWORD_HASH_MAX_PENDING`` operations may be in flight per web
+    worker; extra callers get ``PasswordServiceBusy`` immediately so the route
+    can answer 503 instead of queueing behind a login burst.
+    """
+
+    def __init__(self):
+        self.params = dict(DEFAULT_ARGON2_PARAMS)
+        self.workers = 0
+        self.max_pending = 16
+        self.timeout = 5.0
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self.rejected = 0
+
+    def init_app(self, app):
+        """Configure Argon2 parameters and pool sizing from the app config"""
+        self.params = {
+            'time_cost': app.config.get('ARGON2_TIME_COST', DEFAULT_ARGON2_PARAMS['time_cost']),
+            'memory_cost': app.config.get('ARGON2_MEMORY_COST', DEFAULT_ARGON2_PARAMS['memory_cost']),
+            'parallelism': app.config.get('ARGON2_PARALLELISM', DEFAULT_ARGON2_PARAMS['parallelism']),
+        }
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', 0)
+        self.max_pending = app.config.get('PASSWORD_HASH_MAX_PENDING', 16)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 5.0)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self.shutdown()
+        app.extensions['password_service'] = self
+
+    @property
+    def hasher(self) -> PasswordHasher:
+        return _get_hasher(self.params)
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # fork (POSIX): pool worker không phải import lại module __main__ (app.py)
+                    methods = multiprocessing.get_all_start_methods()
+                    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordServiceBusy('Password hashing queue is full')
+        executor = None
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                return fn(*args)
+            future = executor.submit(fn, *args)
+        except BaseException:
+            if executor is not None:
+                self._slots.release()  # submit thất bại (pool hỏng/đã shutdown)
+            raise
+        finally:
+            if executor is None:
+                self._slots.release()  # chạy inline: xong (hoặc lỗi) là trả slot
+        # Slot được trả khi phép băm thật sự xong, không phải khi request hết chờ:
+        # hash quá hạn vẫn chiếm pool nên vẫn phải tính vào max_pending
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordServiceBusy('Password hashing timed out')
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured Argon2 parameters"""
+        return self._run(_hash_password, password, self.params)
+
+    def verify(self, pw_hash: str, password: str) -> bool:
+        """Verify a password against a stored hash"""
+        if not pw_hash or password is None:
+            return False
+        return self._run(_verify_password, pw_hash, password, self.params)
+
+    def needs_rehash(self, pw_hash: str) -> bool:
+        """True when the stored hash uses outdated Argon2 parameters"""
+        try:
+            return self.hasher.check_needs_rehash(pw_hash)
+        except Exception:
+            return False
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Global password service instance
+password_service = PasswordService()
@@ -0,0 +1,217 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from flask import jsonify
+
+# Request tổng hợp chạy khi warm-up: nạp model, danh mục AI, template/page cache
+# và bản nén của các response cache được (không ghi gì vào DB)
+WARMUP_REQUESTS = [
+    ('GET', '/', None),
+    ('GET', '/auth/login', None),
+    ('GET', '/api/ai/symptoms', None),
+    ('GET', '/api/ai/diseases', None),
+    ('GET', '/api/ai/symptom-info/fever', None),
+    ('POST', '/api/ai/quick-diagnosis', {'symptoms': 'fever, cough, headache', 'age': 35, 'days_sick': 2}),
+    ('POST', '/api/ai/quick-diagnosis', {'symptoms': 'chest pain, shortness of breath', 'age': 68, 'days_sick': 1}),
+    ('POST', '/api/ai/quick-diagnosis', {'symptoms': 'itching, skin rash', 'age': 24, 'days_sick': 5}),
+]
+
+
+class Readiness:
+    """Liveness (/healthz) and readiness (/readyz) probes for the load balancer.
+
+    /healthz only says the process answers. /readyz is 200 once this worker
+    has warmed up (AI model loaded, then ``WARMUP_REQUESTS`` replayed
+    through the app: catalogs, templates, page and compression caches) and
+    its dependencies answer within ``check_timeout`` seconds: the database
+    (``SELECT 1``) and Firestore when it is configured. Until then it is 503,
+    so the load balancer keeps cold workers out of rotation.
+
+    Warm-up runs in a background thread started by the first request this
+    worker process serves (or the first /readyz), never at import or
+    ``create_app`` time: CLI scripts and a gunicorn ``--preload`` master do
+    not warm up, and a worker never forks with the warm-up holding a lock.
+    It is restarted after a failure on the next probe. Dependency results are
+    cached for ``check_ttl`` seconds, so frequent probes cost nothing; while
+    the Firebase SDK is still initializing, Firestore is reported as
+    ``initializing`` (not ready, but not cached as unreachable).
+    """
+
+    def __init__(self, check_timeout: float = 2.0, check_ttl: float = 5.0):
+        self.check_timeout = check_timeout
+        self.check_ttl = check_ttl
+        self.require_firestore = True
+        self.app = None
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.warm = False
+        self.warmup: Dict[str, Any] = {'status': 'pending'}
+        self._checks: Dict[str, Any] = {}
+        self._checked_at = 0.0
+        self._firestore_check = None
+
+    def init_app(self, app):
+        """Register /healthz and /readyz and warm up on each worker's first request"""
+        self.app = app
+        self.check_timeout = app.config.get('READY_CHECK_TIMEOUT', self.check_timeout)
+        self.check_ttl = app.config.get('READY_CHECK_TTL', self.check_ttl)
+        self.require_firestore = app.config.get('READY_REQUIRE_FIRESTORE', self.require_firestore)
+        app.add_url_rule('/healthz', 'healthz', self.healthz)
+        app.add_url_rule('/readyz', 'readyz', self.readyz)
+        app.extensions['readiness'] = self
+
+        if app.config.get('READY_WARMUP_ON_REQUEST', True):
+            @app.before_request
+            def _warm_up_worker():
+                if self._pid != os.getpid():
+                    self.start()
+
+    # ----- Warm-up -----
+
+    def start(self):
+        """Start the warm-up thread in this process (no-op if already running here)"""
+        with self._lock:
+            if self._pid == os.getpid() and self.warmup.get('status') != 'failed':
+                return
+            if self._pid != os.getpid():
+                # Process con sau fork (gunicorn --preload) không có thread của process cha
+                self._pid = os.getpid()
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='readyz')
+                self._checked_at, self._firestore_check = 0.0, None
+            self.warm = False
+            self.warmup = {'status': 'running', 'started_at': datetime.utcnow().isoformat()}
+            self._thread = threading.Thread(target=self._warm_up, name='warmup', daemon=True)
+            self._thread.start()
+
+    def _warm_up(self):
+        started = time.perf_counter()
+        steps: List[Dict[str, Any]] = []
+        try:
+            from ai_diagnosis import model_holder
+            began = time.perf_counter()
+            model = model_holder.get()
+            if model is None:
+                raise RuntimeError('AI model could not be loaded')
+            steps.append({'step': 'model', 'version': model.version,
+                          'ms': round((time.perf_counter() - began) * 1000, 1)})
+
+            client = self.app.test_client()
+            for method, path, body in WARMUP_REQUESTS:
+                began = time.perf_counter()
+                response = client.open(path, method=method, json=body, headers={'Accept-Encoding': 'br, gzip'})
+                response.close()
+                steps.append({'step': f'{method} {path}', 'status': response.status_code,
+                              'ms': round((time.perf_counter() - began) * 1000, 1)})
+                if response.status_code >= 500:
+                    raise RuntimeError(f'{method} {path} -> {response.status_code}')
+
+            # Khởi tạo Firebase SDK (tìm credentials) ở đây thay vì trong request đầu tiên
+            from firebase_config import firebase_db
+            began = time.perf_counter()
+            steps.append({'step': 'firestore', 'configured': firebase_db.db is not None,
+                          'ms': round((time.perf_counter() - began) * 1000, 1)})
+            if firebase_db.mirror is not None:
+                firebase_db.mirror.start()  # listener của bản sao Firestore chạy nền
+
+            self.warmup = {'status': 'done', 'seconds': round(time.perf_counter() - started, 3), 'steps': steps}
+            self.warm = True
+            print(f"🔥 Worker {os.getpid()} warmed up in {self.warmup['seconds']} s")
+        except Exception as e:
+            self.warmup = {'status': 'failed', 'error': str(e), 'steps': steps}
+            print(f"❌ Warm-up failed: {e}")
+
+    # ----- Dependency checks -----
+
+    def _result(self, future, began: float) -> Dict[str, Any]:
+        """Outcome of a check future, waiting at most until began + check_timeout"""
+        try:
+            detail = future.result(timeout=max(0.0, began + self.check_timeout - time.perf_counter()))
+            result = {'ok': True}
+            if detail is not None:
+                result['detail'] = detail
+        except FutureTimeout:
+            result = {'ok': False, 'error': f'no answer within {self.check_timeout} s'}
+        except Exception as e:
+            result = {'ok': False, 'error': str(e)}
+        result['ms'] = round((time.perf_counter() - began) * 1000, 1)
+        return result
+
+    def _check_database(self, engine):
+        from sqlalchemy import text
+        with engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+
+    def _check_firestore(self):
+        from firebase_config import firebase_db
+        client = firebase_db.db  # lần đầu: khởi tạo SDK (có thể chậm) -> nằm trong deadline
+        if client is None:
+            return 'not configured'
+        list(client.collection('người dùng').limit(1).stream())
+
+    def checks(self) -> Dict[str, Any]:
+        """Dependency results, refreshed at most every check_ttl seconds"""
+        now = time.monotonic()
+        if self._checked_at and now - self._checked_at < self.check_ttl:
+            return self._checks
+        with self._lock:
+            if self._checked_at and now - self._checked_at < self.check_ttl:
+                return self._checks
+            from firebase_config import firebase_db
+            from models import db
+            engine = db.engine  # lấy trong app context của request
+            # Chạy song song, chung một deadline: probe trả lời trong ~check_timeout
+            began = time.perf_counter()
+            futures = {'database': self._executor.submit(self._check_database, engine)}
+            previous = self._firestore_check
+            if firebase_db.initialized or previous is None or previous.done():
+                # SDK đang khởi tạo: không xếp thêm lần kiểm tra chờ cùng một lock
+                futures['firestore'] = self._firestore_check = self._executor.submit(self._check_firestore)
+            checks = {name: self._result(future, began) for name, future in futures.items()}
+            initializing = not firebase_db.initialized and not checks.get('firestore', {}).get('ok')
+            if initializing:
+                # Tìm credentials (ADC) mất vài giây: chưa sẵn sàng, nhưng không phải "không kết nối được"
+                checks['firestore'] = {'ok': False, 'initializing': True,
+                                       'error': 'Firebase SDK still initializing',
+                                       'ms': round((time.perf_counter() - began) * 1000, 1)}
+            if not self.require_firestore:
+                checks['firestore']['required'] = False
+            # Không cache khi đang khởi tạo: probe sau kiểm tra lại ngay
+            self._checks, self._checked_at = checks, 0.0 if initializing else time.monotonic()
+        return self._checks
+
+    # ----- Endpoints -----
+
+    def healthz(self):
+        """Liveness: the process serves requests"""
+        response = jsonify({'status': 'ok', 'pid': os.getpid(), 'uptime': round(time.time() - self.started_at, 1)})
+        response.cache_control.no_store = True
+        return response
+
+    def readyz(self):
+        """Readiness: warmed up and dependencies reachable (200), else 503"""
+        self.start()
+        checks = self.checks()
+        ready = self.warm and all(check['ok'] or check.get('required') is False for check in checks.values())
+        response = jsonify({
+            'status': 'ready' if ready else 'not_ready',
+            'pid': os.getpid(),
+            'warmup': self.warmup if not ready else {key: value for key, value in self.warmup.items() if key != 'steps'},
+            'checks': checks,
+        })
+        response.status_code = 200 if ready else 503
+        response.cache_control.no_store = True
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        return {'warm': self.warm, 'warmup': self.warmup, 'checks': self._checks}
+
+
+# Global readiness probe instance
+readiness = Readiness()
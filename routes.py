@@ -2,10 +2,23 @@ from flask import Blueprint, render_template, request, jsonify, flash, redirect,
 from flask_login import login_required, current_user, login_user, logout_user
 from werkzeug.security import generate_password_hash
 from werkzeug.urls import url_parse
-from models import db, User, HealthRecord, Assessment, Contact
+from models import db, User, HealthRecord, Assessment, Contact, Job
 from utils import assessment_engine, health_analyzer
 from firebase_config import firebase_db
-from ai_diagnosis import get_ai_diagnosis
+from firestore_mirror import firestore_mirror
+from settings_store import settings_store
+from login_throttle import login_throttle
+from password_service import PasswordServiceBusy
+from user_cache import user_cache
+from stats_service import dashboard_stats
+from page_cache import cached_page, page_cache
+from compression import compression
+from exports import ExportError, export_response
+from jobs import job_queue
+from firestore_sync import firestore_sync
+from db_engine import engine_profile
+from ai_diagnosis import get_ai_diagnosis, model_holder
+from model_server import model_client
 import json
 from datetime import datetime
 
@@ -17,6 +30,7 @@ admin = Blueprint('admin', __name__)
 
 # Main routes
 @main.route('/')
+@cached_page(anonymous_only=True)
 def index():
     """Home page"""
     user_info = None
@@ -35,6 +49,7 @@ def resources():
     return redirect(url_for('main.library'))
 
 @main.route('/privacy')
+@cached_page()
 def privacy():
     """Privacy policy page"""
     return render_template('privacy.html')
@@ -46,21 +61,25 @@ def contact():
 
 # New content pages
 @main.route('/guides')
+@cached_page()
 def guides():
     """Care guides page"""
     return render_template('guides.html')
 
 @main.route('/library')
+@cached_page()
 def library():
     """Medical knowledge library page"""
     return render_template('library.html')
 
 @main.route('/news')
+@cached_page()
 def news():
     """Health news and blog page"""
     return render_template('news.html')
 
 @main.route('/support')
+@cached_page()
 def support():
     """Support and contact page"""
     return render_template('support.html')
@@ -87,18 +106,10 @@ def login():
         return redirect(url_for('main.index'))
     
     # Kiểm tra chế độ bảo trì
-    try:
-        import json
-        import os
-        settings_file = 'app_settings.json'
-        if os.path.exists(settings_file):
-            with open(settings_file, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-                if settings.get('maintenance_mode', False):
-                    flash('Hệ thống đang trong chế độ bảo trì. Vui lòng thử lại sau.', 'warning')
-                    return render_template('login.html')
-    except:
-        pass
+    settings = settings_store.all()
+    if settings.get('maintenance_mode', False):
+        flash('Hệ thống đang trong chế độ bảo trì. Vui lòng thử lại sau.', 'warning')
+        return render_template('login.html')
     
     if request.method == 'POST':
         email = request.form.get('email')
@@ -107,40 +118,39 @@ def login():
         
         print(f"[DEBUG] Login attempt for email: {email}")
         
-        # Kiểm tra giới hạn đăng nhập sai
-        failed_attempts_key = f'failed_login_{email}'
-        failed_attempts = session.get(failed_attempts_key, 0)
-        
         # Lấy cài đặt bảo mật
-        try:
-            import json
-            import os
-            settings_file = 'app_settings.json'
-            if os.path.exists(settings_file):
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                    max_attempts = settings.get('login_attempts', 5)
-                    lockout_duration = settings.get('lockout_duration', 30)
-            else:
-                max_attempts = 5
-                lockout_duration = 30
-        except:
-            max_attempts = 5
-            lockout_duration = 30
-        
-        # Kiểm tra xem tài khoản có bị khóa không
-        lockout_key = f'lockout_{email}'
-        if session.get(lockout_key):
-            flash(f'Tài khoản đã bị khóa do đăng nhập sai quá nhiều lần. Vui lòng thử lại sau {lockout_duration} phút.', 'danger')
-            return render_template('login.html')
+        max_attempts = int(settings.get('login_attempts', 5))
+        lockout_duration = int(settings.get('lockout_duration', 30))
+        lockout_window = max(1, lockout_duration) * 60
+        client_ip = request.remote_addr
+        
+        # Kiểm tra giới hạn đăng nhập sai (phía server, trước khi kiểm tra mật khẩu)
+        retry_after = login_throttle.check(email, client_ip, max_attempts, lockout_window)
+        if retry_after:
+            wait_minutes = max(1, -(-retry_after // 60))
+            flash(f'Tài khoản đã bị khóa do đăng nhập sai quá nhiều lần. Vui lòng thử lại sau {wait_minutes} phút.', 'danger')
+            return render_template('login.html'), 429
         
         user = User.query.filter_by(email=email).first()
         if user:
             print(f"[DEBUG] User found: {user.email}, is_admin: {user.is_admin}")
-            if user.check_password(password):
+            try:
+                password_ok = user.check_password(password)
+            except PasswordServiceBusy:
+                flash('Hệ thống đang quá tải. Vui lòng thử lại sau ít phút.', 'warning')
+                return render_template('login.html'), 503
+            
+            if password_ok:
                 # Đăng nhập thành công, reset số lần sai
-                session.pop(failed_attempts_key, None)
-                session.pop(lockout_key, None)
+                login_throttle.reset(email)
+                
+                # Băm lại mật khẩu nếu tham số Argon2 đã thay đổi (best-effort: quá tải thì để lần sau)
+                try:
+                    if user.rehash_password_if_needed(password):
+                        db.session.commit()
+                        user_cache.invalidate(user.id)
+                except PasswordServiceBusy:
+                    print(f"[DEBUG] Password rehash skipped (busy) for: {email}")
                 
                 login_user(user, remember=remember)
                 print(f"[DEBUG] Login successful for: {email}")
@@ -154,20 +164,18 @@ def login():
                 return redirect(next_page)
             else:
                 # Đăng nhập sai
-                failed_attempts += 1
-                session[failed_attempts_key] = failed_attempts
+                remaining = login_throttle.record_failure(email, client_ip, max_attempts, lockout_window)
                 
-                if failed_attempts >= max_attempts:
+                if remaining <= 0:
                     # Khóa tài khoản
-                    session[lockout_key] = True
                     flash(f'Đăng nhập sai {max_attempts} lần. Tài khoản đã bị khóa trong {lockout_duration} phút.', 'danger')
                 else:
-                    remaining = max_attempts - failed_attempts
                     flash(f'Mật khẩu không đúng. Còn {remaining} lần thử.', 'danger')
                 
                 print(f"[DEBUG] Password incorrect for: {email}")
         else:
             print(f"[DEBUG] User not found: {email}")
+            login_throttle.record_failure(email, client_ip, max_attempts, lockout_window)
             flash('Email không tồn tại trong hệ thống', 'danger')
     
     return render_template('login.html')
@@ -196,7 +204,11 @@ def register():
             email=email,
             display_name=display_name or email.split('@')[0]
         )
-        user.set_password(password)
+        try:
+            user.set_password(password)
+        except PasswordServiceBusy:
+            flash('Hệ thống đang quá tải. Vui lòng thử lại sau ít phút.', 'warning')
+            return render_template('login.html'), 503
         
         db.session.add(user)
         db.session.commit()
@@ -207,6 +219,7 @@ def register():
             'email': user.email,
             'display_name': user.display_name,
             'created_at': user.created_at,
+            'updated_at': user.updated_at,
             'is_admin': user.is_admin,
             'last_login': user.last_login
         }
@@ -258,7 +271,8 @@ def assess_symptoms():
                     'confidence': ai_result['confidence'],
                     'severity_score': ai_result['severity_score'],
                     'precautions': ai_result['precautions']
-                }
+                },
+                'model_version': ai_result['model_version']
             }
         else:
             # Fallback to original assessment
@@ -273,6 +287,7 @@ def assess_symptoms():
             result = assessment_engine.assess_symptoms(
                 symptoms_text, age, days_sick, user_health_info
             )
+            result['model_version'] = 'rules'  # không có model AI: đánh giá theo luật
         
         # Save assessment to database
         assessment = Assessment(
@@ -301,7 +316,8 @@ def assess_symptoms():
             'message': assessment.message,
             'description': assessment.description,
             'recommendations': assessment.recommendations,
-            'created_at': assessment.created_at
+            'created_at': assessment.created_at,
+            'updated_at': assessment.updated_at
         }
         firebase_db.save_assessment(assessment_data)
         
@@ -335,6 +351,7 @@ def user_health():
             current_user.medical_history = data.get('medical_history', '')
             
             db.session.commit()
+            user_cache.invalidate(current_user.id)
             
             return jsonify({
                 'success': True,
@@ -378,6 +395,7 @@ def update_profile():
             current_user.medications = data.get('medications', '')
         
         db.session.commit()
+        user_cache.invalidate(current_user.id)
         
         # Update Firebase
         user_data = {
@@ -399,7 +417,7 @@ def update_profile():
             'is_admin': current_user.is_admin,
             'is_active': getattr(current_user, 'is_active', True),
             'last_login': current_user.last_login,
-            'updated_at': datetime.now()
+            'updated_at': current_user.updated_at
         }
         firebase_db.update_user(current_user.id, user_data)
         
@@ -441,7 +459,8 @@ def submit_contact():
             'email': contact.email,
             'subject': contact.subject,
             'message': contact.message,
-            'created_at': contact.created_at
+            'created_at': contact.created_at,
+            'updated_at': contact.updated_at
         }
         firebase_db.save_contact(contact_data)
         
@@ -451,6 +470,8 @@ def submit_contact():
         return jsonify({'error': f'Lỗi gửi tin nhắn: {str(e)}'}), 500
 
 # AI Diagnosis API routes
+CATALOG_MAX_AGE = 300  # seconds
+
 @api.route('/ai/symptoms', methods=['GET'])
 def get_ai_symptoms():
     """Get available symptoms for AI diagnosis"""
@@ -458,11 +479,16 @@ def get_ai_symptoms():
         ai_diagnosis_system = get_ai_diagnosis()
         if ai_diagnosis_system:
             symptoms_vn = ai_diagnosis_system.get_available_symptoms_vn()
-            return jsonify({
+            response = jsonify({
                 'success': True,
                 'symptoms': symptoms_vn,
-                'total': len(symptoms_vn)
+                'total': len(symptoms_vn),
+                'model_version': ai_diagnosis_system.version
             })
+            # Danh mục chỉ đổi khi đổi model: cho phép cache (và cache bản nén)
+            response.cache_control.public = True
+            response.cache_control.max_age = CATALOG_MAX_AGE
+            return response
         else:
             return jsonify({
                 'success': False,
@@ -524,11 +550,15 @@ def get_ai_diseases():
                 
                 enhanced_diseases.append(enhanced_disease)
             
-            return jsonify({
+            response = jsonify({
                 'success': True,
                 'diseases': enhanced_diseases,
-                'total': len(enhanced_diseases)
+                'total': len(enhanced_diseases),
+                'model_version': ai_diagnosis_system.version
             })
+            response.cache_control.public = True
+            response.cache_control.max_age = CATALOG_MAX_AGE
+            return response
         else:
             return jsonify({
                 'success': False,
@@ -649,7 +679,7 @@ def get_firebase_statistics():
         if not current_user.is_admin:
             return jsonify({'error': 'Unauthorized'}), 403
         
-        stats = firebase_db.get_statistics()
+        stats = dashboard_stats.get()
         return jsonify({
             'success': True,
             'statistics': stats
@@ -738,8 +768,8 @@ def admin_dashboard():
     recent_assessments = Assessment.query.order_by(Assessment.created_at.desc()).limit(5).all()
     recent_contacts = Contact.query.order_by(Contact.created_at.desc()).limit(5).all()
     
-    # Get Firebase stats if available
-    firebase_stats = firebase_db.get_statistics()
+    # Get Firebase stats if available (cached + coalesced, rendered into the page)
+    firebase_stats = dashboard_stats.get()
     
     return render_template('admin_dashboard.html',
                          total_users=total_users,
@@ -798,6 +828,7 @@ def toggle_user_status(user_id):
         
         user.is_active = not user.is_active
         db.session.commit()
+        user_cache.invalidate(user.id)
         
         return jsonify({
             'success': True, 
@@ -819,10 +850,18 @@ def delete_user(user_id):
         if user.is_admin:
             return jsonify({'error': 'Không thể xóa tài khoản admin'}), 400
         
-        db.session.delete(user)
+        # Khóa tài khoản ngay, xóa dữ liệu (SQL + Firestore) trong job nền
+        user.is_active = False
         db.session.commit()
+        user_cache.invalidate(user_id)
+        job_id = job_queue.enqueue('delete_user', {'user_id': user_id}, created_by=current_user.id)
         
-        return jsonify({'success': True, 'message': 'Đã xóa người dùng thành công'})
+        return jsonify({
+            'success': True,
+            'message': 'Đang xóa người dùng',
+            'job_id': job_id,
+            'status_url': url_for('admin.job_status', job_id=job_id)
+        }), 202
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -959,13 +998,8 @@ def update_settings():
         # Lưu vào session để áp dụng ngay lập tức
         session['app_settings'] = settings
         
-        # Lưu vào file JSON để lưu trữ lâu dài
-        import json
-        import os
-        
-        settings_file = 'app_settings.json'
-        with open(settings_file, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, ensure_ascii=False, indent=2)
+        # Lưu vào file JSON để lưu trữ lâu dài (ghi atomic, các worker khác tự nạp lại)
+        settings_store.save(settings)
         
         return jsonify({
             'success': True, 
@@ -983,34 +1017,115 @@ def get_settings():
         return jsonify({'success': False, 'error': 'Unauthorized'}), 403
     
     try:
-        # Đọc cài đặt từ file JSON
-        import json
-        import os
-        
-        settings_file = 'app_settings.json'
-        if os.path.exists(settings_file):
-            with open(settings_file, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-        else:
-            # Cài đặt mặc định
-            settings = {
-                'app_name': 'HealthFirst',
-                'app_description': 'Hệ thống hướng dẫn y tế và chăm sóc sức khỏe tại nhà',
-                'contact_email': 'admin@healthfirst.com',
-                'support_phone': '+84 123 456 789',
-                'two_factor_auth': False,
-                'login_attempts': 5,
-                'lockout_duration': 30,
-                'email_notifications': True,
-                'contact_notifications': True,
-                'emergency_notifications': True,
-                'maintenance_mode': False,
-                'session_timeout': 30,
-                'backup_frequency': 'weekly'
-            }
+        # Đọc cài đặt từ bộ nhớ đệm (tự nạp lại khi file thay đổi)
+        settings = settings_store.all()
         
         return jsonify({'success': True, 'settings': settings})
         
     except Exception as e:
         return jsonify({'success': False, 'error': f'Lỗi lấy cài đặt: {str(e)}'})
 
+@admin.route('/admin/export/<dataset>')
+@login_required
+def export_data(dataset):
+    """Stream assessments/contacts as CSV or NDJSON (?format=&from=&to=&priority=&status=)"""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+    
+    try:
+        return export_response(dataset)
+    except ExportError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+@admin.route('/admin/metrics')
+@login_required
+def admin_metrics():
+    """Runtime cache/metrics of this worker process"""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+    
+    return jsonify({
+        'success': True,
+        'metrics': {
+            'user_cache': user_cache.stats(),
+            'dashboard_stats': dashboard_stats.stats(),
+            'page_cache': page_cache.stats(),
+            'compression': compression.stats(),
+            'jobs': job_queue.stats(),
+            'firestore_sync': firestore_sync.stats(),
+            'firestore': firebase_db.stats(),
+            'firestore_mirror': firestore_mirror.stats(),
+            'database': engine_profile.stats(db.engine),
+            'ai_model': model_holder.stats(),
+            'model_server': model_client.stats()
+        }
+    })
+
+@admin.route('/admin/ai/reload', methods=['POST'])
+@login_required
+def reload_ai_model():
+    """Swap in the AI model from the model files; {"retrain": true} retrains in a background job"""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+    
+    data = request.get_json(silent=True) or {}
+    if data.get('retrain'):
+        job_id = job_queue.enqueue('ai_retrain', {}, created_by=current_user.id)
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status_url': url_for('admin.job_status', job_id=job_id)
+        }), 202
+    
+    try:
+        # Request đang chạy vẫn dùng bản cũ; worker khác nhận file mới sau AI_MODEL_CHECK_INTERVAL
+        return jsonify({'success': True, **model_holder.reload()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Lỗi tải lại model: {str(e)}'}), 500
+
+# Job kinds admin có thể tạo qua POST /admin/jobs
+ADMIN_JOB_KINDS = ('bulk_delete_assessments', 'firebase_resync', 'refresh_stats', 'ai_retrain')
+
+@admin.route('/admin/jobs', methods=['GET', 'POST'])
+@login_required
+def jobs():
+    """List background jobs (?status=&kind=&limit=) or enqueue one"""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+    
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        kind = data.get('kind')
+        payload = data.get('payload') or {}
+        if kind not in ADMIN_JOB_KINDS or not isinstance(payload, dict):
+            return jsonify({'success': False, 'error': f'kind phải là một trong: {", ".join(ADMIN_JOB_KINDS)}'}), 400
+        try:
+            job_id = job_queue.enqueue(kind, payload, created_by=current_user.id)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status_url': url_for('admin.job_status', job_id=job_id)
+        }), 202
+    
+    query = Job.query
+    if request.args.get('status'):
+        query = query.filter(Job.status == request.args['status'])
+    if request.args.get('kind'):
+        query = query.filter(Job.kind == request.args['kind'])
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    items = query.order_by(Job.id.desc()).limit(limit).all()
+    return jsonify({'success': True, 'jobs': [item.to_dict() for item in items]})
+
+@admin.route('/admin/jobs/<int:job_id>')
+@login_required
+def job_status(job_id):
+    """Status/progress of one background job"""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': 'Unauthorized'}), 403
+    
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Không tìm thấy job'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
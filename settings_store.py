@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Cài đặt mặc định khi chưa có app_settings.json
+DEFAULT_SETTINGS = {
+    'app_name': 'HealthFirst',
+    'app_description': 'Hệ thống hướng dẫn y tế và chăm sóc sức khỏe tại nhà',
+    'contact_email': 'admin@healthfirst.com',
+    'support_phone': '+84 123 456 789',
+    'two_factor_auth': False,
+    'login_attempts': 5,
+    'lockout_duration': 30,
+    'email_notifications': True,
+    'contact_notifications': True,
+    'emergency_notifications': True,
+    'maintenance_mode': False,
+    'session_timeout': 30,
+    'backup_frequency': 'weekly'
+}
+
+
+class SettingsStore:
+    """In-memory cache of app_settings.json shared by all requests of a worker.
+
+    The parsed settings are kept in memory and revalidated against the file's
+    (mtime, size) signature at most once every ``check_interval`` seconds, so a
+    save made by another gunicorn worker is picked up without reading the file
+    on every request. Writes go to a temp file that is atomically renamed over
+    the original.
+    """
+
+    def __init__(self, path: str = 'app_settings.json', check_interval: float = 2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._settings: Dict[str, Any] = dict(DEFAULT_SETTINGS)
+        self._signature: Optional[tuple] = None
+        self._checked_at = 0.0
+        self.version = 0
+
+    def init_app(self, app):
+        """Configure the store from the Flask app config"""
+        self.path = app.config.get('SETTINGS_FILE', self.path)
+        self.check_interval = app.config.get('SETTINGS_CHECK_INTERVAL', self.check_interval)
+        with self._lock:
+            self._signature = None
+            self._checked_at = 0.0
+        app.extensions['settings_store'] = self
+
+    def _file_signature(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _reload(self, signature: Optional[tuple]):
+        settings = dict(DEFAULT_SETTINGS)
+        if signature is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    settings.update(json.load(f))
+            except Exception as e:
+                # Giữ bản cache cũ nếu file đang hỏng
+                print(f"❌ Error loading settings: {e}")
+                return
+        self._settings = settings
+        self._signature = signature
+        self.version += 1
+
+    def _revalidate(self):
+        now = time.monotonic()
+        if self._checked_at and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if self._checked_at and now - self._checked_at < self.check_interval:
+                return
+            signature = self._file_signature()
+            if signature != self._signature or self.version == 0:
+                self._reload(signature)
+            self._checked_at = now
+
+    def all(self) -> Dict[str, Any]:
+        """Return a copy of the current settings"""
+        self._revalidate()
+        return dict(self._settings)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a single setting value"""
+        self._revalidate()
+        return self._settings.get(key, default)
+
+    def save(self, settings: Dict[str, Any]):
+        """Atomically persist settings and update the in-memory cache"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.app_settings.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(settings, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            merged = dict(DEFAULT_SETTINGS)
+            merged.update(settings)
+            self._settings = merged
+            self._signature = self._file_signature()
+            self._checked_at = time.monotonic()
+            self.version += 1
+
+
+# Global settings store instance
+settings_store = SettingsStore()
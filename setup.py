@@ -55,10 +55,16 @@ setup(
             "black>=21.0",
             "flake8>=3.8",
             "mypy>=0.800",
+            # build_assets.py icons (Font Awesome subset)
+            "fontawesomefree==6.0.0",
+            "fonttools>=4.0",
+            "brotli>=1.0",
         ],
         "production": [
             "gunicorn>=20.0",
             "gevent>=21.0",
+            "brotli>=1.0",
+            "orjson>=3.8",
         ],
     },
     entry_points={
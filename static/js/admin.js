@@ -0,0 +1,45 @@
+document.addEventListener('DOMContentLoaded', function() {
+    refreshDashboard();
+});
+
+async function refreshDashboard() {
+    try {
+        const response = await fetch('/admin/api/dashboard');
+        const data = await response.json();
+
+        if (data.success) {
+            document.getElementById('totalUsers').textContent = data.stats.total_users;
+            document.getElementById('todayAssessments').textContent = data.stats.today_assessments;
+            document.getElementById('newMessages').textContent = data.stats.new_contacts;
+            document.getElementById('emergencyCases').textContent = data.stats.emergency_cases;
+
+            const recentActivity = document.getElementById('recentActivity');
+            recentActivity.innerHTML = data.recent_activities.map(activity => `
+                <div class="d-flex align-items-center mb-2">
+                    <i class="fas fa-${activity.icon} text-${activity.color} me-2"></i>
+                    <span>${activity.text}</span>
+                    <small class="text-muted ms-auto">${activity.time}</small>
+                </div>
+            `).join('');
+
+            updateChart(data.chart_data);
+        }
+    } catch (error) {
+        console.error('Error loading dashboard data:', error);
+    }
+}
+
+function updateChart(chartData) {
+    const ctx = document.getElementById('assessmentChart').getContext('2d');
+    new Chart(ctx, {
+        type: 'doughnut',
+        data: {
+            labels: chartData.labels,
+            datasets: [{
+                data: chartData.data,
+                backgroundColor: chartData.colors
+            }]
+        },
+        options: { responsive: true }
+    });
+}
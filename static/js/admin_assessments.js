@@ -0,0 +1,84 @@
+// Delete assessment
+function deleteAssessment(assessmentId) {
+    if (confirm('Bạn có chắc muốn xóa đánh giá này? Hành động này không thể hoàn tác!')) {
+        fetch(`/admin/assessment/${assessmentId}/delete`, {
+            method: 'DELETE',
+            headers: {
+                'Content-Type': 'application/json',
+            }
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                showAlert(data.message, 'success');
+                // Remove row from table
+                const row = document.querySelector(`tr[data-assessment-id="${assessmentId}"]`);
+                if (row) row.remove();
+            } else {
+                showAlert(data.error, 'danger');
+            }
+        })
+        .catch(error => {
+            showAlert('Lỗi xóa đánh giá', 'danger');
+        });
+    }
+}
+
+// Show alert function
+function showAlert(message, type = 'info') {
+    const alertDiv = document.createElement('div');
+    alertDiv.className = `alert alert-${type} alert-dismissible fade show position-fixed`;
+    alertDiv.style.cssText = 'top: 20px; right: 20px; z-index: 9999; min-width: 300px;';
+    alertDiv.innerHTML = `
+        ${message}
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+
+    document.body.appendChild(alertDiv);
+
+    setTimeout(() => {
+        if (alertDiv.parentNode) {
+            alertDiv.remove();
+        }
+    }, 5000);
+}
+
+// Search functionality
+document.querySelector('input[placeholder="Tìm kiếm đánh giá..."]').addEventListener('input', function() {
+    const searchTerm = this.value.toLowerCase();
+    const rows = document.querySelectorAll('tbody tr');
+
+    rows.forEach(row => {
+        const text = row.textContent.toLowerCase();
+        row.style.display = text.includes(searchTerm) ? '' : 'none';
+    });
+});
+
+// Filter functionality
+document.querySelectorAll('select').forEach(select => {
+    select.addEventListener('change', function() {
+        const filterValue = this.value.toLowerCase();
+        const rows = document.querySelectorAll('tbody tr');
+
+        rows.forEach(row => {
+            if (!filterValue) {
+                row.style.display = '';
+                return;
+            }
+
+            const priorityCell = row.querySelector('.priority-badge');
+            const userCell = row.querySelector('td:nth-child(2)');
+
+            if (priorityCell && userCell) {
+                const priority = priorityCell.textContent.toLowerCase();
+                const user = userCell.textContent.toLowerCase();
+
+                if (this.options[0].text.includes('ưu tiên')) {
+                    row.style.display = priority.includes(filterValue) ? '' : 'none';
+                } else {
+                    row.style.display = user.includes(filterValue) ? '' : 'none';
+                }
+            }
+        });
+    });
+});
@@ -0,0 +1,243 @@
+ // Load current settings when page loads
+ document.addEventListener('DOMContentLoaded', function() {
+     loadCurrentSettings();
+ });
+
+ // Load current settings from server
+ function loadCurrentSettings() {
+     fetch('/admin/settings/get')
+     .then(response => response.json())
+     .then(data => {
+         if (data.success) {
+             applySettings(data.settings);
+         } else {
+             console.error('Lỗi load cài đặt:', data.error);
+         }
+     })
+     .catch(error => {
+         console.error('Lỗi kết nối:', error);
+     });
+ }
+
+ // Apply settings to form
+ function applySettings(settings) {
+     if (settings.app_name) document.getElementById('appName').value = settings.app_name;
+     if (settings.app_description) document.getElementById('appDescription').value = settings.app_description;
+     if (settings.contact_email) document.getElementById('contactEmail').value = settings.contact_email;
+     if (settings.support_phone) document.getElementById('supportPhone').value = settings.support_phone;
+     if (settings.two_factor_auth !== undefined) document.getElementById('twoFactorAuth').checked = settings.two_factor_auth;
+     if (settings.login_attempts) document.getElementById('loginAttempts').value = settings.login_attempts;
+     if (settings.lockout_duration) document.getElementById('lockoutDuration').value = settings.lockout_duration;
+     if (settings.email_notifications !== undefined) document.getElementById('emailNotifications').checked = settings.email_notifications;
+     if (settings.contact_notifications !== undefined) document.getElementById('contactNotifications').checked = settings.contact_notifications;
+     if (settings.emergency_notifications !== undefined) document.getElementById('emergencyNotifications').checked = settings.emergency_notifications;
+     if (settings.maintenance_mode !== undefined) document.getElementById('maintenanceMode').checked = settings.maintenance_mode;
+     if (settings.session_timeout) document.getElementById('sessionTimeout').value = settings.session_timeout;
+     if (settings.backup_frequency) document.getElementById('backupFrequency').value = settings.backup_frequency;
+ }
+
+ // Save all settings
+ function saveAllSettings() {
+     const settings = {
+         appName: document.getElementById('appName').value,
+         appDescription: document.getElementById('appDescription').value,
+         contactEmail: document.getElementById('contactEmail').value,
+         supportPhone: document.getElementById('supportPhone').value,
+         twoFactorAuth: document.getElementById('twoFactorAuth').checked,
+         loginAttempts: document.getElementById('loginAttempts').value,
+         lockoutDuration: document.getElementById('lockoutDuration').value,
+         emailNotifications: document.getElementById('emailNotifications').checked,
+         contactNotifications: document.getElementById('contactNotifications').checked,
+         emergencyNotifications: document.getElementById('emergencyNotifications').checked,
+         maintenanceMode: document.getElementById('maintenanceMode').checked,
+         sessionTimeout: document.getElementById('sessionTimeout').value,
+         backupFrequency: document.getElementById('backupFrequency').value
+     };
+
+     fetch('/admin/settings/update', {
+         method: 'POST',
+         headers: {
+             'Content-Type': 'application/json',
+         },
+         body: JSON.stringify(settings)
+     })
+     .then(response => response.json())
+     .then(data => {
+         if (data.success) {
+             showAlert(data.message, 'success');
+             // Áp dụng cài đặt ngay lập tức
+             applySettingsImmediately(settings);
+         } else {
+             showAlert(data.error, 'danger');
+         }
+     })
+     .catch(error => {
+         showAlert('Lỗi cập nhật cài đặt', 'danger');
+     });
+ }
+
+ // Áp dụng cài đặt ngay lập tức vào giao diện
+ function applySettingsImmediately(settings) {
+     // Cập nhật tên ứng dụng trong header
+     const headerTitle = document.querySelector('.admin-header h1');
+     if (headerTitle && settings.appName) {
+         headerTitle.innerHTML = `<i class="fas fa-shield-alt me-2"></i>${settings.appName} Admin`;
+     }
+
+     // Cập nhật title của trang
+     if (settings.appName) {
+         document.title = `Cài đặt - ${settings.appName} Admin`;
+     }
+
+     // Áp dụng chế độ bảo trì
+     if (settings.maintenanceMode) {
+         showMaintenanceMode();
+     } else {
+         hideMaintenanceMode();
+     }
+
+     // Áp dụng thời gian session
+     if (settings.sessionTimeout > 0) {
+         setSessionTimeout(settings.sessionTimeout);
+     }
+
+     // Áp dụng thông báo
+     updateNotificationSettings(settings);
+ }
+
+ // Hiển thị chế độ bảo trì
+ function showMaintenanceMode() {
+     const maintenanceBanner = document.createElement('div');
+     maintenanceBanner.id = 'maintenance-banner';
+     maintenanceBanner.className = 'alert alert-warning text-center mb-0';
+     maintenanceBanner.innerHTML = '<strong>⚠️ CHẾ ĐỘ BẢO TRÌ ĐANG BẬT</strong> - Hệ thống đang trong chế độ bảo trì';
+     maintenanceBanner.style.cssText = 'position: fixed; top: 0; left: 0; right: 0; z-index: 9999; border-radius: 0;';
+
+     document.body.insertBefore(maintenanceBanner, document.body.firstChild);
+ }
+
+ // Ẩn chế độ bảo trì
+ function hideMaintenanceMode() {
+     const banner = document.getElementById('maintenance-banner');
+     if (banner) banner.remove();
+ }
+
+ // Thiết lập thời gian session
+ function setSessionTimeout(minutes) {
+     if (window.sessionTimer) clearTimeout(window.sessionTimer);
+
+     window.sessionTimer = setTimeout(() => {
+         showAlert('Phiên làm việc đã hết hạn. Vui lòng đăng nhập lại.', 'warning');
+         setTimeout(() => {
+             window.location.href = '/logout';
+         }, 2000);
+     }, minutes * 60 * 1000);
+ }
+
+ // Cập nhật cài đặt thông báo
+ function updateNotificationSettings(settings) {
+     // Lưu cài đặt thông báo vào localStorage để sử dụng ở các trang khác
+     localStorage.setItem('notificationSettings', JSON.stringify({
+         email: settings.emailNotifications,
+         contact: settings.contactNotifications,
+         emergency: settings.emergencyNotifications
+     }));
+
+     // Hiển thị thông báo xác nhận
+     if (settings.emailNotifications) {
+         console.log('Thông báo email đã được bật');
+     }
+     if (settings.contactNotifications) {
+         console.log('Thông báo tin nhắn mới đã được bật');
+     }
+     if (settings.emergencyNotifications) {
+         console.log('Thông báo đánh giá khẩn cấp đã được bật');
+     }
+ }
+
+// Reset settings to default
+function resetSettings() {
+    if (confirm('Bạn có chắc muốn khôi phục tất cả cài đặt về mặc định?')) {
+        // Reset form values
+        document.getElementById('appName').value = 'HealthFirst';
+        document.getElementById('appDescription').value = 'Hệ thống hướng dẫn y tế và chăm sóc sức khỏe tại nhà';
+        document.getElementById('contactEmail').value = 'admin@healthfirst.com';
+        document.getElementById('supportPhone').value = '+84 123 456 789';
+        document.getElementById('twoFactorAuth').checked = false;
+        document.getElementById('loginAttempts').value = '5';
+        document.getElementById('lockoutDuration').value = '30';
+        document.getElementById('emailNotifications').checked = true;
+        document.getElementById('contactNotifications').checked = true;
+        document.getElementById('emergencyNotifications').checked = true;
+        document.getElementById('maintenanceMode').checked = false;
+        document.getElementById('sessionTimeout').value = '30';
+        document.getElementById('backupFrequency').value = 'weekly';
+
+        showAlert('Đã khôi phục cài đặt về mặc định', 'info');
+    }
+}
+
+// Show alert function
+function showAlert(message, type = 'info') {
+    const alertDiv = document.createElement('div');
+    alertDiv.className = `alert alert-${type} alert-dismissible fade show position-fixed`;
+    alertDiv.style.cssText = 'top: 20px; right: 20px; z-index: 9999; min-width: 300px;';
+    alertDiv.innerHTML = `
+        ${message}
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+
+    document.body.appendChild(alertDiv);
+
+    setTimeout(() => {
+        if (alertDiv.parentNode) {
+            alertDiv.remove();
+        }
+    }, 5000);
+}
+
+         // Auto-save settings on change
+ document.addEventListener('DOMContentLoaded', function() {
+     const inputs = document.querySelectorAll('input, select, textarea');
+     inputs.forEach(input => {
+         input.addEventListener('change', function() {
+             // Auto-save after 2 seconds of inactivity
+             clearTimeout(window.autoSaveTimeout);
+             window.autoSaveTimeout = setTimeout(() => {
+                 saveAllSettings();
+             }, 2000);
+         });
+     });
+
+     // Thêm event listener cho toggle switches
+     const toggleSwitches = document.querySelectorAll('input[type="checkbox"]');
+     toggleSwitches.forEach(toggle => {
+         toggle.addEventListener('change', function() {
+             // Áp dụng ngay lập tức cho một số cài đặt quan trọng
+             const settingName = this.id;
+             const isChecked = this.checked;
+
+             if (settingName === 'maintenanceMode') {
+                 if (isChecked) {
+                     showMaintenanceMode();
+                 } else {
+                     hideMaintenanceMode();
+                 }
+             }
+
+             if (settingName === 'twoFactorAuth') {
+                 if (isChecked) {
+                     showAlert('Xác thực 2 yếu tố đã được bật. Bạn sẽ cần xác thực thêm khi đăng nhập.', 'info');
+                 } else {
+                     showAlert('Xác thực 2 yếu tố đã được tắt.', 'info');
+                 }
+             }
+
+             // Auto-save sau 2 giây
+             clearTimeout(window.autoSaveTimeout);
+             window.autoSaveTimeout = setTimeout(() => {
+                 saveAllSettings();
+             }, 2000);
+         });
+     });
+ });
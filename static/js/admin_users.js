@@ -0,0 +1,341 @@
+let usersData = [];
+let currentFilter = 'all';
+let currentSearch = '';
+let currentPage = 1;
+let usersPerPage = 10;
+let editingUserId = null;
+
+// Initialize page
+document.addEventListener('DOMContentLoaded', function() {
+    loadUsers();
+    setupEventListeners();
+});
+
+function setupEventListeners() {
+    document.getElementById('searchInput').addEventListener('input', function(e) {
+        currentSearch = e.target.value.toLowerCase();
+        currentPage = 1;
+        filterUsers();
+    });
+
+    document.querySelectorAll('.filter-btn').forEach(btn => {
+        btn.addEventListener('click', function() {
+            document.querySelectorAll('.filter-btn').forEach(b => b.classList.remove('active'));
+            this.classList.add('active');
+            currentFilter = this.dataset.filter;
+            currentPage = 1;
+            filterUsers();
+        });
+    });
+}
+
+function loadUsers() {
+    fetch('/api/firebase/users')
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                usersData = data.users;
+                filterUsers();
+            }
+        })
+        .catch(error => {
+            console.error('Error loading users:', error);
+            showAlert('Không thể tải danh sách người dùng', 'danger');
+        });
+}
+
+function filterUsers() {
+    let filtered = usersData;
+
+    // Apply filter
+    if (currentFilter !== 'all') {
+        filtered = filtered.filter(user => {
+            switch(currentFilter) {
+                case 'active':
+                    return user.is_active;
+                case 'inactive':
+                    return !user.is_active;
+                case 'admin':
+                    return user.is_admin;
+                default:
+                    return true;
+            }
+        });
+    }
+
+    // Apply search
+    if (currentSearch) {
+        filtered = filtered.filter(user => 
+            user.email.toLowerCase().includes(currentSearch) ||
+            (user.display_name && user.display_name.toLowerCase().includes(currentSearch))
+        );
+    }
+
+    displayUsers(filtered);
+    generatePagination(filtered.length);
+}
+
+function displayUsers(users) {
+    const tbody = document.getElementById('usersTableBody');
+
+    if (users.length === 0) {
+        tbody.innerHTML = `
+            <tr>
+                <td colspan="6" class="text-center">
+                    <i class="fas fa-info-circle fa-2x text-muted mb-3"></i>
+                    <p class="text-muted">Không tìm thấy người dùng nào</p>
+                </td>
+            </tr>
+        `;
+        return;
+    }
+
+    const startIndex = (currentPage - 1) * usersPerPage;
+    const endIndex = startIndex + usersPerPage;
+    const pageUsers = users.slice(startIndex, endIndex);
+
+    tbody.innerHTML = pageUsers.map(user => `
+        <tr>
+            <td>
+                <div class="d-flex align-items-center">
+                    <div class="user-avatar me-3">
+                        ${user.display_name ? user.display_name.charAt(0).toUpperCase() : user.email.charAt(0).toUpperCase()}
+                    </div>
+                    <div>
+                        <strong>${user.display_name || 'Chưa cập nhật'}</strong>
+                        <br><small class="text-muted">ID: ${user.id}</small>
+                    </div>
+                </div>
+            </td>
+            <td>${user.email}</td>
+            <td>
+                <span class="badge ${user.is_admin ? 'bg-danger' : 'bg-secondary'}">
+                    ${user.is_admin ? 'Admin' : 'Người dùng'}
+                </span>
+            </td>
+            <td>
+                <span class="status-badge ${user.is_active ? 'status-active' : 'status-inactive'}">
+                    ${user.is_active ? 'Hoạt động' : 'Không hoạt động'}
+                </span>
+            </td>
+            <td>${formatDate(user.created_at)}</td>
+            <td>
+                <button class="btn btn-sm btn-admin me-1" onclick="editUser('${user.id}')">
+                    <i class="fas fa-edit"></i>
+                </button>
+                <button class="btn btn-sm btn-delete" onclick="deleteUser('${user.id}')">
+                    <i class="fas fa-trash"></i>
+                </button>
+            </td>
+        </tr>
+    `).join('');
+}
+
+function generatePagination(totalUsers) {
+    const totalPages = Math.ceil(totalUsers / usersPerPage);
+    const pagination = document.getElementById('pagination');
+
+    if (totalPages <= 1) {
+        pagination.innerHTML = '';
+        return;
+    }
+
+    let paginationHTML = '';
+
+    // Previous button
+    paginationHTML += `
+        <li class="page-item ${currentPage === 1 ? 'disabled' : ''}">
+            <a class="page-link" href="#" onclick="changePage(${currentPage - 1})">Trước</a>
+        </li>
+    `;
+
+    // Page numbers
+    for (let i = 1; i <= totalPages; i++) {
+        if (i === 1 || i === totalPages || (i >= currentPage - 2 && i <= currentPage + 2)) {
+            paginationHTML += `
+                <li class="page-item ${i === currentPage ? 'active' : ''}">
+                    <a class="page-link" href="#" onclick="changePage(${i})">${i}</a>
+                </li>
+            `;
+        } else if (i === currentPage - 3 || i === currentPage + 3) {
+            paginationHTML += '<li class="page-item disabled"><span class="page-link">...</span></li>';
+        }
+    }
+
+    // Next button
+    paginationHTML += `
+        <li class="page-item ${currentPage === totalPages ? 'disabled' : ''}">
+            <a class="page-link" href="#" onclick="changePage(${currentPage + 1})">Sau</a>
+        </li>
+    `;
+
+    pagination.innerHTML = paginationHTML;
+}
+
+function changePage(page) {
+    if (page < 1) return;
+    currentPage = page;
+    filterUsers();
+}
+
+function showAddUserModal() {
+    editingUserId = null;
+    document.getElementById('userModalTitle').innerHTML = '<i class="fas fa-user-plus me-2"></i>Thêm người dùng mới';
+    document.getElementById('userForm').reset();
+    document.getElementById('userPassword').required = true;
+
+    const modal = new bootstrap.Modal(document.getElementById('userModal'));
+    modal.show();
+}
+
+function editUser(userId) {
+    const user = usersData.find(u => u.id === userId);
+    if (!user) return;
+
+    editingUserId = userId;
+    document.getElementById('userModalTitle').innerHTML = '<i class="fas fa-user-edit me-2"></i>Chỉnh sửa người dùng';
+    document.getElementById('userPassword').required = false;
+
+    // Fill form with user data
+    const form = document.getElementById('userForm');
+    form.email.value = user.email || '';
+    form.display_name.value = user.display_name || '';
+    form.is_admin.value = user.is_admin || 'false';
+    form.is_active.value = user.is_active || 'true';
+    form.gender.value = user.gender || '';
+    form.age.value = user.age || '';
+    form.phone.value = user.phone || '';
+    form.address.value = user.address || '';
+
+    const modal = new bootstrap.Modal(document.getElementById('userModal'));
+    modal.show();
+}
+
+function saveUser() {
+    const form = document.getElementById('userForm');
+    const formData = new FormData(form);
+    const data = Object.fromEntries(formData.entries());
+
+    // Convert string values to boolean
+    data.is_admin = data.is_admin === 'true';
+    data.is_active = data.is_active === 'true';
+
+    // Remove empty password if editing
+    if (!editingUserId && !data.password) {
+        showAlert('Mật khẩu là bắt buộc cho người dùng mới', 'danger');
+        return;
+    }
+
+    if (editingUserId && !data.password) {
+        delete data.password;
+    }
+
+    const url = editingUserId ? `/api/firebase/users/${editingUserId}` : '/api/firebase/users';
+    const method = editingUserId ? 'PUT' : 'POST';
+
+    fetch(url, {
+        method: method,
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(data)
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            showAlert(editingUserId ? 'Cập nhật người dùng thành công!' : 'Thêm người dùng thành công!', 'success');
+
+            // Close modal and reload data
+            const modal = bootstrap.Modal.getInstance(document.getElementById('userModal'));
+            modal.hide();
+
+            setTimeout(() => {
+                loadUsers();
+            }, 1000);
+        } else {
+            showAlert(result.error || 'Có lỗi xảy ra', 'danger');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showAlert('Có lỗi xảy ra khi lưu người dùng', 'danger');
+    });
+}
+
+function deleteUser(userId) {
+    editingUserId = userId;
+    const modal = new bootstrap.Modal(document.getElementById('deleteModal'));
+    modal.show();
+}
+
+function confirmDelete() {
+    if (!editingUserId) return;
+
+    fetch(`/api/firebase/users/${editingUserId}`, {
+        method: 'DELETE'
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            showAlert('Xóa người dùng thành công!', 'success');
+
+            // Close modal and reload data
+            const modal = bootstrap.Modal.getInstance(document.getElementById('deleteModal'));
+            modal.hide();
+
+            setTimeout(() => {
+                loadUsers();
+            }, 1000);
+        } else {
+            showAlert(result.error || 'Có lỗi xảy ra khi xóa', 'danger');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showAlert('Có lỗi xảy ra khi xóa người dùng', 'danger');
+    });
+}
+
+function searchUsers() {
+    const searchInput = document.getElementById('searchInput');
+    currentSearch = searchInput.value.toLowerCase();
+    currentPage = 1;
+    filterUsers();
+}
+
+function toggleSidebar() {
+    const sidebar = document.getElementById('sidebar');
+    sidebar.classList.toggle('show');
+}
+
+function formatDate(dateString) {
+    if (!dateString) return 'N/A';
+
+    const date = new Date(dateString);
+    return date.toLocaleDateString('vi-VN', {
+        year: 'numeric',
+        month: '2-digit',
+        day: '2-digit',
+        hour: '2-digit',
+        minute: '2-digit'
+    });
+}
+
+function showAlert(message, type) {
+    const alertDiv = document.createElement('div');
+    alertDiv.className = `alert alert-${type} alert-dismissible fade show position-fixed`;
+    alertDiv.style.cssText = 'top: 20px; right: 20px; z-index: 9999; min-width: 300px;';
+    alertDiv.innerHTML = `
+        ${message}
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+
+    document.body.appendChild(alertDiv);
+
+    // Auto remove after 5 seconds
+    setTimeout(() => {
+        if (alertDiv.parentNode) {
+            alertDiv.remove();
+        }
+    }, 5000);
+}
@@ -0,0 +1,49 @@
+// Contact form submission
+document.getElementById('contactForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const formData = new FormData(this);
+    const data = {
+        name: formData.get('name'),
+        email: formData.get('email'),
+        subject: formData.get('subject'),
+        message: formData.get('message')
+    };
+
+    try {
+        const response = await fetch('/api/contact', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (response.ok) {
+            showMessage('Thành công!', 'Tin nhắn của bạn đã được gửi. Chúng tôi sẽ phản hồi sớm nhất có thể.', 'success');
+            this.reset();
+        } else {
+            showMessage('Lỗi!', result.error || 'Không thể gửi tin nhắn. Vui lòng thử lại.', 'danger');
+        }
+    } catch (error) {
+        showMessage('Lỗi!', 'Lỗi kết nối: ' + error.message, 'danger');
+    }
+});
+
+function showMessage(title, message, type) {
+    const messageDiv = document.getElementById('contactMessage');
+    messageDiv.className = `alert alert-${type} alert-dismissible fade show`;
+    messageDiv.innerHTML = `
+        <strong>${title}</strong><br>
+        ${message}
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+    messageDiv.style.display = 'block';
+
+    // Auto hide after 5 seconds
+    setTimeout(() => {
+        messageDiv.style.display = 'none';
+    }, 5000);
+}
@@ -0,0 +1,180 @@
+// Disease data will be loaded here
+let diseasesData = [];
+let currentFilter = 'all';
+let currentSearch = '';
+
+// Initialize page
+document.addEventListener('DOMContentLoaded', function() {
+    loadDiseasesData();
+    setupEventListeners();
+});
+
+function loadDiseasesData() {
+    // Load diseases from AI system
+    fetch('/api/ai/diseases')
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                diseasesData = data.diseases.map(disease => ({
+                    id: disease.id || Math.random(),
+                    name: disease.vn || disease.en,
+                    name_en: disease.en,
+                    category: getCategoryFromDisease(disease.en),
+                    icon: getIconFromDisease(disease.en),
+                    description: disease.description || 'Mô tả bệnh sẽ được cập nhật',
+                    symptoms: disease.symptoms || [],
+                    care: disease.care || [],
+                    prevention: disease.prevention || [],
+                    emergency: isEmergencyDisease(disease.en)
+                }));
+                displayDiseases(diseasesData);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading diseases:', error);
+            // Fallback data
+            loadFallbackData();
+        });
+}
+
+function getCategoryFromDisease(diseaseName) {
+    const name = diseaseName.toLowerCase();
+    if (name.includes('hepatitis') || name.includes('liver')) return 'digestive';
+    if (name.includes('heart') || name.includes('hypertension')) return 'cardiology';
+    if (name.includes('asthma') || name.includes('pneumonia')) return 'respiratory';
+    if (name.includes('diabetes')) return 'internal';
+    if (name.includes('arthritis')) return 'surgery';
+    if (name.includes('migraine')) return 'neurology';
+    if (name.includes('cold') || name.includes('flu')) return 'respiratory';
+    if (name.includes('gastroenteritis')) return 'digestive';
+    return 'internal';
+}
+
+function getIconFromDisease(diseaseName) {
+    const name = diseaseName.toLowerCase();
+    if (name.includes('hepatitis') || name.includes('liver')) return 'fas fa-liver';
+    if (name.includes('heart')) return 'fas fa-heartbeat';
+    if (name.includes('asthma') || name.includes('pneumonia')) return 'fas fa-lungs';
+    if (name.includes('diabetes')) return 'fas fa-tint';
+    if (name.includes('arthritis')) return 'fas fa-bone';
+    if (name.includes('migraine')) return 'fas fa-head-side-virus';
+    if (name.includes('cold') || name.includes('flu')) return 'fas fa-thermometer-half';
+    if (name.includes('gastroenteritis')) return 'fas fa-stomach';
+    return 'fas fa-stethoscope';
+}
+
+function isEmergencyDisease(diseaseName) {
+    const name = diseaseName.toLowerCase();
+    return name.includes('heart attack') || name.includes('stroke') || name.includes('asthma');
+}
+
+function loadFallbackData() {
+    diseasesData = [
+        {
+            id: 1,
+            name: "Cảm lạnh thông thường",
+            name_en: "Common Cold",
+            category: "respiratory",
+            icon: "fas fa-thermometer-half",
+            description: "Nhiễm virus đường hô hấp trên gây ra các triệu chứng nhẹ.",
+            symptoms: ["Ho", "Sổ mũi", "Đau họng", "Hắt hơi"],
+            care: ["Nghỉ ngơi đầy đủ", "Uống nhiều nước", "Dùng thuốc không kê đơn"],
+            prevention: ["Rửa tay thường xuyên", "Tránh tiếp xúc với người bệnh"],
+            emergency: false
+        }
+    ];
+    displayDiseases(diseasesData);
+}
+
+function setupEventListeners() {
+    document.getElementById('searchInput').addEventListener('input', function(e) {
+        currentSearch = e.target.value.toLowerCase();
+        filterDiseases();
+    });
+
+    document.querySelectorAll('.filter-btn').forEach(btn => {
+        btn.addEventListener('click', function() {
+            document.querySelectorAll('.filter-btn').forEach(b => b.classList.remove('active'));
+            this.classList.add('active');
+            currentFilter = this.dataset.category;
+            filterDiseases();
+        });
+    });
+}
+
+function filterDiseases() {
+    let filtered = diseasesData;
+
+    if (currentFilter !== 'all') {
+        filtered = filtered.filter(disease => disease.category === currentFilter);
+    }
+
+    if (currentSearch) {
+        filtered = filtered.filter(disease => 
+            disease.name.toLowerCase().includes(currentSearch) ||
+            disease.description.toLowerCase().includes(currentSearch)
+        );
+    }
+
+    displayDiseases(filtered);
+}
+
+function displayDiseases(diseases) {
+    const container = document.getElementById('diseasesContainer');
+
+    if (diseases.length === 0) {
+        container.innerHTML = `
+            <div class="col-12 text-center">
+                <h4>Không tìm thấy kết quả</h4>
+                <p>Thử tìm kiếm với từ khóa khác.</p>
+            </div>
+        `;
+        return;
+    }
+
+    container.innerHTML = diseases.map(disease => `
+        <div class="col-lg-6 col-xl-4">
+            <div class="disease-card">
+                <div class="disease-header">
+                    <div class="disease-icon">
+                        <i class="${disease.icon} fa-2x mb-3"></i>
+                    </div>
+                    <div class="disease-title">
+                        <h4>${disease.name}</h4>
+                        <small>${disease.name_en}</small>
+                    </div>
+                </div>
+                <div class="disease-content">
+                    <p class="mb-3">${disease.description}</p>
+
+                    <h6><i class="fas fa-exclamation-triangle me-2"></i>Triệu chứng:</h6>
+                    <div class="mb-3">
+                        ${disease.symptoms.map(symptom => 
+                            `<span class="badge bg-light text-dark me-1 mb-1">${symptom}</span>`
+                        ).join('')}
+                    </div>
+
+                    <h6><i class="fas fa-hands-helping me-2"></i>Chăm sóc:</h6>
+                    <ul class="mb-3">
+                        ${disease.care.map(care => 
+                            `<li>${care}</li>`
+                        ).join('')}
+                    </ul>
+
+                    <h6><i class="fas fa-shield-alt me-2"></i>Phòng ngừa:</h6>
+                    <ul>
+                        ${disease.prevention.map(prevention => 
+                            `<li>${prevention}</li>`
+                        ).join('')}
+                    </ul>
+                </div>
+            </div>
+        </div>
+    `).join('');
+}
+
+function searchDiseases() {
+    const searchInput = document.getElementById('searchInput');
+    currentSearch = searchInput.value.toLowerCase();
+    filterDiseases();
+}
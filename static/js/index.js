@@ -0,0 +1,65 @@
+// Health Assessment Form Handler
+document.getElementById('assessmentForm')?.addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const formData = new FormData(this);
+    const data = {
+        symptoms: formData.get('symptoms'),
+        age: parseInt(formData.get('age')),
+        days_sick: parseInt(formData.get('days_sick'))
+    };
+
+    try {
+        const response = await fetch('/api/assess', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (response.ok) {
+            displayAssessmentResult(result);
+        } else {
+            alert('Lỗi: ' + (result.error || 'Không thể đánh giá triệu chứng'));
+        }
+    } catch (error) {
+        alert('Lỗi kết nối: ' + error.message);
+    }
+});
+
+function displayAssessmentResult(result) {
+    const resultDiv = document.getElementById('assessmentResult');
+    const alert = document.getElementById('resultAlert');
+    const title = document.getElementById('resultTitle');
+    const description = document.getElementById('resultDescription');
+    const recommendations = document.getElementById('resultRecommendations');
+
+    // Set alert class based on priority
+    alert.className = 'alert';
+    if (result.priority === 'emergency') {
+        alert.classList.add('alert-danger');
+    } else if (result.priority === 'high') {
+        alert.classList.add('alert-warning');
+    } else if (result.priority === 'consult_doctor') {
+        alert.classList.add('alert-info');
+    } else {
+        alert.classList.add('alert-success');
+    }
+
+    title.textContent = result.message;
+    description.textContent = result.description;
+
+    // Display recommendations
+    if (result.recommendations && result.recommendations.length > 0) {
+        recommendations.innerHTML = '<h6>Khuyến nghị:</h6><ul>' + 
+            result.recommendations.map(rec => `<li>${rec}</li>`).join('') + '</ul>';
+    } else {
+        recommendations.innerHTML = '';
+    }
+
+    resultDiv.style.display = 'block';
+    resultDiv.scrollIntoView({ behavior: 'smooth' });
+}
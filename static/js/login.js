@@ -0,0 +1,22 @@
+// Password confirmation validation
+document.getElementById('confirmPassword')?.addEventListener('input', function() {
+    const password = document.getElementById('registerPassword').value;
+    const confirm = this.value;
+
+    if (password !== confirm) {
+        this.setCustomValidity('Mật khẩu xác nhận không khớp');
+    } else {
+        this.setCustomValidity('');
+    }
+});
+
+// Flash message display
+if (typeof flashMessages !== 'undefined') {
+    flashMessages.forEach(function(msg) {
+        const alertDiv = document.createElement('div');
+        const alertClass = msg.category === 'error' ? 'danger' : msg.category;
+        alertDiv.className = 'alert alert-' + alertClass + ' alert-dismissible fade show';
+        alertDiv.innerHTML = msg.message + '<button type="button" class="btn-close" data-bs-dismiss="alert"></button>';
+        document.querySelector('.auth-container .p-4').insertBefore(alertDiv, document.querySelector('.auth-container .p-4').firstChild);
+    });
+}
@@ -0,0 +1,221 @@
+// Load user data and calculate health metrics
+document.addEventListener('DOMContentLoaded', function() {
+    loadUserData();
+    loadHealthHistory();
+    loadAIDiagnosisHistory();
+});
+
+function loadUserData() {
+    // Calculate BMI and other metrics
+    const height = parseInt(PROFILE_DATA.height) || 0;
+    const weight = parseInt(PROFILE_DATA.weight) || 0;
+    const isMale = PROFILE_DATA.gender === 'Nam';
+
+    if (height > 0 && weight > 0) {
+        const heightInMeters = height / 100;
+        const bmi = (weight / (heightInMeters * heightInMeters)).toFixed(1);
+        const bmiCategory = getBMICategory(bmi);
+        const idealWeight = calculateIdealWeight(height, isMale);
+
+        document.getElementById('bmiValue').textContent = bmi;
+        document.getElementById('bmiStatus').textContent = bmiCategory;
+        document.getElementById('bmiCategory').textContent = bmiCategory;
+        document.getElementById('idealWeight').textContent = idealWeight;
+    }
+}
+
+function getBMICategory(bmi) {
+    if (bmi < 18.5) return 'Thiếu cân';
+    if (bmi < 25) return 'Bình thường';
+    if (bmi < 30) return 'Thừa cân';
+    return 'Béo phì';
+}
+
+function calculateIdealWeight(height, isMale) {
+    // Simple ideal weight calculation
+    if (isMale) {
+        return Math.round((height - 100) * 0.9);
+    } else {
+        return Math.round((height - 100) * 0.85);
+    }
+}
+
+function loadHealthHistory() {
+    fetch(`/api/firebase/user-history/${PROFILE_DATA.id}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.success && data.history) {
+                displayHealthHistory(data.history);
+                document.getElementById('assessmentCount').textContent = data.history.length;
+            } else {
+                displayHealthHistory([]);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading health history:', error);
+            displayHealthHistory([]);
+        });
+}
+
+function loadAIDiagnosisHistory() {
+    fetch(`/api/firebase/diagnosis-history/${PROFILE_DATA.id}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.success && data.history) {
+                displayAIDiagnosisHistory(data.history);
+            } else {
+                displayAIDiagnosisHistory([]);
+            }
+        })
+        .catch(error => {
+            console.error('Error loading AI diagnosis history:', error);
+            displayAIDiagnosisHistory([]);
+        });
+}
+
+function displayHealthHistory(history) {
+    const container = document.getElementById('healthHistory');
+
+    if (history.length === 0) {
+        container.innerHTML = `
+            <div class="text-center py-4">
+                <i class="fas fa-clipboard-list fa-3x text-muted mb-3"></i>
+                <h5 class="text-muted">Chưa có lịch sử đánh giá</h5>
+                <p class="text-muted">Hãy sử dụng chức năng chẩn đoán triệu chứng để bắt đầu theo dõi sức khỏe</p>
+                <a href="/symptom-diagnosis" class="btn btn-primary">
+                    <i class="fas fa-stethoscope me-2"></i>Chẩn đoán ngay
+                </a>
+            </div>
+        `;
+        return;
+    }
+
+    container.innerHTML = history.map(assessment => `
+        <div class="history-card">
+            <div class="history-header">
+                <div>
+                    <h6 class="mb-0">
+                        <i class="fas fa-calendar me-2"></i>
+                        ${new Date(assessment.created_at).toLocaleDateString('vi-VN')}
+                    </h6>
+                    <small>${assessment.symptoms}</small>
+                </div>
+                <span class="badge bg-${getPriorityColor(assessment.priority)}">${assessment.priority}</span>
+            </div>
+            <div class="history-content">
+                <p class="mb-2"><strong>Kết quả:</strong> ${assessment.message}</p>
+                <p class="mb-2"><strong>Mô tả:</strong> ${assessment.description || 'Không có mô tả'}</p>
+                ${assessment.recommendations ? `<p class="mb-0"><strong>Khuyến nghị:</strong> ${assessment.recommendations}</p>` : ''}
+            </div>
+        </div>
+    `).join('');
+}
+
+function displayAIDiagnosisHistory(history) {
+    const container = document.getElementById('aiDiagnosisHistory');
+
+    if (history.length === 0) {
+        container.innerHTML = `
+            <div class="text-center py-4">
+                <i class="fas fa-robot fa-3x text-muted mb-3"></i>
+                <h5 class="text-muted">Chưa có lịch sử chẩn đoán AI</h5>
+                <p class="text-muted">Hãy sử dụng chức năng chẩn đoán AI để bắt đầu theo dõi sức khỏe</p>
+                <a href="/symptom-diagnosis" class="btn btn-primary">
+                    <i class="fas fa-robot me-2"></i>Chẩn đoán AI ngay
+                </a>
+            </div>
+        `;
+        return;
+    }
+
+    container.innerHTML = history.map(diagnosis => `
+        <div class="history-card">
+            <div class="history-header">
+                <div>
+                    <h6 class="mb-0">
+                        <i class="fas fa-robot me-2"></i>
+                        Chẩn đoán AI - ${new Date(diagnosis.created_at).toLocaleDateString('vi-VN')}
+                    </h6>
+                    <small>Tuổi: ${diagnosis.age} tuổi | Triệu chứng: ${diagnosis.symptoms.join(', ')}</small>
+                </div>
+                <span class="badge bg-info">AI</span>
+            </div>
+            <div class="history-content">
+                ${diagnosis.diagnosis.diseases ? diagnosis.diagnosis.diseases.map(disease => `
+                    <div class="mb-3 p-3 bg-light rounded">
+                        <h6 class="text-primary">${disease.name}</h6>
+                        <p class="mb-2"><strong>Độ tin cậy:</strong> ${disease.confidence || 0}%</p>
+                        ${disease.description ? `<p class="mb-2"><strong>Mô tả:</strong> ${disease.description}</p>` : ''}
+                        ${disease.recommendations ? `<p class="mb-0"><strong>Khuyến nghị:</strong> ${disease.recommendations}</p>` : ''}
+                    </div>
+                `).join('') : '<p>Không có kết quả chẩn đoán</p>'}
+                ${diagnosis.custom_symptoms ? `<p class="mt-2"><strong>Triệu chứng khác:</strong> ${diagnosis.custom_symptoms}</p>` : ''}
+            </div>
+        </div>
+    `).join('');
+}
+
+function getPriorityColor(priority) {
+    switch(priority) {
+        case 'Cao': return 'danger';
+        case 'Trung bình': return 'warning';
+        case 'Thấp': return 'success';
+        default: return 'secondary';
+    }
+}
+
+function saveProfile() {
+    const form = document.getElementById('editProfileForm');
+    const formData = new FormData(form);
+    const data = Object.fromEntries(formData.entries());
+
+    // Remove empty values
+    Object.keys(data).forEach(key => {
+        if (data[key] === '') {
+            delete data[key];
+        }
+    });
+
+    fetch('/api/user/update', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(data)
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (result.success) {
+            showAlert('Cập nhật hồ sơ thành công!', 'success');
+            // Reload page to show updated data
+            setTimeout(() => {
+                location.reload();
+            }, 1500);
+        } else {
+            showAlert(result.error || 'Có lỗi xảy ra khi cập nhật', 'danger');
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        showAlert('Có lỗi xảy ra khi cập nhật hồ sơ', 'danger');
+    });
+}
+
+function showAlert(message, type) {
+    const alertDiv = document.createElement('div');
+    alertDiv.className = `alert alert-${type} alert-dismissible fade show position-fixed`;
+    alertDiv.style.cssText = 'top: 20px; right: 20px; z-index: 9999; min-width: 300px;';
+    alertDiv.innerHTML = `
+        ${message}
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+
+    document.body.appendChild(alertDiv);
+
+    // Auto remove after 5 seconds
+    setTimeout(() => {
+        if (alertDiv.parentNode) {
+            alertDiv.remove();
+        }
+    }, 5000);
+}
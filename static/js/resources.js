@@ -0,0 +1,113 @@
+// Search functionality
+document.getElementById('searchInput').addEventListener('input', function() {
+    const searchTerm = this.value.toLowerCase();
+    const resources = document.querySelectorAll('#resourcesGrid > div');
+
+    resources.forEach(resource => {
+        const title = resource.querySelector('.card-title').textContent.toLowerCase();
+        const description = resource.querySelector('.card-text').textContent.toLowerCase();
+
+        if (title.includes(searchTerm) || description.includes(searchTerm)) {
+            resource.style.display = 'block';
+        } else {
+            resource.style.display = 'none';
+        }
+    });
+});
+
+// Category filter
+document.getElementById('categoryFilter').addEventListener('change', function() {
+    const selectedCategory = this.value;
+    filterResources(selectedCategory);
+});
+
+// Filter buttons
+document.querySelectorAll('.filter-btn').forEach(btn => {
+    btn.addEventListener('click', function() {
+        const category = this.dataset.category;
+        filterResources(category);
+
+        // Update active button
+        document.querySelectorAll('.filter-btn').forEach(b => b.classList.remove('active'));
+        this.classList.add('active');
+    });
+});
+
+function filterResources(category) {
+    const resources = document.querySelectorAll('#resourcesGrid > div');
+
+    resources.forEach(resource => {
+        if (category === 'all' || category === '') {
+            resource.style.display = 'block';
+        } else if (resource.dataset.category === category) {
+            resource.style.display = 'block';
+        } else {
+            resource.style.display = 'none';
+        }
+    });
+}
+
+// View resource details
+function viewResource(resourceId) {
+    const modal = new bootstrap.Modal(document.getElementById('resourceModal'));
+    const title = document.getElementById('resourceModalTitle');
+    const body = document.getElementById('resourceModalBody');
+
+    // Load resource content based on ID
+    const resourceContent = getResourceContent(resourceId);
+    title.textContent = resourceContent.title;
+    body.innerHTML = resourceContent.content;
+
+    modal.show();
+}
+
+function getResourceContent(resourceId) {
+    const resources = {
+        'emergency-signs': {
+            title: 'Dấu hiệu cần gọi cấp cứu',
+            content: `
+                <h6>🚨 Các dấu hiệu cần gọi cấp cứu 115 ngay lập tức:</h6>
+                <ul>
+                    <li><strong>Khó thở:</strong> Thở gấp, thở nông, cảm giác nghẹt thở</li>
+                    <li><strong>Đau ngực:</strong> Đau dữ dội, đau lan ra cánh tay, hàm</li>
+                    <li><strong>Chảy máu:</strong> Chảy máu không cầm được, chảy máu nhiều</li>
+                    <li><strong>Mất ý thức:</strong> Ngất xỉu, không phản ứng</li>
+                    <li><strong>Đau đầu dữ dội:</strong> Đau đột ngột, đau như sét đánh</li>
+                    <li><strong>Liệt nửa người:</strong> Yếu hoặc liệt một bên cơ thể</li>
+                </ul>
+                <div class="alert alert-danger">
+                    <strong>Lưu ý:</strong> Khi gặp các dấu hiệu trên, hãy gọi 115 ngay lập tức và 
+                    không tự ý di chuyển bệnh nhân nếu không cần thiết.
+                </div>
+            `
+        },
+        'first-aid-basic': {
+            title: 'Hướng dẫn sơ cứu cơ bản',
+            content: `
+                <h6>🩹 Các kỹ năng sơ cứu cơ bản:</h6>
+                <ul>
+                    <li><strong>Vết thương nhỏ:</strong> Rửa sạch bằng nước, băng vết thương</li>
+                    <li><strong>Chảy máu cam:</strong> Ngồi thẳng, bóp mũi, nghiêng đầu về phía trước</li>
+                    <li><strong>Bỏng nhẹ:</strong> Ngâm vùng bỏng trong nước mát 10-15 phút</li>
+                    <li><strong>Gãy xương:</strong> Cố định chi, không di chuyển, gọi cấp cứu</li>
+                    <li><strong>Ngạt thở:</strong> Thực hiện thủ thuật Heimlich</li>
+                </ul>
+                <div class="alert alert-warning">
+                    <strong>Lưu ý:</strong> Sơ cứu chỉ là biện pháp tạm thời, 
+                    vẫn cần đưa bệnh nhân đến cơ sở y tế để được điều trị đầy đủ.
+                </div>
+            `
+        }
+        // Add more resources as needed
+    };
+
+    return resources[resourceId] || {
+        title: 'Tài liệu không tìm thấy',
+        content: '<p>Tài liệu này đang được cập nhật. Vui lòng quay lại sau.</p>'
+    };
+}
+
+function downloadResource() {
+    // Implement download functionality
+    alert('Tính năng tải xuống đang được phát triển!');
+}
@@ -0,0 +1,16 @@
+document.getElementById('supportForm').addEventListener('submit', async function(e){
+    e.preventDefault();
+    const data = Object.fromEntries(new FormData(this).entries());
+    const res = await fetch('/api/contact', {method:'POST', headers:{'Content-Type':'application/json'}, body: JSON.stringify(data)});
+    const result = await res.json();
+    const box = document.getElementById('supportMessage');
+    if(res.ok){
+        box.className = 'alert alert-success';
+        box.textContent = 'Gửi thành công! Chúng tôi sẽ phản hồi sớm.';
+        this.reset();
+    } else {
+        box.className = 'alert alert-danger';
+        box.textContent = result.error || 'Không thể gửi, vui lòng thử lại.';
+    }
+    box.style.display = 'block';
+});
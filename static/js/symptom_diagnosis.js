@@ -0,0 +1,310 @@
+let allSymptoms = [];
+let displayedSymptoms = 0;
+const symptomsPerLoad = 20;
+
+// Load symptoms on page load
+document.addEventListener('DOMContentLoaded', function() {
+    loadSymptoms();
+});
+
+// Load available symptoms from AI API
+async function loadSymptoms() {
+    try {
+        const response = await fetch('/api/ai/symptoms');
+        const data = await response.json();
+
+        if (data.success) {
+            allSymptoms = data.symptoms;
+            displaySymptoms();
+        } else {
+            console.error('Failed to load symptoms:', data.error);
+            showFallbackSymptoms();
+        }
+    } catch (error) {
+        console.error('Error loading symptoms:', error);
+        showFallbackSymptoms();
+    }
+}
+
+// Display symptoms in grid
+function displaySymptoms() {
+    const grid = document.getElementById('symptomGrid');
+    const endIndex = Math.min(displayedSymptoms + symptomsPerLoad, allSymptoms.length);
+
+    for (let i = displayedSymptoms; i < endIndex; i++) {
+        const symptom = allSymptoms[i];
+        const symptomDiv = document.createElement('div');
+        symptomDiv.className = 'col-md-6 col-lg-4';
+        symptomDiv.innerHTML = `
+            <input type="checkbox" class="symptom-checkbox" id="symptom_${i}" name="symptoms" value="${symptom}">
+            <label class="symptom-label" for="symptom_${i}">${symptom.replace(/_/g, ' ')}</label>
+        `;
+        grid.appendChild(symptomDiv);
+    }
+
+    displayedSymptoms = endIndex;
+
+    // Hide load more button if all symptoms are displayed
+    if (displayedSymptoms >= allSymptoms.length) {
+        document.getElementById('loadMoreSymptoms').style.display = 'none';
+    }
+}
+
+// Show fallback symptoms if API fails
+function showFallbackSymptoms() {
+    const fallbackSymptoms = [
+        'fever', 'headache', 'cough', 'fatigue', 'nausea', 'vomiting', 'diarrhea',
+        'abdominal_pain', 'chest_pain', 'shortness_of_breath', 'dizziness',
+        'joint_pain', 'muscle_pain', 'skin_rash', 'itching', 'swelling'
+    ];
+
+    allSymptoms = fallbackSymptoms;
+    displaySymptoms();
+}
+
+// Load more symptoms button
+document.getElementById('loadMoreSymptoms').addEventListener('click', function() {
+    displaySymptoms();
+});
+
+// AI Diagnosis Form Handler
+document.getElementById('aiDiagnosisForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const formData = new FormData(this);
+    const selectedSymptoms = Array.from(document.querySelectorAll('input[name="symptoms"]:checked'))
+        .map(cb => cb.value);
+    const customSymptoms = formData.get('custom_symptoms');
+
+    // Combine selected and custom symptoms
+    let allSymptoms = [...selectedSymptoms];
+    if (customSymptoms) {
+        const customList = customSymptoms.split(',').map(s => s.trim()).filter(s => s);
+        allSymptoms = [...allSymptoms, ...customList];
+    }
+
+    if (allSymptoms.length === 0) {
+        alert('Vui lòng chọn ít nhất một triệu chứng');
+        return;
+    }
+
+    const data = {
+        symptoms: allSymptoms.join(', '),
+        age: parseInt(formData.get('age')),
+        days_sick: parseInt(formData.get('days_sick'))
+    };
+
+    // Show loading state
+    const diagnoseBtn = document.getElementById('diagnoseBtn');
+    const originalText = diagnoseBtn.innerHTML;
+    diagnoseBtn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Đang chẩn đoán...';
+    diagnoseBtn.disabled = true;
+
+    try {
+        const response = await fetch('/api/ai/quick-diagnosis', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            displayAIResult(result.result);
+        } else {
+            alert('Lỗi: ' + (result.error || 'Không thể chẩn đoán'));
+        }
+    } catch (error) {
+        alert('Lỗi kết nối: ' + error.message);
+    } finally {
+        // Restore button state
+        diagnoseBtn.innerHTML = originalText;
+        diagnoseBtn.disabled = false;
+    }
+});
+
+// Display AI diagnosis result
+function displayAIResult(result) {
+    const resultSection = document.getElementById('aiResultSection');
+    const resultContent = document.getElementById('aiResultContent');
+
+    const priorityClass = `priority-${result.priority}`;
+    const priorityText = {
+        'emergency': '🚨 Khẩn cấp',
+        'high': '⚠️ Cao',
+        'consult_doctor': '👨‍⚕️ Cần tư vấn bác sĩ',
+        'self_care': '🏠 Tự chăm sóc'
+    };
+
+    resultContent.innerHTML = `
+        <div class="row">
+            <div class="col-lg-8">
+                <div class="ai-result-card ${priorityClass} p-4">
+                    <div class="d-flex justify-content-between align-items-start mb-3">
+                        <h4 class="mb-0">${result.disease}</h4>
+                        <span class="badge bg-${getPriorityColor(result.priority)} fs-6">${priorityText[result.priority]}</span>
+                    </div>
+
+                    <p class="text-muted mb-3">${result.description}</p>
+
+                    <div class="row mb-4">
+                        <div class="col-md-6">
+                            <h6>Độ tin cậy AI</h6>
+                            <div class="confidence-bar">
+                                <div class="confidence-fill" style="width: ${result.confidence}%"></div>
+                            </div>
+                            <small class="text-muted">${result.confidence}%</small>
+                        </div>
+                        <div class="col-md-6">
+                            <h6>Mức độ nghiêm trọng</h6>
+                            <div class="d-flex align-items-center">
+                                <div class="progress flex-grow-1 me-2" style="height: 8px;">
+                                    <div class="progress-bar bg-${getSeverityColor(result.severity_score)}" 
+                                         style="width: ${result.severity_score * 10}%"></div>
+                                </div>
+                                <span class="badge bg-secondary">${result.severity_score}/10</span>
+                            </div>
+                        </div>
+                    </div>
+
+                    <div class="row">
+                        <div class="col-md-6">
+                            <h6><i class="fas fa-shield-alt me-2"></i>Biện pháp phòng ngừa</h6>
+                            <ul class="list-unstyled">
+                                ${result.precautions.map(precaution => `<li><i class="fas fa-check text-success me-2"></i>${precaution}</li>`).join('')}
+                            </ul>
+                        </div>
+                        <div class="col-md-6">
+                            <h6><i class="fas fa-lightbulb me-2"></i>Khuyến nghị</h6>
+                            <ul class="list-unstyled">
+                                ${result.recommendations.map(rec => `<li><i class="fas fa-arrow-right text-primary me-2"></i>${rec}</li>`).join('')}
+                            </ul>
+                        </div>
+                    </div>
+                </div>
+            </div>
+
+            <div class="col-lg-4">
+                <div class="card border-0 shadow-sm">
+                    <div class="card-header bg-light">
+                        <h6 class="mb-0"><i class="fas fa-info-circle me-2"></i>Thông tin phân tích</h6>
+                    </div>
+                    <div class="card-body">
+                        <div class="mb-3">
+                            <small class="text-muted">Triệu chứng đã phân tích:</small>
+                            <div class="mt-2">
+                                ${result.symptoms_analyzed.map(symptom => 
+                                    `<span class="badge bg-light text-dark me-1 mb-1">${symptom}</span>`
+                                ).join('')}
+                            </div>
+                        </div>
+
+                        <div class="mb-3">
+                            <small class="text-muted">Tuổi bệnh nhân:</small>
+                            <div class="fw-bold">${result.age_factor} tuổi</div>
+                        </div>
+
+                        <div class="mb-3">
+                            <small class="text-muted">Thời gian bệnh:</small>
+                            <div class="fw-bold">${result.duration_factor} ngày</div>
+                        </div>
+
+                        <div class="alert alert-warning small">
+                            <i class="fas fa-exclamation-triangle me-2"></i>
+                            <strong>Lưu ý:</strong> Đây chỉ là chẩn đoán sơ bộ. Luôn tham khảo ý kiến bác sĩ để có chẩn đoán chính xác.
+                        </div>
+                    </div>
+                </div>
+            </div>
+        </div>
+    `;
+
+    resultSection.style.display = 'block';
+    resultSection.scrollIntoView({ behavior: 'smooth' });
+}
+
+// Helper functions for colors
+function getPriorityColor(priority) {
+    const colors = {
+        'emergency': 'danger',
+        'high': 'warning',
+        'consult_doctor': 'info',
+        'self_care': 'success'
+    };
+    return colors[priority] || 'secondary';
+}
+
+function getSeverityColor(score) {
+    if (score >= 8) return 'danger';
+    if (score >= 6) return 'warning';
+    if (score >= 4) return 'info';
+    return 'success';
+}
+
+// Health Assessment Form Handler (existing code)
+document.getElementById('assessmentForm')?.addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const formData = new FormData(this);
+    const data = {
+        symptoms: formData.get('symptoms'),
+        age: parseInt(formData.get('age')),
+        days_sick: parseInt(formData.get('days_sick'))
+    };
+
+    try {
+        const response = await fetch('/api/assess', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(data)
+        });
+
+        const result = await response.json();
+
+        if (response.ok) {
+            displayAssessmentResult(result);
+        } else {
+            alert('Lỗi: ' + (result.error || 'Không thể đánh giá triệu chứng'));
+        }
+    } catch (error) {
+        alert('Lỗi kết nối: ' + error.message);
+    }
+});
+
+function displayAssessmentResult(result) {
+    const resultDiv = document.getElementById('assessmentResult');
+    const alert = document.getElementById('resultAlert');
+    const title = document.getElementById('resultTitle');
+    const description = document.getElementById('resultDescription');
+    const recommendations = document.getElementById('resultRecommendations');
+
+    // Set alert class based on priority
+    alert.className = 'alert';
+    if (result.priority === 'emergency') {
+        alert.classList.add('alert-danger');
+    } else if (result.priority === 'high') {
+        alert.classList.add('alert-warning');
+    } else if (result.priority === 'consult_doctor') {
+        alert.classList.add('alert-info');
+    } else {
+        alert.classList.add('alert-success');
+    }
+
+    title.textContent = result.message;
+    description.textContent = result.description;
+
+    // Display recommendations
+    if (result.recommendations && result.recommendations.length > 0) {
+        recommendations.innerHTML = '<h6>Khuyến nghị:</h6><ul>' + 
+            result.recommendations.map(rec => `<li>${rec}</li>`).join('') + '</ul>';
+    } else {
+        recommendations.innerHTML = '';
+    }
+
+    resultDiv.style.display = 'block';
+    resultDiv.scrollIntoView({ behavior: 'smooth' });
+}
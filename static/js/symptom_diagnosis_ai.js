@@ -0,0 +1,229 @@
+let selectedSymptoms = [];
+let allSymptoms = [];
+let currentPage = 1;
+const symptomsPerPage = 20;
+
+// Initialize page
+document.addEventListener('DOMContentLoaded', function() {
+    if (document.getElementById('patientAge')) {
+        loadSymptoms();
+        setupEventListeners();
+    }
+});
+
+function loadSymptoms() {
+    fetch('/api/ai/symptoms')
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                allSymptoms = data.symptoms;
+                displaySymptoms();
+            }
+        })
+        .catch(error => {
+            console.error('Error loading symptoms:', error);
+            // Fallback symptoms
+            allSymptoms = [
+                'Sốt', 'Ho', 'Đau họng', 'Sổ mũi', 'Đau đầu', 'Mệt mỏi',
+                'Đau bụng', 'Buồn nôn', 'Nôn', 'Tiêu chảy', 'Táo bón',
+                'Đau lưng', 'Đau khớp', 'Phát ban', 'Ngứa', 'Chóng mặt',
+                'Khó thở', 'Đau ngực', 'Tim đập nhanh', 'Mất ngủ'
+            ];
+            displaySymptoms();
+        });
+}
+
+function displaySymptoms() {
+    const startIndex = (currentPage - 1) * symptomsPerPage;
+    const endIndex = startIndex + symptomsPerPage;
+    const pageSymptoms = allSymptoms.slice(startIndex, endIndex);
+
+    const grid = document.getElementById('symptomGrid');
+    grid.innerHTML = pageSymptoms.map(symptom => `
+        <button type="button" class="symptom-btn" 
+                data-symptom="${symptom}" onclick="toggleSymptom('${symptom}')">
+            ${symptom}
+        </button>
+    `).join('');
+
+    updateSelectedSymptomsDisplay();
+}
+
+function toggleSymptom(symptom) {
+    const index = selectedSymptoms.indexOf(symptom);
+    if (index > -1) {
+        selectedSymptoms.splice(index, 1);
+    } else {
+        selectedSymptoms.push(symptom);
+    }
+    updateSelectedSymptomsDisplay();
+}
+
+function updateSelectedSymptomsDisplay() {
+    document.querySelectorAll('.symptom-btn').forEach(btn => {
+        const symptom = btn.dataset.symptom;
+        if (selectedSymptoms.includes(symptom)) {
+            btn.classList.add('selected');
+        } else {
+            btn.classList.remove('selected');
+        }
+    });
+}
+
+function setupEventListeners() {
+    document.getElementById('loadMoreSymptoms').addEventListener('click', function() {
+        currentPage++;
+        displaySymptoms();
+    });
+
+    document.getElementById('aiDiagnosisForm').addEventListener('submit', function(e) {
+        e.preventDefault();
+        performDiagnosis();
+    });
+}
+
+function performDiagnosis() {
+    if (selectedSymptoms.length === 0) {
+        alert('Vui lòng chọn ít nhất một triệu chứng');
+        return;
+    }
+
+    const formData = {
+        age: document.getElementById('patientAge').value,
+        days_sick: document.getElementById('daysSick').value,
+        symptoms: selectedSymptoms,
+        custom_symptoms: document.getElementById('customSymptoms').value,
+        profile_data: {
+            gender: DIAGNOSIS_USER.gender || '',
+            height: parseInt(DIAGNOSIS_USER.height) || 0,
+            weight: parseInt(DIAGNOSIS_USER.weight) || 0,
+            blood_type: DIAGNOSIS_USER.blood_type || '',
+            allergies: DIAGNOSIS_USER.allergies || '',
+            medications: DIAGNOSIS_USER.medications || '',
+            medical_history: DIAGNOSIS_USER.medical_history || ''
+        }
+    };
+
+    // Show loading
+    const diagnoseBtn = document.getElementById('diagnoseBtn');
+    const originalText = diagnoseBtn.innerHTML;
+    diagnoseBtn.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Đang chẩn đoán...';
+    diagnoseBtn.disabled = true;
+
+    // Hide previous results
+    document.getElementById('diagnosisResults').style.display = 'none';
+
+    fetch('/api/ai/quick-diagnosis', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(formData)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            displayResults(data.diagnosis);
+            saveDiagnosisToProfile(formData, data.diagnosis);
+        } else {
+            alert('Có lỗi xảy ra: ' + (data.error || 'Không thể chẩn đoán'));
+        }
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('Có lỗi xảy ra khi chẩn đoán');
+    })
+    .finally(() => {
+        // Restore button
+        diagnoseBtn.innerHTML = originalText;
+        diagnoseBtn.disabled = false;
+    });
+}
+
+function displayResults(diagnosis) {
+    const resultsDiv = document.getElementById('resultsContent');
+
+    let html = '<div class="mb-4">';
+    html += '<h5 class="text-success mb-3"><i class="fas fa-check-circle me-2"></i>Chẩn đoán hoàn tất</h5>';
+    html += '<p class="text-muted">Dựa trên triệu chứng và thông tin hồ sơ của bạn, AI đã đưa ra các chẩn đoán sau:</p>';
+    html += '</div>';
+
+    if (diagnosis.diseases && diagnosis.diseases.length > 0) {
+        diagnosis.diseases.forEach((disease, index) => {
+            const confidence = disease.confidence || 0;
+            html += `
+                <div class="disease-item">
+                    <div class="disease-name">${disease.name}</div>
+                    <div class="d-flex justify-content-between align-items-center mb-2">
+                        <small class="text-muted">Độ tin cậy</small>
+                        <span class="badge bg-success">${confidence}%</span>
+                    </div>
+                    <div class="confidence-bar">
+                        <div class="confidence-fill" style="width: ${confidence}%"></div>
+                    </div>
+                    <div class="mt-2">
+                        <strong>Triệu chứng chính:</strong> ${disease.symptoms.join(', ')}
+                    </div>
+                    ${disease.description ? `<div class="mt-2"><strong>Mô tả:</strong> ${disease.description}</div>` : ''}
+                    ${disease.recommendations ? `<div class="mt-2"><strong>Khuyến nghị:</strong> ${disease.recommendations}</div>` : ''}
+                </div>
+            `;
+        });
+    } else {
+        html += '<div class="text-center py-4">';
+        html += '<i class="fas fa-info-circle fa-3x text-muted mb-3"></i>';
+        html += '<h5 class="text-muted">Không tìm thấy chẩn đoán phù hợp</h5>';
+        html += '<p class="text-muted">Vui lòng thử chọn triệu chứng khác hoặc liên hệ bác sĩ</p>';
+        html += '</div>';
+    }
+
+    // Add general recommendations
+    html += `
+        <div class="alert alert-info mt-4">
+            <h6><i class="fas fa-info-circle me-2"></i>Lưu ý quan trọng:</h6>
+            <ul class="mb-0">
+                <li>Đây chỉ là chẩn đoán sơ bộ, không thay thế chẩn đoán của bác sĩ</li>
+                <li>Nếu triệu chứng nghiêm trọng, hãy đến bệnh viện ngay lập tức</li>
+                <li>Kết quả chẩn đoán đã được lưu vào hồ sơ sức khỏe của bạn</li>
+            </ul>
+        </div>
+    `;
+
+    resultsDiv.innerHTML = html;
+    document.getElementById('diagnosisResults').style.display = 'block';
+
+    // Scroll to results
+    document.getElementById('diagnosisResults').scrollIntoView({ behavior: 'smooth' });
+}
+
+function saveDiagnosisToProfile(formData, diagnosis) {
+    const diagnosisData = {
+        user_id: String(DIAGNOSIS_USER.id || ''),
+        age: formData.age,
+        days_sick: formData.days_sick,
+        symptoms: formData.symptoms,
+        custom_symptoms: formData.custom_symptoms,
+        profile_data: formData.profile_data,
+        diagnosis: diagnosis,
+        created_at: new Date().toISOString()
+    };
+
+    fetch('/api/firebase/save-diagnosis', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(diagnosisData)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.success) {
+            console.log('Diagnosis saved to profile successfully');
+        } else {
+            console.error('Error saving diagnosis:', data.error);
+        }
+    })
+    .catch(error => {
+        console.error('Error saving diagnosis:', error);
+    });
+}
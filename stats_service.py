@@ -0,0 +1,180 @@
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class StatsService:
+    """Cached, coalesced access to an expensive statistics computation.
+
+    - Fresh for ``ttl`` seconds: served from memory.
+    - Stale for another ``stale_ttl`` seconds: served from memory while one
+      background thread recomputes (stale-while-revalidate).
+    - Older / empty: computed synchronously, but concurrent callers share the
+      same in-flight computation instead of each scanning Firestore.
+    - Partial results (``partial: True``) are served but already stale, so
+      the next call refreshes them in the background. Their ``missing`` keys
+      are filled from the previous value where it has them and listed under
+      ``stale`` instead; only keys never loaded stay in ``missing``.
+    - With a ``key``, complete results are also stored in ``stats_snapshots``:
+      a worker whose copy expired adopts a snapshot younger than ``ttl``
+      instead of computing, and ``refresh()`` (the 'refresh_stats' job)
+      reaches every worker.
+    """
+
+    def __init__(self, compute: Callable[[], Dict[str, Any]], ttl: float = 30.0, stale_ttl: float = 300.0,
+                 key: Optional[str] = None):
+        self.compute = compute
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.key = key
+        self.app = None
+        self._lock = threading.Lock()
+        self._value: Optional[Dict[str, Any]] = None
+        self._computed_at = 0.0
+        self._inflight: Optional[threading.Event] = None
+        self.metrics = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'coalesced': 0, 'refreshes': 0, 'shared': 0,
+                        'errors': 0}
+
+    def init_app(self, app):
+        """Configure TTLs from the Flask app config"""
+        self.ttl = app.config.get('STATS_CACHE_TTL', self.ttl)
+        self.stale_ttl = app.config.get('STATS_STALE_TTL', self.stale_ttl)
+        self.app = app
+        app.extensions.setdefault('stats_services', []).append(self)
+
+    def _load_shared(self) -> Optional[Tuple[Dict[str, Any], float]]:
+        """(value, age) of the shared snapshot when younger than ttl, else None"""
+        if self.key is None or self.app is None:
+            return None
+        from models import db, StatsSnapshot
+        try:
+            # App context riêng: cũng được gọi từ thread làm mới nền
+            with self.app.app_context():
+                snapshot = db.session.get(StatsSnapshot, self.key)
+                if snapshot is None:
+                    return None
+                age = (datetime.utcnow() - snapshot.computed_at).total_seconds()
+                return (json.loads(snapshot.value), max(age, 0.0)) if age < self.ttl else None
+        except Exception as e:
+            print(f"❌ Error reading shared statistics: {e}")
+            return None
+
+    def _store_shared(self, value: Dict[str, Any]):
+        if self.key is None or self.app is None:
+            return
+        from json_provider import _default
+        from models import db, StatsSnapshot
+        try:
+            with self.app.app_context():
+                db.session.merge(StatsSnapshot(key=self.key, computed_at=datetime.utcnow(),
+                                               value=json.dumps(value, default=_default, ensure_ascii=False)))
+                db.session.commit()
+        except Exception as e:
+            print(f"❌ Error storing shared statistics: {e}")
+
+    def _refresh(self, event: threading.Event, force: bool = False):
+        """Run the computation as the single in-flight leader"""
+        try:
+            shared = None if force else self._load_shared()
+            if shared is not None:
+                # Worker khác (hoặc job refresh_stats) vừa tính xong
+                value, age = shared
+            else:
+                value, age = self.compute(), 0.0
+                if value and not value.get('partial'):
+                    self._store_shared(value)
+            with self._lock:
+                if value.get('partial') and self._value:
+                    value = self._fill_missing(value, self._value)
+                self._value = value
+                self._computed_at = time.monotonic() - age
+                if value.get('partial'):
+                    # Thiếu vài truy vấn: trả bản này nhưng coi như đã cũ -> lần sau làm mới nền
+                    self._computed_at -= self.ttl
+            self.metrics['shared' if shared is not None else 'refreshes'] += 1
+        except Exception as e:
+            self.metrics['errors'] += 1
+            print(f"❌ Error computing statistics: {e}")
+        finally:
+            with self._lock:
+                self._inflight = None
+            event.set()
+
+    @staticmethod
+    def _fill_missing(value: Dict[str, Any], previous: Dict[str, Any]) -> Dict[str, Any]:
+        """Carry keys a partial result lacks over from the previous value, marked stale"""
+        value = dict(value)
+        missing, stale = dict(value.get('missing') or {}), {}
+        previous_missing = previous.get('missing') or {}
+        for key, reason in list(missing.items()):
+            if key in previous and key not in previous_missing:
+                value[key] = previous[key]
+                stale[key] = reason
+                del missing[key]
+        value['missing'], value['stale'] = missing, stale
+        return value
+
+    def _start_refresh(self) -> Tuple[threading.Event, bool]:
+        """Return the in-flight event and whether this caller leads the refresh"""
+        with self._lock:
+            if self._inflight is not None:
+                return self._inflight, False
+            self._inflight = threading.Event()
+            return self._inflight, True
+
+    def get(self) -> Dict[str, Any]:
+        """Return statistics, computing them at most once per TTL"""
+        now = time.monotonic()
+        with self._lock:
+            value, age = self._value, now - self._computed_at
+
+        if value is not None and age < self.ttl:
+            self.metrics['hits'] += 1
+            return value
+
+        if value is not None and age < self.ttl + self.stale_ttl:
+            self.metrics['stale_hits'] += 1
+            event, leader = self._start_refresh()
+            if leader:
+                threading.Thread(target=self._refresh, args=(event,), daemon=True).start()
+            return value
+
+        self.metrics['misses'] += 1
+        event, leader = self._start_refresh()
+        if leader:
+            self._refresh(event)
+        else:
+            self.metrics['coalesced'] += 1
+            event.wait()
+        with self._lock:
+            return self._value if self._value is not None else {}
+
+    def refresh(self) -> Dict[str, Any]:
+        """Recompute now (blocking) and share the result, joining a refresh already in flight"""
+        event, leader = self._start_refresh()
+        if leader:
+            self._refresh(event, force=True)
+        else:
+            event.wait()
+        with self._lock:
+            return self._value if self._value is not None else {}
+
+    def invalidate(self):
+        """Force the next call to recompute"""
+        with self._lock:
+            self._computed_at = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        age = time.monotonic() - self._computed_at if self._value is not None else None
+        return dict(self.metrics, age=round(age, 1) if age is not None else None, ttl=self.ttl)
+
+
+def _firebase_statistics():
+    from firebase_config import firebase_db
+    return firebase_db.get_statistics()
+
+
+# Global dashboard statistics service (Firestore)
+dashboard_stats = StatsService(_firebase_statistics, key='dashboard')
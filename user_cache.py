@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+from sqlalchemy.orm import make_transient_to_detached
+
+
+class UserCache:
+    """Short-TTL per-process cache for the Flask-Login user_loader.
+
+    Entries hold a snapshot of the user's column values together with its
+    ``updated_at`` version. A hit rebuilds the instance and attaches it to the
+    request session with ``merge(load=False)``, which issues no SQL, so the
+    object still behaves like a normal ORM instance (changes are committed as
+    usual). Routes that modify or delete users call ``invalidate``; other
+    workers pick the change up when the TTL expires.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # user_id -> (expires_at, version, state)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def init_app(self, app):
+        """Configure TTL and size from the Flask app config"""
+        self.ttl = app.config.get('USER_CACHE_TTL', self.ttl)
+        self.max_size = app.config.get('USER_CACHE_SIZE', self.max_size)
+        self.clear()
+        app.extensions['user_cache'] = self
+
+    @staticmethod
+    def _snapshot(user) -> Dict[str, Any]:
+        return {column.key: getattr(user, column.key) for column in user.__table__.columns}
+
+    def _put(self, user):
+        if self.ttl <= 0:
+            return
+        entry = (time.monotonic() + self.ttl, user.updated_at, self._snapshot(user))
+        with self._lock:
+            current = self._entries.pop(user.id, None)
+            if current and current[1] and entry[1] and current[1] > entry[1]:
+                # Không ghi đè bản mới hơn bằng một snapshot cũ
+                entry = current
+            self._entries[user.id] = entry
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _get_entry(self, user_id: int):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry
+
+    def load(self, user_id: int):
+        """Return the user for user_id, from cache when possible"""
+        from models import db, User
+
+        entry = self._get_entry(user_id)
+        if entry is not None:
+            self.hits += 1
+            cached = User(**entry[2])
+            make_transient_to_detached(cached)
+            return db.session.merge(cached, load=False)
+
+        self.misses += 1
+        user = db.session.get(User, user_id)
+        if user is not None:
+            self._put(user)
+        return user
+
+    def invalidate(self, user_id: int):
+        """Drop a user from the cache after it was modified or deleted"""
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics for the admin metrics endpoint"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'size': len(self._entries),
+            'ttl': self.ttl,
+        }
+
+
+# Global user cache instance
+user_cache = UserCache()
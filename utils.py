@@ -184,6 +184,39 @@ class HealthAssessmentEngine:
 class HealthAnalyzer:
     """Analyze user health data and provide insights"""
     
+    @staticmethod
+    def calculate_bmi(height: Optional[float], weight: Optional[float]) -> Optional[float]:
+        """Calculate BMI from height (cm) and weight (kg)"""
+        if not height or not weight:
+            return None
+        height_m = height / 100
+        return round(weight / (height_m * height_m), 1)
+    
+    @staticmethod
+    def get_bmi_status(bmi: Optional[float]) -> Optional[str]:
+        """Get BMI category"""
+        if bmi is None:
+            return None
+        elif bmi < 18.5:
+            return 'Thiếu cân'
+        elif bmi < 25:
+            return 'Bình thường'
+        elif bmi < 30:
+            return 'Thừa cân'
+        else:
+            return 'Béo phì'
+    
+    @staticmethod
+    def get_age_group(age: Optional[int]) -> str:
+        """Get age group"""
+        age = age or 0
+        if age < 18:
+            return 'Trẻ em/Vị thành niên'
+        elif age < 65:
+            return 'Người trưởng thành'
+        else:
+            return 'Người cao tuổi'
+    
     @staticmethod
     def analyze_user_health(user_health_info: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze user health data and provide insights"""
@@ -193,28 +226,13 @@ class HealthAnalyzer:
         analysis = {}
         
         # BMI calculation
-        if user_health_info.get('height') and user_health_info.get('weight'):
-            height_m = user_health_info['height'] / 100
-            bmi = user_health_info['weight'] / (height_m * height_m)
-            analysis['bmi'] = round(bmi, 1)
-            
-            if bmi < 18.5:
-                analysis['bmi_status'] = 'Thiếu cân'
-            elif bmi < 25:
-                analysis['bmi_status'] = 'Bình thường'
-            elif bmi < 30:
-                analysis['bmi_status'] = 'Thừa cân'
-            else:
-                analysis['bmi_status'] = 'Béo phì'
+        bmi = HealthAnalyzer.calculate_bmi(user_health_info.get('height'), user_health_info.get('weight'))
+        if bmi is not None:
+            analysis['bmi'] = bmi
+            analysis['bmi_status'] = HealthAnalyzer.get_bmi_status(bmi)
         
         # Age-based recommendations
-        age = user_health_info.get('age', 0)
-        if age < 18:
-            analysis['age_group'] = 'Trẻ em/Vị thành niên'
-        elif age < 65:
-            analysis['age_group'] = 'Người trưởng thành'
-        else:
-            analysis['age_group'] = 'Người cao tuổi'
+        analysis['age_group'] = HealthAnalyzer.get_age_group(user_health_info.get('age', 0))
         
         return analysis
     